@@ -1,15 +1,15 @@
 # Program name: JohnDostalStudyMor.py
 # Author: John Dostal
-# Date last updated: 9/3/2025
+# Date last updated: 10/18/2026
 # Purpose: Run menu program that stores data in two separate files. One file is for participant data and the other is for survey data.
+# Both files are indexed by participant ID (see studymor_store.py) so new IDs and lookups do not read the whole file.
 
 # Import necessary modules
-import os
 from datetime import datetime
 
-# Constants for file names
-PARTICIPANT_FILE = "participant.dat"
-SURVEY_FILE = "survey.dat"
+from studymor_analytics import display_analytics
+from studymor_store import (add_participant_record, add_survey_record, get_participant, get_surveys,
+                            is_yes_no, iter_participants)
 
 # Function to add a new participant
 def add_participant():  
@@ -21,21 +21,9 @@ def add_participant():
     age = input("Enter Age: ").strip()
     gender = input("Enter Gender: ").strip()
 
-    # Error handling for participant data
-    try:
-        with open(PARTICIPANT_FILE, "r") as file:
-            lines = file.readlines()
-            participant_id = len(lines) + 1
-    except FileNotFoundError:
-        participant_id = 1
-
-    # Assign treatment based on participant ID (even: StudyMor, odd: Placebo)
-    treatment = "StudyMor" if participant_id % 2 == 0 else "Placebo"
-
     # Write participant data to file
-    with open(PARTICIPANT_FILE, "a") as file:
-        record = f"{participant_id},{first_name},{last_name},{age},{gender},{treatment}\n"
-        file.write(record)
+    # The store assigns the next ID from the index and the treatment from the ID (even: StudyMor, odd: Placebo)
+    participant_id, treatment = add_participant_record(first_name, last_name, age, gender)
 
     print(f"Participant added with ID {participant_id} and Treatment: {treatment}")
 
@@ -43,38 +31,58 @@ def add_participant():
 def display_participants():
     print("\n--- List of Participants ---")
 
-    # Error handling for lack of participants file
-    if not os.path.exists(PARTICIPANT_FILE):
+    # Loop to display participants that exist in participants file
+    # Lines are streamed from the file instead of being read into memory first
+    found = False
+    for parts in iter_participants():
+        found = True
+
+        # Error handling for malformed participant records
+        if len(parts) == 6:
+            pid, fname, lname, age, gender, treatment = parts
+            print(f"ID: {pid}, Name: {fname} {lname}, Age: {age}, Gender: {gender}, Treatment: {treatment}")
+        else:
+            print("Malformed record:", ",".join(parts))
+
+    # Error handling for lack of participants
+    if not found:
         print("No participant records found.")
-        return
 
-    # Read participant data from file
-    with open(PARTICIPANT_FILE, "r") as file:
-        lines = file.readlines()
+# Function to look up a single participant and their surveys by ID
+def lookup_participant():
+    print("\n--- Look Up Participant ---")
+    participant_id = input("Enter Participant ID: ").strip()
+
+    # Error handling for invalid participant ID
+    if not participant_id.isdigit():
+        print("Invalid Participant ID. Please enter a numeric ID. Returning to main menu.")
+        return
 
-        # Error handling for lack of participants in participants file
-        if not lines:
-            print("No participants found.")
-            return
+    participant = get_participant(int(participant_id))
+    if participant is None:
+        print("No participant found with that ID.")
+        return
 
-        # Loop to display participants that exist in participants file
-        for line in lines:
-            parts = line.strip().split(",")
+    pid, fname, lname, age, gender, treatment = participant
+    print(f"ID: {pid}, Name: {fname} {lname}, Age: {age}, Gender: {gender}, Treatment: {treatment}")
 
-            # Error handling for malformed participant records
-            if len(parts) == 6:
-                pid, fname, lname, age, gender, treatment = parts
-                print(f"ID: {pid}, Name: {fname} {lname}, Age: {age}, Gender: {gender}, Treatment: {treatment}")
-            else:
-                print("Malformed record:", line.strip())
+    # Display the surveys recorded for the participant
+    surveys = get_surveys(int(participant_id))
+    if not surveys:
+        print("No surveys recorded for this participant.")
+    for date, _, headache, constipation, sleep_issue, other_effects, study_more in surveys:
+        print(f"Date: {date}, Headaches: {headache}, Constipation: {constipation}, Difficulty Sleeping: {sleep_issue}, "
+              f"Other Effects: {other_effects}, Could Study More: {study_more}")
 
 # Function to collect survey data
 def collect_survey():
 
     # Input to collect survey data
     print("\n--- Collect Survey ---")
-    display_participants()
-    participant_id = input("\nEnter Participant ID for survey: ").strip()
+    participant_id = input("\nEnter Participant ID for survey (or 'list' to display participants): ").strip()
+    if participant_id.lower() == "list":
+        display_participants()
+        participant_id = input("\nEnter Participant ID for survey: ").strip()
 
     # Error handling for invalid participant ID
     if not participant_id.isdigit():
@@ -83,6 +91,13 @@ def collect_survey():
     else:
         participant_id = int(participant_id)
 
+    # Error handling for unknown participant ID, checked with a direct index lookup
+    participant = get_participant(participant_id)
+    if participant is None:
+        print("No participant found with that ID. Returning to main menu.")
+        return
+    print(f"Survey for {participant[1]} {participant[2]} (Treatment: {participant[5]})")
+
     # Continued input to collect survey data. Also contains error handling for yes/no input.
     print("\nPlease answer the following (yes/no):")
 
@@ -94,7 +109,7 @@ def collect_survey():
     # Loop to collect input for survey data
     while headache_loop:
         headache_1 = input("Did you have headaches? ").strip().lower()
-        if headache_1 not in ["yes", "no"]:
+        if not is_yes_no(headache_1):
             print("Invalid input. Please enter 'yes' or 'no'.")
         else:
             headache_loop = False
@@ -103,7 +118,7 @@ def collect_survey():
     # Loop to collect input for survey data
     while constipation_loop:
         constipation_1 = input("Did you have constipation? ").strip().lower()
-        if constipation_1 not in ["yes", "no"]:
+        if not is_yes_no(constipation_1):
             print("Invalid input. Please enter 'yes' or 'no'.")
         else:
             constipation_loop = False
@@ -112,7 +127,7 @@ def collect_survey():
     # Loop to collect input for survey data
     while sleep_issue_loop:
         sleep_issue_1 = input("Did you have difficulty sleeping? ").strip().lower()
-        if sleep_issue_1 not in ["yes", "no"]:
+        if not is_yes_no(sleep_issue_1):
             print("Invalid input. Please enter 'yes' or 'no'.")
         else:
             sleep_issue_loop = False
@@ -124,7 +139,7 @@ def collect_survey():
     # Loop to collect input for survey data
     while study_more_loop:
         study_more_1 = input("Did you feel like you could study more? ").strip().lower()
-        if study_more_1 not in ["yes", "no"]:
+        if not is_yes_no(study_more_1):
             print("Invalid input. Please enter 'yes' or 'no'.")
         else:
             study_more_loop = False
@@ -133,9 +148,7 @@ def collect_survey():
     date = datetime.now().strftime("%Y-%m-%d")
 
     # Code to append survey file with survey data for participant
-    with open(SURVEY_FILE, "a") as file:
-        record = f"{date},{participant_id},{headache},{constipation},{sleep_issue},{other_effects},{study_more}\n"
-        file.write(record)
+    add_survey_record(date, participant_id, headache, constipation, sleep_issue, other_effects, study_more)
 
     print("Survey recorded successfully.")
 
@@ -150,9 +163,11 @@ def main():
         print("1. Add New Participant")
         print("2. Collect Survey for Participant")
         print("3. Display Participants")
-        print("4. Quit")
+        print("4. Look Up Participant by ID")
+        print("5. Study Analytics")
+        print("6. Quit")
 
-        choice = input("Enter your choice (1-4): ").strip()
+        choice = input("Enter your choice (1-6): ").strip()
 
         # Menu options handling
         if choice == "1":
@@ -162,6 +177,10 @@ def main():
         elif choice == "3":
             display_participants()
         elif choice == "4":
+            lookup_participant()
+        elif choice == "5":
+            display_analytics()
+        elif choice == "6":
             print("Exiting program.")
             break
         else:
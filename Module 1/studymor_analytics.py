@@ -0,0 +1,186 @@
+# Program name: studymor_analytics.py
+# Author: John Dostal
+# Date last updated: 10/18/2026
+# Purpose: Side effect rates by treatment arm (StudyMor vs Placebo) for the StudyMor clinical study.
+# The first run joins survey.dat to participant.dat with a hash join in one streaming pass: participant.dat is
+# read into a participant ID -> treatment table, then survey.dat is streamed and every survey is counted
+# against its participant's arm. The counts and the number of survey.dat bytes already processed are saved to
+# a cache file, so later runs only read surveys appended since the last run. The cache is thrown away when the
+# start of survey.dat no longer matches what was counted or when participant.dat changes.
+# Rates are reported with 95% Wilson score confidence intervals.
+
+# Import necessary modules
+import json
+import math
+import os
+import sys
+import zlib
+
+from studymor_store import PARTICIPANT_FILE, SURVEY_FILE, get_participant
+
+# Cache file for the running counts
+ANALYTICS_CACHE_FILE = "study_analytics.json"
+CACHE_VERSION = 2
+
+# Survey questions counted for each arm, as (field position in survey.dat, label)
+MEASURES = [(2, "Headaches"), (3, "Constipation"), (4, "Difficulty Sleeping"), (6, "Could Study More")]
+ARMS = ["StudyMor", "Placebo"]
+
+# Bytes at the start of survey.dat used to notice when the file has been replaced
+FINGERPRINT_BYTES = 4096
+
+# z value for a 95% confidence interval
+Z_95 = 1.959963984540054
+
+
+# Function to create empty counts for every arm
+def empty_counts():
+    return {arm: {"surveys": 0, "yes": {label: 0 for _, label in MEASURES}} for arm in ARMS}
+
+# Function to fingerprint the first `length` bytes of survey.dat
+# The same span is compared every time: the first FINGERPRINT_BYTES bytes, or fewer if less was counted
+def survey_fingerprint(length):
+    with open(SURVEY_FILE, "rb") as file:
+        return zlib.crc32(file.read(length))
+
+# Function to describe participant.dat as [size, modification time]
+# Any change to it (a new participant or an edited treatment) can change the treatment join, so it resets the cache
+def participant_signature():
+    if not os.path.exists(PARTICIPANT_FILE):
+        return None
+    status = os.stat(PARTICIPANT_FILE)
+    return [status.st_size, status.st_mtime_ns]
+
+# Function to compute a 95% Wilson score interval for `yes` out of `total`
+def wilson_interval(yes, total, z=Z_95):
+    if total == 0:
+        return 0.0, 0.0
+    rate = yes / total
+    denominator = 1 + z * z / total
+    centre = (rate + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / total + z * z / (4 * total * total)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+# Function to build the participant ID -> treatment hash table from participant.dat
+def load_treatments():
+    treatments = {}
+    if not os.path.exists(PARTICIPANT_FILE):
+        return treatments
+    with open(PARTICIPANT_FILE, "r") as file:
+        for line in file:
+            parts = line.rstrip("\n").split(",")
+            if len(parts) == 6 and parts[0].isdigit():
+                treatments[int(parts[0])] = parts[5]
+    return treatments
+
+# Function to count the surveys in survey.dat starting at byte `start`
+# `find_treatment` maps a participant ID to its arm (or None). Returns the byte offset reached.
+def count_surveys(cache, start, find_treatment):
+    counts = cache["counts"]
+    offset = start
+    with open(SURVEY_FILE, "rb") as file:
+        file.seek(start)
+        for raw_line in file:
+            # Leave a partial last line for the next run
+            if not raw_line.endswith(b"\n"):
+                break
+            offset += len(raw_line)
+            parts = raw_line.decode("utf-8").rstrip("\r\n").split(",")
+            if len(parts) != 7 or not parts[1].isdigit():
+                cache["malformed"] += 1
+                continue
+            arm = find_treatment(int(parts[1]))
+            if arm not in counts:
+                cache["unmatched"] += 1
+                continue
+            counts[arm]["surveys"] += 1
+            for position, label in MEASURES:
+                if parts[position].strip().lower() == "yes":
+                    counts[arm]["yes"][label] += 1
+    return offset
+
+# Function to load the cache, or None when it is missing or out of date
+def load_cache():
+    try:
+        with open(ANALYTICS_CACHE_FILE, "r") as file:
+            cache = json.load(file)
+    except (FileNotFoundError, ValueError):
+        return None
+    if cache.get("version") != CACHE_VERSION:
+        return None
+    return cache
+
+# Function to save the cache
+def save_cache(cache):
+    temp_file = ANALYTICS_CACHE_FILE + ".tmp"
+    with open(temp_file, "w") as file:
+        json.dump(cache, file, indent=2)
+    os.replace(temp_file, ANALYTICS_CACHE_FILE)
+
+# Function to bring the counts up to date and return the cache
+# Only new survey lines are read, unless survey.dat shrank or was replaced, or `rebuild` is True.
+def update_analytics(rebuild=False):
+    if not os.path.exists(SURVEY_FILE):
+        return {"version": CACHE_VERSION, "survey_bytes": 0, "fingerprint": None, "participants": None,
+                "counts": empty_counts(), "unmatched": 0, "malformed": 0, "full_scans": 0, "new_bytes": 0}
+
+    survey_size = os.path.getsize(SURVEY_FILE)
+    cache = None if rebuild else load_cache()
+    if cache is not None:
+        # Start over if the file is shorter than what was counted, the beginning of the file changed
+        # or participant.dat changed
+        if (cache["survey_bytes"] > survey_size
+                or cache["fingerprint"] != survey_fingerprint(min(cache["survey_bytes"], FINGERPRINT_BYTES))
+                or cache["participants"] != participant_signature()):
+            cache = None
+
+    if cache is None:
+        # Full pass: hash join against every participant
+        cache = {"version": CACHE_VERSION, "survey_bytes": 0, "fingerprint": None, "participants": None,
+                 "counts": empty_counts(), "unmatched": 0, "malformed": 0, "full_scans": 0}
+        treatments = load_treatments()
+        find_treatment = treatments.get
+        cache["full_scans"] += 1
+    else:
+        # Incremental pass: the few new surveys look up their participant through the ID index
+        memo = {}
+
+        def find_treatment(participant_id):
+            if participant_id not in memo:
+                participant = get_participant(participant_id)
+                memo[participant_id] = participant[5] if participant else None
+            return memo[participant_id]
+
+    start = cache["survey_bytes"]
+    if start < survey_size:
+        cache["survey_bytes"] = count_surveys(cache, start, find_treatment)
+        cache["fingerprint"] = survey_fingerprint(min(cache["survey_bytes"], FINGERPRINT_BYTES))
+        cache["participants"] = participant_signature()
+        save_cache(cache)
+    cache["new_bytes"] = cache["survey_bytes"] - start
+    return cache
+
+# Function to print the side effect rates by treatment arm
+def display_analytics(rebuild=False):
+    print("\n--- Study Analytics: Side Effect Rates by Treatment ---")
+    cache = update_analytics(rebuild)
+    counts = cache["counts"]
+    if not any(counts[arm]["surveys"] for arm in ARMS):
+        print("No surveys recorded yet.")
+        return
+
+    for arm in ARMS:
+        total = counts[arm]["surveys"]
+        print(f"\n{arm} ({total} surveys)")
+        for _, label in MEASURES:
+            yes = counts[arm]["yes"][label]
+            rate = yes / total if total else 0.0
+            low, high = wilson_interval(yes, total)
+            print(f"  {label:<20} {yes:>7} / {total:<7} {rate:7.1%}   95% CI: {low:6.1%} - {high:6.1%}")
+
+    print(f"\nSurveys read this run: {cache['new_bytes']} bytes, unmatched participant IDs: {cache['unmatched']}, "
+          f"malformed lines: {cache['malformed']}")
+
+# Run directly to print the report; --rebuild ignores the cache and rescans both files
+if __name__ == "__main__":
+    display_analytics(rebuild="--rebuild" in sys.argv)
@@ -0,0 +1,186 @@
+# Program name: studymor_bulk_load.py
+# Author: John Dostal
+# Date last updated: 10/18/2026
+# Purpose: Non-interactive bulk loader for the StudyMor study files.
+# Streams a CSV file of participants or surveys, checks every row with the same rules as the menu program,
+# and appends the good rows to participant.dat / survey.dat in large batches (one write and one fsync per batch).
+# Rows that fail validation are written to a side file with the reason, and rows/sec is reported at the end.
+#
+# Usage:
+#   python studymor_bulk_load.py participants new_participants.csv
+#   python studymor_bulk_load.py surveys site_surveys.csv --batch-size 20000
+#
+# Participant rows: first_name,last_name,age,gender[,treatment]
+#   IDs are assigned in file order. If a treatment is given it must match the treatment the ID is assigned.
+# Survey rows: [date,]participant_id,headaches,constipation,sleep_issues,other_effects,study_more
+#   Answers must be yes/no, the participant must exist, and a missing date is filled with today's date.
+# A first row that starts with "first_name", "date" or "participant_id" is treated as a header and skipped.
+
+# Import necessary modules
+import argparse
+import csv
+import sys
+import time
+from datetime import datetime
+
+from studymor_store import (append_participant_batch, append_survey_batch, assign_treatment, is_yes_no,
+                            next_participant_id, participant_ids)
+
+# Default number of rows written per batch
+DEFAULT_BATCH_SIZE = 10000
+
+# First fields that mark a header row
+HEADER_FIELDS = ["first_name", "date", "participant_id"]
+
+
+# Function to check that a field can be stored in the comma separated data files
+def check_text(value, name):
+    if not value:
+        return f"{name} is empty"
+    if "," in value or "\n" in value or "\r" in value:
+        return f"{name} contains a comma or line break"
+    return None
+
+# Function to check a date field (YYYY-MM-DD, the format collect_survey() writes)
+def check_date(value):
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+        return None
+    except ValueError:
+        return "date is not in YYYY-MM-DD format"
+
+# Function to validate a participant row
+# Returns (line to write, None) for a good row or (None, reason) for a rejected row
+def validate_participant(row, participant_id):
+    if len(row) not in [4, 5]:
+        return None, f"expected 4 or 5 fields, found {len(row)}"
+    fields = [field.strip() for field in row]
+    first_name, last_name, age, gender = fields[:4]
+    for value, name in [(first_name, "first name"), (last_name, "last name"), (gender, "gender")]:
+        problem = check_text(value, name)
+        if problem:
+            return None, problem
+    if not age.isdigit():
+        return None, "age is not a whole number"
+
+    # Treatment assignment rule: even IDs get StudyMor, odd IDs get Placebo
+    treatment = assign_treatment(participant_id)
+    if len(fields) == 5 and fields[4] and fields[4] != treatment:
+        return None, f"treatment {fields[4]} does not match assigned treatment {treatment} for ID {participant_id}"
+    return f"{participant_id},{first_name},{last_name},{age},{gender},{treatment}\n", None
+
+# Function to validate a survey row
+# Returns ((participant ID, line to write), None) for a good row or (None, reason) for a rejected row
+def validate_survey(row, known_ids, today):
+    if len(row) == 6:
+        row = [today] + row
+    if len(row) != 7:
+        return None, f"expected 6 or 7 fields, found {len(row)}"
+    date, participant_id, headache, constipation, sleep_issue, other_effects, study_more = [field.strip() for field in row]
+    problem = check_date(date)
+    if problem:
+        return None, problem
+    if not participant_id.isdigit() or int(participant_id) not in known_ids:
+        return None, f"participant ID {participant_id} does not exist"
+    answers = [headache.lower(), constipation.lower(), sleep_issue.lower(), study_more.lower()]
+    for answer, name in zip(answers, ["headaches", "constipation", "sleep issues", "study more"]):
+        if not is_yes_no(answer):
+            return None, f"{name} answer must be 'yes' or 'no'"
+    if not other_effects:
+        other_effects = "none"
+    problem = check_text(other_effects, "other side effects")
+    if problem:
+        return None, problem
+    headache, constipation, sleep_issue, study_more = answers
+    line = f"{date},{int(participant_id)},{headache},{constipation},{sleep_issue},{other_effects},{study_more}\n"
+    return (int(participant_id), line), None
+
+# Function to stream rows from the input file, skipping blank lines and a header row
+def read_rows(input_file):
+    reader = csv.reader(input_file)
+    for line_number, row in enumerate(reader, 1):
+        if not row or all(not field.strip() for field in row):
+            continue
+        if line_number == 1 and row[0].strip().lower() in HEADER_FIELDS:
+            continue
+        yield line_number, row
+
+# Function to run the bulk load and return the counts
+def bulk_load(kind, input_path, reject_path, batch_size):
+    counts = {"read": 0, "loaded": 0, "rejected": 0, "batches": 0}
+    batch = []
+
+    # Write the current batch with one write and one fsync
+    def flush():
+        if not batch:
+            return
+        if kind == "participants":
+            append_participant_batch(batch)
+        else:
+            append_survey_batch(batch)
+        counts["loaded"] += len(batch)
+        counts["batches"] += 1
+        batch.clear()
+
+    if kind == "participants":
+        participant_id = next_participant_id()
+    else:
+        known_ids = participant_ids()
+        today = datetime.now().strftime("%Y-%m-%d")
+
+    with open(input_path, newline="", encoding="utf-8") as input_file, \
+            open(reject_path, "w", newline="", encoding="utf-8") as reject_file:
+        rejects = csv.writer(reject_file)
+        rejects.writerow(["line", "reason", "row"])
+        for line_number, row in read_rows(input_file):
+            counts["read"] += 1
+            if kind == "participants":
+                line, reason = validate_participant(row, participant_id)
+                record = (participant_id, line)
+            else:
+                record, reason = validate_survey(row, known_ids, today)
+
+            if reason:
+                counts["rejected"] += 1
+                rejects.writerow([line_number, reason, ",".join(row)])
+                continue
+
+            batch.append(record)
+            if kind == "participants":
+                participant_id += 1
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    return counts
+
+# Main function to read the command line and report the results
+def main():
+    parser = argparse.ArgumentParser(description="Bulk load StudyMor participants or surveys from a CSV file.")
+    parser.add_argument("kind", choices=["participants", "surveys"], help="type of records in the file")
+    parser.add_argument("input", help="CSV file to load")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="rows written per batch")
+    parser.add_argument("--rejects", help="file for rejected rows (default: <input>.rejects.csv)")
+    args = parser.parse_args()
+
+    if args.batch_size < 1:
+        print("Batch size must be at least 1.")
+        sys.exit(1)
+    reject_path = args.rejects or args.input + ".rejects.csv"
+
+    start_time = time.perf_counter()
+    try:
+        counts = bulk_load(args.kind, args.input, reject_path, args.batch_size)
+    except FileNotFoundError as e:
+        print(f"File not found: {e.filename}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start_time
+
+    rate = counts["read"] / elapsed if elapsed > 0 else 0
+    print(f"Rows read: {counts['read']}, loaded: {counts['loaded']} in {counts['batches']} batches, "
+          f"rejected: {counts['rejected']}")
+    print(f"Elapsed: {elapsed:.3f} seconds ({rate:,.0f} rows/sec)")
+    if counts["rejected"]:
+        print(f"Rejected rows written to {reject_path}")
+
+if __name__ == "__main__":
+    main()
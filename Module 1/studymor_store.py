@@ -0,0 +1,238 @@
+# Program name: studymor_store.py
+# Author: John Dostal
+# Date last updated: 10/18/2026
+# Purpose: Indexed storage for the StudyMor clinical study files.
+# participant.dat and survey.dat keep their comma separated format, and each one gets a small binary index file:
+#   participant.idx - header, then one 8 byte file offset per participant ID (record N-1 is participant N)
+#   survey.idx      - header, then one (participant ID, file offset) pair per survey
+# The header records how many bytes of the data file are indexed. Lines appended without the index
+# (or existing files from before the index existed) are picked up the next time the index is opened,
+# so old data files are imported without changing them.
+
+# Import necessary modules
+import os
+import struct
+
+# Constants for file names
+PARTICIPANT_FILE = "participant.dat"
+SURVEY_FILE = "survey.dat"
+PARTICIPANT_INDEX_FILE = "participant.idx"
+SURVEY_INDEX_FILE = "survey.idx"
+
+# Index file layout
+HEADER = struct.Struct("<8sQ")       # magic, number of data file bytes covered by the index
+PARTICIPANT_RECORD = struct.Struct("<Q")    # file offset of the participant line
+SURVEY_RECORD = struct.Struct("<QQ")        # participant ID, file offset of the survey line
+PARTICIPANT_MAGIC = b"SMPIDX01"
+SURVEY_MAGIC = b"SMSIDX01"
+NO_OFFSET = 0xFFFFFFFFFFFFFFFF      # marks a participant ID with no line in participant.dat
+
+# Number of fields in each record
+PARTICIPANT_FIELDS = 6
+SURVEY_FIELDS = 7
+
+# Largest jump allowed past the last indexed participant ID. Skipped IDs are padded with NO_OFFSET, so a typo
+# such as 1000000000000 would otherwise make the index terabytes long.
+MAX_PARTICIPANT_ID_GAP = 10_000
+
+
+# Function to read the index header (returns the number of indexed data bytes, or None if the index is unusable)
+def read_header(index_file, magic):
+    try:
+        with open(index_file, "rb") as file:
+            header = file.read(HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) != HEADER.size:
+        return None
+    file_magic, indexed_bytes = HEADER.unpack(header)
+    if file_magic != magic:
+        return None
+    return indexed_bytes
+
+# Function to write a fresh, empty index file
+def create_index(index_file, magic):
+    with open(index_file, "wb") as file:
+        file.write(HEADER.pack(magic, 0))
+
+# Function to split a data line into fields
+def split_line(line):
+    return line.decode("utf-8").rstrip("\r\n").split(",")
+
+# Function to add one participant line to the index
+# Returns False (and indexes nothing) when the ID is more than MAX_PARTICIPANT_ID_GAP past the last record
+def index_participant_line(index, participant_id, offset):
+    slot = (participant_id - 1) * PARTICIPANT_RECORD.size + HEADER.size
+    index.seek(0, os.SEEK_END)
+    end = index.tell()
+
+    # Fill any skipped IDs so record position always equals participant ID - 1
+    if slot > end:
+        missing = (slot - end) // PARTICIPANT_RECORD.size
+        if missing > MAX_PARTICIPANT_ID_GAP:
+            return False
+        index.write(PARTICIPANT_RECORD.pack(NO_OFFSET) * missing)
+    index.seek(slot)
+    index.write(PARTICIPANT_RECORD.pack(offset))
+    return True
+
+# Function to add one survey line to the index
+def index_survey_line(index, participant_id, offset):
+    index.seek(0, os.SEEK_END)
+    index.write(SURVEY_RECORD.pack(participant_id, offset))
+    return True
+
+# Function to bring an index up to date with its data file
+# Only the part of the data file after the last indexed byte is read. If the data file got
+# shorter than the index says (it was replaced or truncated) the index is rebuilt from scratch.
+def sync_index(data_file, index_file, magic, id_field, field_count, add_line):
+    indexed_bytes = read_header(index_file, magic)
+    data_size = os.path.getsize(data_file) if os.path.exists(data_file) else 0
+    if indexed_bytes is None or indexed_bytes > data_size:
+        create_index(index_file, magic)
+        indexed_bytes = 0
+    if indexed_bytes == data_size:
+        return
+
+    with open(data_file, "rb") as data, open(index_file, "r+b") as index:
+        data.seek(indexed_bytes)
+        offset = indexed_bytes
+        for line in data:
+            # Stop at a partial last line; it will be indexed once it is complete
+            if not line.endswith(b"\n"):
+                break
+            parts = split_line(line)
+            if len(parts) == field_count and parts[id_field].strip().isdigit() and int(parts[id_field]) > 0:
+                if not add_line(index, int(parts[id_field]), offset):
+                    print(f"Malformed record in {data_file} at byte {offset}: ID {int(parts[id_field])} is too far "
+                          f"past the last ID; the line is not indexed.")
+            offset += len(line)
+        index.seek(0)
+        index.write(HEADER.pack(magic, offset))
+
+# Function to sync the participant index
+def sync_participant_index():
+    sync_index(PARTICIPANT_FILE, PARTICIPANT_INDEX_FILE, PARTICIPANT_MAGIC, 0, PARTICIPANT_FIELDS,
+               index_participant_line)
+
+# Function to sync the survey index
+def sync_survey_index():
+    sync_index(SURVEY_FILE, SURVEY_INDEX_FILE, SURVEY_MAGIC, 1, SURVEY_FIELDS, index_survey_line)
+
+# Function to rebuild both indexes from the existing data files
+def import_data_files():
+    for index_file in [PARTICIPANT_INDEX_FILE, SURVEY_INDEX_FILE]:
+        if os.path.exists(index_file):
+            os.remove(index_file)
+    sync_participant_index()
+    sync_survey_index()
+
+# Function to get the next participant ID without reading participant.dat
+# The ID is the number of index records + 1, which only needs the index file size.
+def next_participant_id():
+    sync_participant_index()
+    return (os.path.getsize(PARTICIPANT_INDEX_FILE) - HEADER.size) // PARTICIPANT_RECORD.size + 1
+
+# Function to list every participant ID that has a record, read from the index in one pass
+def participant_ids():
+    sync_participant_index()
+    with open(PARTICIPANT_INDEX_FILE, "rb") as index:
+        index.seek(HEADER.size)
+        records = index.read()
+    return {position + 1 for position, (offset,) in enumerate(PARTICIPANT_RECORD.iter_unpack(records))
+            if offset != NO_OFFSET}
+
+# Function to check a yes/no survey answer
+def is_yes_no(answer):
+    return answer in ["yes", "no"]
+
+# Function to assign treatment based on participant ID (even: StudyMor, odd: Placebo)
+def assign_treatment(participant_id):
+    return "StudyMor" if participant_id % 2 == 0 else "Placebo"
+
+# Function to append lines to a data file and index them
+# `records` is a list of (record ID, line text) pairs. All lines are written with one write call.
+def append_records(data_file, index_file, magic, add_line, records):
+    with open(data_file, "ab") as data:
+        start = data.tell()
+        encoded = [(record_id, line.encode("utf-8")) for record_id, line in records]
+        data.write(b"".join(line for _, line in encoded))
+        data.flush()
+        os.fsync(data.fileno())
+
+    with open(index_file, "r+b") as index:
+        offset = start
+        for record_id, line in encoded:
+            add_line(index, record_id, offset)
+            offset += len(line)
+        index.seek(0)
+        index.write(HEADER.pack(magic, offset))
+
+# Function to append a batch of (participant ID, line) pairs with a single write and fsync
+def append_participant_batch(records):
+    sync_participant_index()
+    append_records(PARTICIPANT_FILE, PARTICIPANT_INDEX_FILE, PARTICIPANT_MAGIC, index_participant_line, records)
+
+# Function to append a batch of (participant ID, line) survey pairs with a single write and fsync
+def append_survey_batch(records):
+    sync_survey_index()
+    append_records(SURVEY_FILE, SURVEY_INDEX_FILE, SURVEY_MAGIC, index_survey_line, records)
+
+# Function to add a participant and return (participant ID, treatment)
+def add_participant_record(first_name, last_name, age, gender):
+    participant_id = next_participant_id()
+    treatment = assign_treatment(participant_id)
+    record = f"{participant_id},{first_name},{last_name},{age},{gender},{treatment}\n"
+    append_records(PARTICIPANT_FILE, PARTICIPANT_INDEX_FILE, PARTICIPANT_MAGIC, index_participant_line,
+                   [(participant_id, record)])
+    return participant_id, treatment
+
+# Function to add a survey record
+def add_survey_record(date, participant_id, headache, constipation, sleep_issue, other_effects, study_more):
+    sync_survey_index()
+    record = f"{date},{participant_id},{headache},{constipation},{sleep_issue},{other_effects},{study_more}\n"
+    append_records(SURVEY_FILE, SURVEY_INDEX_FILE, SURVEY_MAGIC, index_survey_line, [(participant_id, record)])
+
+# Function to read the line that starts at `offset`
+def read_line_at(data_file, offset):
+    with open(data_file, "rb") as data:
+        data.seek(offset)
+        return split_line(data.readline())
+
+# Function to look up a participant by ID
+# Returns [id, first name, last name, age, gender, treatment] or None
+def get_participant(participant_id):
+    sync_participant_index()
+    if participant_id < 1:
+        return None
+    with open(PARTICIPANT_INDEX_FILE, "rb") as index:
+        index.seek(HEADER.size + (participant_id - 1) * PARTICIPANT_RECORD.size)
+        record = index.read(PARTICIPANT_RECORD.size)
+    if len(record) != PARTICIPANT_RECORD.size:
+        return None
+    offset = PARTICIPANT_RECORD.unpack(record)[0]
+    if offset == NO_OFFSET:
+        return None
+    return read_line_at(PARTICIPANT_FILE, offset)
+
+# Function to list every survey recorded for a participant
+# Only the survey index is scanned; survey.dat is read at the matching offsets.
+def get_surveys(participant_id):
+    sync_survey_index()
+    offsets = []
+    with open(SURVEY_INDEX_FILE, "rb") as index:
+        index.seek(HEADER.size)
+        records = index.read()
+    for record_id, offset in SURVEY_RECORD.iter_unpack(records):
+        if record_id == participant_id:
+            offsets.append(offset)
+    return [read_line_at(SURVEY_FILE, offset) for offset in offsets]
+
+# Function to stream every participant line as a list of fields
+# Malformed lines are returned as they are so callers can report them.
+def iter_participants():
+    if not os.path.exists(PARTICIPANT_FILE):
+        return
+    with open(PARTICIPANT_FILE, "r") as file:
+        for line in file:
+            yield line.strip().split(",")
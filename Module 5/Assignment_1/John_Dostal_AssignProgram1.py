@@ -5,13 +5,20 @@ Date last updated: 9/30/2025
 Purpose: a python program with embedded SQL that opens a connection to the Chinook database. If the connection doesn't open successfully prints an error message from the database and ends the program. If connection opens successfully, prints a message stating the connection was successful. Uses a simple query to print the 'AlbumId, Title and ArtistId' albums in the database. After running the query, closes the database connection.
 """
 
-import sqlite3 
+import os
+import sys
 from sqlite3 import Error
 
+# The shared SQL instrumentation (statement timings, slow-query log) lives in the Shared folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Shared"))
+from sql_instrumentation import connect
+from sqlite_readonly import connect_readonly
+
 # Function to create a database connection
-def create_connection(db_file):
+# This program only reads, so by default the file is opened in the read-only, memory-mapped reporting mode
+def create_connection(db_file, read_only=True):
     try:
-        conn = sqlite3.connect(db_file)
+        conn = connect_readonly(db_file) if read_only else connect(db_file)
         print("\n Connection successful. \n")
         return conn
     except Error as e:
@@ -1,40 +1,58 @@
 """
 Program name: sakila_assistant.py
 Author: John Dosyal
-Date last updated: 10/2/2025
+Date last updated: 10/18/2026
 Purpose: Program that allows a rental store clerk to interact with the Sakila video store database through a text-based menu. 
 The program allows prepared statements and allow for data navigation with pagination
+Every query is run by name through the query registry in sakila_queries.py, which keeps per-query statistics
+and answers repeated lookups from a result cache that is invalidated when payments are recorded.
+Run with --report to open the database in the read-only, memory-mapped reporting mode.
 """
 
 # Import necessary libraries
 from ast import Return
 from math import e
+import os
 import sqlite3
+import sys
+
+from sakila_queries import FETCH_ARRAYSIZE, STATEMENT_CACHE_SIZE, create_indexes, registry
+from sakila_availability import create_availability
+from sakila_search import create_film_search, fts_query, search_films
+
+# The shared SQL instrumentation (statement timings, slow-query log) and the keyset pager live in the Shared folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Shared"))
+from keyset_pager import KeysetPager
+from sql_instrumentation import connect, print_report
+from sqlite_readonly import connect_readonly
+
+# Tables a normal run of the assistant creates; in reporting (read-only) mode the options that need a
+# missing one are turned off: 3 needs store_film_availability and 6 needs film_search
+REPORT_TABLES = ["store_film_availability", "film_search"]
 
 # Database Connection Function
+# With read_only the file is opened in the read-only reporting mode (memory-mapped, see sqlite_readonly.py)
 # Note: Ensure the database file path is correct, as I had to change the path to run it on my machine.
-def connect_db(db_name="Module 5/M05 Programming Assignment 2/sakila.db"):
+def connect_db(db_name="Module 5/M05 Programming Assignment 2/sakila.db", read_only=False):
     try:
-        return sqlite3.connect(db_name)
+        if read_only:
+            return connect_readonly(db_name, cached_statements=STATEMENT_CACHE_SIZE)
+        return connect(db_name, cached_statements=STATEMENT_CACHE_SIZE)
     except sqlite3.Error as e:
         print("Failed to connect to database:", e)
         print("Exiting program. \n")
         return None
 
-# Pagination Helper Function
-def paginate(data, per_page):
-    for i in range(0, len(data), per_page):
-        yield data[i:i + per_page]
+# Number of extra customer pages read ahead with each page query
+CUSTOMER_PREFETCH_PAGES = 1
 
 # Database Interaction Functions
 
-# View Customers
-def get_customers(cursor):
-    # Retrieves a basic list of all customers with their ID, first name, and last name.
-    # The results are sorted by customer ID in ascending order.
-    query = "SELECT customer_id, first_name, last_name FROM customer ORDER BY customer_id ASC"
-    cursor.execute(query)
-    return cursor.fetchall()
+# Page Through Customers
+# Returns a keyset pager over customer ID, first name, and last name, ordered by customer ID.
+def get_customer_pager(cursor, page_size):
+    return KeysetPager(cursor, "customer", "customer_id", ["customer_id", "first_name", "last_name"],
+                       page_size, CUSTOMER_PREFETCH_PAGES)
 
 # View Customer Information
 def get_customer_details(cursor, customer_id):
@@ -45,16 +63,7 @@ def get_customer_details(cursor, customer_id):
     # - City from the 'city' table (linked via city_id)
     # - Country from the 'country' table (linked via country_id)
     # - Email, active status, and last update from the 'customer' table
-    query = """
-    SELECT c.first_name, c.last_name, a.address, a.phone, ci.city, co.country, c.email, c.active, c.last_update 
-    FROM customer AS c
-    JOIN address AS a ON c.address_id = a.address_id
-    JOIN city AS ci ON a.city_id = ci.city_id
-    JOIN country AS co ON ci.country_id = co.country_id
-    WHERE c.customer_id = ?
-    """
-    cursor.execute(query, (customer_id,))
-    return cursor.fetchone()
+    return registry.fetch_one(cursor, "customer_details", (customer_id,))
 
 # View Rental History for a Customer
 def get_rentals_by_customer(cursor, customer_id):
@@ -65,38 +74,23 @@ def get_rentals_by_customer(cursor, customer_id):
     # - 'rental' to 'staff' (via staff_id) to get the staff member's full name
     # It returns:
     # - Rental ID, rental date, film title, return date, and staff name
-    query = """
-    SELECT r.rental_id, r.rental_date, f.title, r.return_date, s.first_name || ' ' || s.last_name AS staff_name
-    FROM rental AS r
-    JOIN inventory AS i ON r.inventory_id = i.inventory_id
-    JOIN film AS f ON i.film_id = f.film_id
-    JOIN staff AS s ON r.staff_id = s.staff_id
-    WHERE r.customer_id = ?
-    """
-    cursor.execute(query, (customer_id,))
-    return cursor.fetchall()
+    return registry.fetch_all(cursor, "rentals_by_customer", (customer_id,))
+
+# Stream Rental History for a Customer
+# Same rows as get_rentals_by_customer, yielded `arraysize` rows at a time so memory use stays flat
+def iter_rentals_by_customer(cursor, customer_id, arraysize=FETCH_ARRAYSIZE):
+    return registry.stream(cursor, "rentals_by_customer", (customer_id,), arraysize)
 
 # View Available Films at a Store
 def get_available_films_by_store(cursor, store_id):
-    # Retrieves a list of available films at a specific store, avoiding duplicates using DISTINCT.
-    # The query joins:
-    # - 'film' to 'language' (via language_id) to get the language name
-    # - 'film' to 'film_category' to get the category via 'category_id'
-    # - 'film_category' to 'category' for the category name
-    # - 'film' to 'inventory' to associate the film with a specific store
-    # Filters the results by store_id
-    # Returns: title, language, category, and rating of each film
-    query = """
-    SELECT DISTINCT f.title, l.name AS language, c.name AS category, f.rating AS rating
-    FROM film AS f
-    JOIN language AS l ON f.language_id = l.language_id
-    JOIN film_category AS fc ON f.film_id = fc.film_id
-    JOIN category AS c ON fc.category_id = c.category_id
-    JOIN inventory AS i ON f.film_id = i.film_id
-    WHERE i.store_id = ?
-    """
-    cursor.execute(query, (store_id,))
-    return cursor.fetchall()
+    # Retrieves the films with at least one copy in stock (not rented out) at a specific store.
+    # The counts come from the store_film_availability summary table (see sakila_availability.py),
+    # read by its (store_id, film_id) primary key. The query joins:
+    # - 'film' for the title and rating
+    # - 'language' (via language_id) to get the language name
+    # - 'film_category' and 'category' for the category name
+    # Returns: title, language, category, rating, copies in stock and copies on rent
+    return registry.fetch_all(cursor, "films_by_store", (store_id,))
 
 # Record a Payment for a Rental
 def record_payment(cursor, customer_id, rental_id, amount, staff_id=1):
@@ -107,10 +101,46 @@ def record_payment(cursor, customer_id, rental_id, amount, staff_id=1):
     # - rental_id: the rental associated with the payment (passed as a parameter)
     # - amount: the amount paid (passed as a parameter)
     # - payment_date: automatically set to the current timestamp using SQLite's datetime('now') function
-    query = """
-    INSERT INTO payment (customer_id, staff_id, rental_id, amount, payment_date) VALUES (?, ?, ?, ?, datetime('now'));
-    """
-    cursor.execute(query, (customer_id, staff_id, rental_id, amount))
+    registry.execute(cursor, "record_payment", (customer_id, staff_id, rental_id, amount))
+
+# Validate a Payment
+def validate_payment(cursor, customer_id, rental_id):
+    # Checks that the customer exists and that the rental belongs to that customer and has no payment yet.
+    # Both checks are primary key lookups (the paid check uses idx_payment_rental_id), so the customer's
+    # rental history is never loaded.
+    # Returns None if the payment is valid, otherwise the reason it is not.
+    if registry.fetch_one(cursor, "customer_exists", (customer_id,)) is None:
+        return "Customer ID does not exist."
+    status = registry.fetch_one(cursor, "rental_status", (rental_id,))
+    if status is None:
+        return "Rental ID does not exist."
+    if status[0] != customer_id:
+        return "Rental ID does not exist for this customer."
+    if status[1]:
+        return "This rental has already been paid."
+    return None
+
+# Record a Payment in a Single Transaction
+def pay_rental(connection, customer_id, rental_id, amount, staff_id=1):
+    # Validates and records the payment inside one write transaction (BEGIN IMMEDIATE), so another clerk
+    # cannot pay for the same rental between the check and the insert.
+    # Returns None if the payment was recorded, otherwise the reason it was not.
+    if connection.in_transaction:
+        connection.commit()
+    cursor = connection.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        problem = validate_payment(cursor, customer_id, rental_id)
+        if problem is None:
+            record_payment(cursor, customer_id, rental_id, amount, staff_id)
+            connection.commit()
+        else:
+            connection.rollback()
+        return problem
+    except sqlite3.Error as e:
+        if connection.in_transaction:
+            connection.rollback()
+        return f"Payment could not be recorded: {e}"
 
 # View Payment Information for a Customer
 def get_payment_details(cursor, customer_id):
@@ -121,24 +151,41 @@ def get_payment_details(cursor, customer_id):
     # - City from the 'city' table (linked via city_id)
     # - Country from the 'country' table (linked via country_id)
     # - Email, active status, and last update from the 'customer' table
-    query = """
-    SELECT c.first_name, c.last_name, f.title, p.amount, p.payment_date, s.first_name || ' ' || s.last_name AS staff_name
-    FROM customer AS c
-    JOIN payment AS p ON c.customer_id = p.customer_id
-    JOIN rental AS r ON p.rental_id = r.rental_id
-    JOIN inventory AS i ON r.inventory_id = i.inventory_id
-    JOIN film AS f ON i.film_id = f.film_id
-    JOIN staff AS s ON p.staff_id = s.staff_id
-    WHERE c.customer_id = ?
-    """
-    cursor.execute(query, (customer_id,))
-    return cursor.fetchall()
+    return registry.fetch_all(cursor, "payment_details", (customer_id,))
+
+# Stream Payment Information for a Customer
+# Same rows as get_payment_details, yielded `arraysize` rows at a time so memory use stays flat
+def iter_payment_details(cursor, customer_id, arraysize=FETCH_ARRAYSIZE):
+    return registry.stream(cursor, "payment_details", (customer_id,), arraysize)
+
+# Print Rental History for a Customer
+# Prints each rental as it is read and returns the number printed
+def print_rentals(cursor, cust_id):
+    count = 0
+    for r in iter_rentals_by_customer(cursor, cust_id):
+        if count == 0:
+            print(f"\nRentals for Customer ID {cust_id}:")
+        print(f"Rental ID: {r[0]} | Date Rented:{r[1]} | Film: {r[2]} | Return: {r[3]} | Staff: {r[4]}")
+        count += 1
+    if count == 0:
+        print(f"\nNo rentals found for Customer ID {cust_id}.")
+    return count
+
+# Print Payment Information for a Customer
+# Prints each payment as it is read and returns the number printed
+def print_payments(cursor, cust_id):
+    count = 0
+    for p in iter_payment_details(cursor, cust_id):
+        if count == 0:
+            print(f"\nPayments for Customer ID {cust_id}:")
+        print(f"Customer: {p[0]} {p[1]} | Film: {p[2]} | Payment Amount: ${p[3]} | Payment Date: {p[4]} | Staff Member: {p[5]}")
+        count += 1
+    return count
 
 # User Interface Functions
 
 # View Customer Information
 def view_customer_info(cursor):
-    customers = get_customers(cursor)
 
 # Prompt user to see if they know the customer ID
 # If yes, prompt for ID and display details
@@ -163,23 +210,23 @@ def view_customer_info(cursor):
 # If customer_id is not known, display paginated list of customers to choose from
         elif known_customer == 'n':
             page_size = int(input("How many customers per page? "))
-            pages = list(paginate(customers, page_size))
-            current = 0
+            pager = get_customer_pager(cursor, page_size)
+            pager.first()
 
             while True:
-                print(f"\n--- Page {current + 1}/{len(pages)} ---\n")
-                for i, cust in enumerate(pages[current], 1):
+                print(f"\n--- Page {pager.page_number} ---\n")
+                for i, cust in enumerate(pager.current, 1):
                     print(f"Entry # {i} | Customer ID: {cust[0]} | Name:{cust[2]} {cust[1]}")
                 selection = input("\nSelect which entry you would like to view more information on. (Hit 0 for next page, -1 for previous page): \n")
                 if selection == '0':
-                    current = (current + 1) % len(pages)
+                    pager.next()
                 elif selection == '-1':
-                    current = (current - 1) % len(pages)
+                    pager.previous()
                 else:
                     try:
                         index = int(selection) - 1
-                        if 0 <= index < len(pages[current]):
-                            cust_id = pages[current][index][0]
+                        if 0 <= index < len(pager.current):
+                            cust_id = pager.current[index][0]
                             details = get_customer_details(cursor, cust_id)
                             print(f"\nDetails for Customer ID {cust_id}:")
                             print(f"Name: {details[1]}, {details[0]}")
@@ -211,7 +258,6 @@ def view_customer_info(cursor):
 # View Rental History for a Customer
 # Similar structure to view_customer_info, but retrieves and displays rental history
 def view_rentals(cursor):
-    customers = get_customers(cursor)
 
 # Prompt user to see if they know the customer ID
 # If yes, prompt for ID and display rental history
@@ -221,12 +267,8 @@ def view_rentals(cursor):
         if known_customer == 'y':
             try:
                 cust_id = int(input("Enter customer ID: "))
-                rentals = get_rentals_by_customer(cursor, cust_id)
-                if rentals:
-                    print(f"\nRentals for Customer ID {cust_id}:")
-                    for r in rentals:
-                        print(f"Rental ID: {r[0]} | Date Rented:{r[1]} | Film: {r[2]} | Return: {r[3]} | Staff: {r[4]}")
-                    input("Press Enter to continue...")
+                print_rentals(cursor, cust_id)
+                input("Press Enter to continue...")
             except ValueError:
                 print("Invalid input. Returning to main menu. \n")
                 input("Press Enter to continue...")
@@ -235,27 +277,24 @@ def view_rentals(cursor):
 # If customer_id is not known, display paginated list of customers to choose from
         elif known_customer == 'n':
             page_size = int(input("How many customers per page? "))
-            pages = list(paginate(customers, page_size))
-            current = 0
+            pager = get_customer_pager(cursor, page_size)
+            pager.first()
 
             while True:
-                print(f"\n--- Page {current + 1}/{len(pages)} ---\n")
-                for i, cust in enumerate(pages[current], 1):
+                print(f"\n--- Page {pager.page_number} ---\n")
+                for i, cust in enumerate(pager.current, 1):
                     print(f"Entry # {i} | Customer ID: {cust[0]} | Name:{cust[2]} {cust[1]}")
                 selection = input("\nSelect which entry you would like to view more information on. (Hit 0 for next page, -1 for previous page): \n")
                 if selection == '0':
-                    current = (current + 1) % len(pages)
+                    pager.next()
                 elif selection == '-1':
-                    current = (current - 1) % len(pages)
+                    pager.previous()
                 else:
                     try:
                         index = int(selection) - 1
-                        if 0 <= index < len(pages[current]):
-                            cust_id = pages[current][index][0]
-                            rentals = get_rentals_by_customer(cursor, cust_id)
-                            print(f"\nRentals for Customer ID {cust_id}:")
-                            for r in rentals:
-                                print(f"Rental ID: {r[0]} | Date Rented:{r[1]} | Film: {r[2]} | Return: {r[3]} | Staff: {r[4]}")
+                        if 0 <= index < len(pager.current):
+                            cust_id = pager.current[index][0]
+                            print_rentals(cursor, cust_id)
                             input("Press Enter to continue...")
                             break
 
@@ -285,42 +324,45 @@ def view_films(cursor):
     store_id = int(input("Enter store ID (1 or 2): "))
     films = get_available_films_by_store(cursor, store_id)
     for f in films:
-        print(f"Title: {f[0]}, Language: {f[1]}, Category: {f[2]}, Rating: {f[3]}")
+        print(f"Title: {f[0]}, Language: {f[1]}, Category: {f[2]}, Rating: {f[3]}, In Stock: {f[4]}, On Rent: {f[5]}")
     input("Press Enter to continue...")
 
 # Record a Payment for a Rental
 # Prompts user for customer ID, rental ID, and payment amount, then records the payment
 def add_payment(cursor):
-    customer_id = int(input("Customer ID: "))
-    rental_id = int(input("Rental ID: "))
-
-# Check if customer ID exists
     try:
-        cursor.execute("SELECT 1 FROM customer WHERE customer_id = ?", (customer_id,))
-    except:
-        print("Customer ID does not exist. \n")
+        customer_id = int(input("Customer ID: "))
+        rental_id = int(input("Rental ID: "))
+    except ValueError:
+        print("Invalid input. Returning to main menu. \n")
         input("Press Enter to continue...")
         return
 
-# Check if rental ID exists for the given customer
-    rentals = get_rentals_by_customer(cursor, customer_id)
-    rental_ids = [r[0] for r in rentals]
-    if rental_id not in rental_ids:
-        print("\nRental ID does not exist for this customer. \n")
+# Check that the customer exists and the rental is theirs and unpaid before asking for the amount
+    problem = validate_payment(cursor, customer_id, rental_id)
+    if problem:
+        print(f"\n{problem} \n")
         print("Returning to previous menu. \n")
         input("Press Enter to continue...")
         return
 
-# Prompt for payment amount and record the payment
-    amount = float(input("Payment Amount: "))
-    record_payment(cursor, customer_id, rental_id, amount)
-    print("Payment recorded. \n")
+# Prompt for payment amount and record the payment (the checks are repeated inside the transaction)
+    try:
+        amount = float(input("Payment Amount: "))
+    except ValueError:
+        print("Invalid input. Returning to main menu. \n")
+        input("Press Enter to continue...")
+        return
+    problem = pay_rental(cursor.connection, customer_id, rental_id, amount)
+    if problem:
+        print(f"\n{problem} \n")
+    else:
+        print("Payment recorded. \n")
     input("Press Enter to continue...")
 
 # View Payment Information for a Customer
 # Similar structure to view_customer_info, but retrieves and displays payment information
 def view_payment_info(cursor):
-    customers = get_customers(cursor)
 
 # Prompt user to see if they know the customer ID
 # If yes, prompt for ID and display payment information
@@ -330,11 +372,7 @@ def view_payment_info(cursor):
         if known_customer == 'y':
             try:
                 cust_id = int(input("Enter customer ID: "))
-                payments = get_payment_details(cursor, cust_id)
-                if payments:
-                    print(f"\nPayments for Customer ID {cust_id}:")
-                    for p in payments:
-                        print(f"Customer: {p[0]} {p[1]} | Film: {p[2]} | Payment Amount: ${p[3]} | Payment Date: {p[4]} | Staff Member: {p[5]}")
+                if print_payments(cursor, cust_id):
                     input("Press Enter to continue...")
                     return
                 else:
@@ -350,27 +388,25 @@ def view_payment_info(cursor):
 # If customer_id is not known, display paginated list of customers to choose from
         elif known_customer == 'n':
             page_size = int(input("How many customers per page? "))
-            pages = list(paginate(customers, page_size))
-            current = 0
+            pager = get_customer_pager(cursor, page_size)
+            pager.first()
 
             while True:
-                print(f"\n--- Page {current + 1}/{len(pages)} ---\n")
-                for i, cust in enumerate(pages[current], 1):
+                print(f"\n--- Page {pager.page_number} ---\n")
+                for i, cust in enumerate(pager.current, 1):
                     print(f"{i}. {cust[0]} - {cust[2]} {cust[1]}")
                 selection = input("\nSelect customer (0 for next, -1 for previous): \n")
                 if selection == '0':
-                    current = (current + 1) % len(pages)
+                    pager.next()
                 elif selection == '-1':
-                    current = (current - 1) % len(pages)
+                    pager.previous()
                 else:
                     try:
                         index = int(selection) - 1
-                        if 0 <= index < len(pages[current]):
-                            cust_id = pages[current][index][0]
-                            payments = get_payment_details(cursor, cust_id)
-                            print(f"\nPayments for Customer ID {cust_id}:")
-                            for p in payments:
-                                print(f"Customer: {p[0]} {p[1]} | Film: {p[2]} | Payment Amount: ${p[3]} | Payment Date: {p[4]} | Staff Member: {p[5]}")
+                        if 0 <= index < len(pager.current):
+                            cust_id = pager.current[index][0]
+                            if print_payments(cursor, cust_id) == 0:
+                                print(f"\nNo payments found for Customer ID {cust_id}.")
                             input("Press Enter to continue...")
                             break
 
@@ -394,11 +430,77 @@ def view_payment_info(cursor):
         input("Press Enter to continue...")
         return
     
+# Search Films
+# Prompts user for search words and displays matching films, best match first, one page at a time
+def view_film_search(cursor):
+    text = input("Search films by title or description: ").strip()
+    if not fts_query(text):
+        print("Please enter at least one word. \n")
+        input("Press Enter to continue...")
+        return
+    try:
+        page_size = int(input("How many results per page? "))
+        if page_size < 1:
+            raise ValueError
+    except ValueError:
+        print("Invalid input. Returning to main menu. \n")
+        input("Press Enter to continue...")
+        return
+
+# Read one extra row to know whether there is another page
+    page = 0
+    while True:
+        results = search_films(cursor, text, page_size + 1, page * page_size)
+        if not results:
+            print("\nNo films match your search. \n")
+            input("Press Enter to continue...")
+            return
+        print(f"\n--- Results Page {page + 1} ---\n")
+        for i, film in enumerate(results[:page_size], page * page_size + 1):
+            print(f"{i}. {film[1]} | Film ID: {film[0]} | Year: {film[2]} | Rating: {film[3]}")
+            print(f"   {film[4]}")
+        has_next = len(results) > page_size
+        selection = input("\nHit 0 for next page, -1 for previous page, anything else to return: \n")
+        if selection == '0' and has_next:
+            page += 1
+        elif selection == '0':
+            print("\nThis is the last page. \n")
+        elif selection == '-1' and page > 0:
+            page -= 1
+        elif selection == '-1':
+            print("\nThis is the first page. \n")
+        else:
+            return
+
+# View Query Statistics
+# Displays how often each registered query has run this session, its latency and the rows it returned
+def view_query_stats():
+    print("\n--- Query Statistics ---\n")
+    for line in registry.report():
+        print(line)
+    print_report()
+    input("\nPress Enter to continue...")
+
 # Main Program Function
+# Run with --report for the read-only reporting mode; recording payments is then turned off
 def main():
-    conn = connect_db()
+    read_only = "--report" in sys.argv
+    conn = connect_db(read_only=read_only)
     if not conn:
         return
+    if read_only:
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        availability_available = REPORT_TABLES[0] in existing
+        search_available = REPORT_TABLES[1] in existing
+        print("\nRead-only reporting mode: payments cannot be recorded. \n")
+        missing = [table for table in REPORT_TABLES if table not in existing]
+        if missing:
+            print(f"Missing {', '.join(missing)}; run the assistant normally once to enable every option. \n")
+    else:
+        create_indexes(conn)
+        create_availability(conn)
+        availability_available = True
+        search_available = create_film_search(conn)
     cursor = conn.cursor()
 
 # Display menu and prompt for user choice
@@ -409,7 +511,9 @@ def main():
         print("3. View Available Films at a Store")
         print("4. Record a Payment for a Rental")
         print("5. View Payment Information for a Customer")
-        print("6. Exit")
+        print("6. Search Films")
+        print("7. View Query Statistics")
+        print("8. Exit")
         choice = input("Enter choice: ")
 
 # Execute the corresponding function based on user choice
@@ -418,13 +522,27 @@ def main():
         elif choice == '2':
             view_rentals(cursor)
         elif choice == '3':
-            view_films(cursor)
+            if availability_available:
+                view_films(cursor)
+            else:
+                print("\nFilm availability is not available: the database has no store_film_availability table. \n")
+                input("Press Enter to continue...")
+        elif choice == '4' and read_only:
+            print("\nPayments cannot be recorded in read-only reporting mode. \n")
+            input("Press Enter to continue...")
         elif choice == '4':
             add_payment(cursor)
-            conn.commit()
         elif choice == '5':
             view_payment_info(cursor)
         elif choice == '6':
+            if search_available:
+                view_film_search(cursor)
+            else:
+                print("\nFilm search is not available: no film_search table with this database or SQLite build. \n")
+                input("Press Enter to continue...")
+        elif choice == '7':
+            view_query_stats()
+        elif choice == '8':
             print("Goodbye! \n")
             input("Press Enter to continue...")
             break
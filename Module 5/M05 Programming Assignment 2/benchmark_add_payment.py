@@ -0,0 +1,125 @@
+"""
+Program name: benchmark_add_payment.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Measures the latency of validating and recording a payment, before and after the change to add_payment().
+Before: the rental was checked by loading the customer's whole rental history (get_rentals_by_customer) and
+searching the list, then the payment was inserted and committed separately.
+After: validate_payment() does two primary key lookups and pay_rental() checks and inserts in one transaction.
+The "after" path is measured with and without idx_payment_rental_id. A temporary copy of the database is used,
+with the payments of some sampled rentals deleted so there are unpaid rentals to pay.
+
+    python "Module 5/M05 Programming Assignment 2/benchmark_add_payment.py" --db "Module 5/M05 Programming Assignment 2/sakila.db"
+"""
+
+# Import necessary libraries
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+from John_Dostal_salika_assistant import pay_rental, validate_payment
+from sakila_queries import INDEX_STATEMENTS, QUERIES, STATEMENT_CACHE_SIZE, create_indexes
+
+# Note: Ensure the database file path is correct, as I had to change the path to run it on my machine.
+DEFAULT_DB_NAME = "Module 5/M05 Programming Assignment 2/sakila.db"
+DEFAULT_SAMPLES = 200
+SEED = 210
+
+
+# Old Validation Function
+# The validation add_payment() used before: load every rental for the customer and search the list
+def old_validate(cursor, customer_id, rental_id):
+    cursor.execute("SELECT 1 FROM customer WHERE customer_id = ?", (customer_id,))
+    rentals = cursor.execute(QUERIES["rentals_by_customer"], (customer_id,)).fetchall()
+    return rental_id in [r[0] for r in rentals]
+
+# Old Record Function
+# The old payment path: validate, then insert and commit
+def old_record(connection, customer_id, rental_id, amount):
+    cursor = connection.cursor()
+    if old_validate(cursor, customer_id, rental_id):
+        cursor.execute(QUERIES["record_payment"], (customer_id, 1, rental_id, amount))
+        connection.commit()
+
+# Timing Helper Function
+# Returns the median and 95th percentile in milliseconds of calling `function` once per sample
+def time_calls(function, samples):
+    durations = []
+    for sample in samples:
+        start_time = time.perf_counter_ns()
+        function(*sample)
+        durations.append((time.perf_counter_ns() - start_time) / 1_000_000)
+    durations.sort()
+    return statistics.median(durations), durations[int(0.95 * (len(durations) - 1))]
+
+# Benchmark Function
+def run_benchmark(db_name, sample_count):
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_copy = os.path.join(work_dir, "benchmark.db")
+        shutil.copyfile(db_name, db_copy)
+        connection = sqlite3.connect(db_copy, cached_statements=STATEMENT_CACHE_SIZE)
+        cursor = connection.cursor()
+
+        # Pick rentals and delete their payments so they can be paid again, one group per payment path
+        rentals = cursor.execute("SELECT rental_id, customer_id FROM rental ORDER BY rental_id").fetchall()
+        sampled = random.Random(SEED).sample(rentals, sample_count * 3)
+        cursor.executemany("DELETE FROM payment WHERE rental_id = ?", [(rental_id,) for rental_id, _ in sampled])
+        connection.commit()
+        groups = [sampled[i * sample_count:(i + 1) * sample_count] for i in range(3)]
+        checks = [(customer_id, rental_id) for rental_id, customer_id in groups[0]]
+
+        def drop_indexes():
+            for statement in INDEX_STATEMENTS:
+                connection.execute(f"DROP INDEX IF EXISTS {statement.split()[5]};")
+            connection.commit()
+
+        # Validation only (read only, so every path checks the same rentals)
+        drop_indexes()
+        results.append(("validate", "before: rental history list",
+                        time_calls(lambda c, r: old_validate(cursor, c, r), checks)))
+        results.append(("validate", "after: point lookups, no index",
+                        time_calls(lambda c, r: validate_payment(cursor, c, r), checks)))
+        create_indexes(connection)
+        results.append(("validate", "after: point lookups + index",
+                        time_calls(lambda c, r: validate_payment(cursor, c, r), checks)))
+
+        # Validate and record, including the commit
+        drop_indexes()
+        results.append(("record", "before: validate, insert, commit",
+                        time_calls(lambda c, r: old_record(connection, c, r, 1.99),
+                                   [(c, r) for r, c in groups[0]])))
+        results.append(("record", "after: one transaction, no index",
+                        time_calls(lambda c, r: pay_rental(connection, c, r, 1.99),
+                                   [(c, r) for r, c in groups[1]])))
+        create_indexes(connection)
+        results.append(("record", "after: one transaction + index",
+                        time_calls(lambda c, r: pay_rental(connection, c, r, 1.99),
+                                   [(c, r) for r, c in groups[2]])))
+        connection.close()
+    return results
+
+# Main function to run the benchmark
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark payment validation and recording.")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help="sakila database file (a temporary copy is used)")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="payments per path")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Database file not found: {args.db}")
+        sys.exit(1)
+
+    print(f"{'Step':<9} {'Path':<34} {'p50 ms':>9} {'p95 ms':>9}")
+    for step, path, (median, p95) in run_benchmark(args.db, max(1, args.samples)):
+        print(f"{step:<9} {path:<34} {median:>9.3f} {p95:>9.3f}")
+
+# Run the main function
+if __name__ == "__main__":
+    main()
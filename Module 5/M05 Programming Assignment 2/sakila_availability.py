@@ -0,0 +1,276 @@
+"""
+Program name: sakila_availability.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Precomputed film availability for each store.
+store_film_availability holds one row per (store_id, film_id) with the number of copies in stock and the number
+of copies out on rent (a copy is on rent while it has a rental with no return_date). Triggers on rental and
+inventory keep the counts up to date as copies are rented, returned, added, removed or moved, so "which films are
+available at store X" is a read of the table's primary key instead of a five-table join, and it leaves out films
+whose copies are all rented.
+
+    python "Module 5/M05 Programming Assignment 2/sakila_availability.py" --verify
+    python "Module 5/M05 Programming Assignment 2/sakila_availability.py" --rebuild
+    python "Module 5/M05 Programming Assignment 2/sakila_availability.py" --benchmark
+"""
+
+# Import necessary libraries
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+from sakila_queries import QUERIES, STATEMENT_CACHE_SIZE
+
+# Note: Ensure the database file path is correct, as I had to change the path to run it on my machine.
+DEFAULT_DB_NAME = "Module 5/M05 Programming Assignment 2/sakila.db"
+
+# Expression for "copy X has an open rental"; the index below makes it a single index probe
+OPEN_RENTAL = "EXISTS (SELECT 1 FROM rental WHERE inventory_id = {} AND return_date IS NULL)"
+
+# Counts for every (store_id, film_id), computed from inventory and rental
+AVAILABILITY_QUERY = f"""
+SELECT i.store_id, i.film_id,
+       SUM(NOT {OPEN_RENTAL.format("i.inventory_id")}) AS in_stock,
+       SUM({OPEN_RENTAL.format("i.inventory_id")}) AS on_rent
+FROM inventory AS i
+GROUP BY i.store_id, i.film_id
+"""
+
+# Statements that create the summary table and the triggers that maintain it
+AVAILABILITY_SCHEMA = [
+    "CREATE INDEX IF NOT EXISTS idx_rental_inventory_return ON rental(inventory_id, return_date);",
+    """CREATE TABLE store_film_availability (
+        store_id INTEGER NOT NULL,
+        film_id INTEGER NOT NULL,
+        in_stock INTEGER NOT NULL,
+        on_rent INTEGER NOT NULL,
+        PRIMARY KEY (store_id, film_id)
+    ) WITHOUT ROWID;""",
+
+    # A copy goes out: only if it had no other open rental
+    f"""CREATE TRIGGER availability_rental_insert AFTER INSERT ON rental
+    WHEN new.return_date IS NULL AND NOT EXISTS (SELECT 1 FROM rental WHERE inventory_id = new.inventory_id
+                                                 AND return_date IS NULL AND rental_id != new.rental_id)
+    BEGIN
+        UPDATE store_film_availability SET in_stock = in_stock - 1, on_rent = on_rent + 1
+        WHERE (store_id, film_id) = (SELECT store_id, film_id FROM inventory WHERE inventory_id = new.inventory_id);
+    END;""",
+
+    # A return (or a rental moved to another copy) frees the old copy once it has no open rental left
+    f"""CREATE TRIGGER availability_rental_release AFTER UPDATE OF return_date, inventory_id ON rental
+    WHEN old.return_date IS NULL AND NOT {OPEN_RENTAL.format("old.inventory_id")}
+    BEGIN
+        UPDATE store_film_availability SET in_stock = in_stock + 1, on_rent = on_rent - 1
+        WHERE (store_id, film_id) = (SELECT store_id, film_id FROM inventory WHERE inventory_id = old.inventory_id);
+    END;""",
+
+    # A rental reopened (or moved to another copy) takes the new copy if it was free
+    f"""CREATE TRIGGER availability_rental_take AFTER UPDATE OF return_date, inventory_id ON rental
+    WHEN new.return_date IS NULL AND NOT (old.return_date IS NULL AND old.inventory_id = new.inventory_id)
+         AND NOT EXISTS (SELECT 1 FROM rental WHERE inventory_id = new.inventory_id
+                         AND return_date IS NULL AND rental_id != new.rental_id)
+    BEGIN
+        UPDATE store_film_availability SET in_stock = in_stock - 1, on_rent = on_rent + 1
+        WHERE (store_id, film_id) = (SELECT store_id, film_id FROM inventory WHERE inventory_id = new.inventory_id);
+    END;""",
+
+    f"""CREATE TRIGGER availability_rental_delete AFTER DELETE ON rental
+    WHEN old.return_date IS NULL AND NOT {OPEN_RENTAL.format("old.inventory_id")}
+    BEGIN
+        UPDATE store_film_availability SET in_stock = in_stock + 1, on_rent = on_rent - 1
+        WHERE (store_id, film_id) = (SELECT store_id, film_id FROM inventory WHERE inventory_id = old.inventory_id);
+    END;""",
+
+    # Copies added, removed or moved to another store or film
+    f"""CREATE TRIGGER availability_inventory_insert AFTER INSERT ON inventory
+    BEGIN
+        INSERT INTO store_film_availability (store_id, film_id, in_stock, on_rent)
+        VALUES (new.store_id, new.film_id, NOT {OPEN_RENTAL.format("new.inventory_id")},
+                {OPEN_RENTAL.format("new.inventory_id")})
+        ON CONFLICT (store_id, film_id) DO UPDATE
+        SET in_stock = in_stock + excluded.in_stock, on_rent = on_rent + excluded.on_rent;
+    END;""",
+
+    f"""CREATE TRIGGER availability_inventory_delete AFTER DELETE ON inventory
+    BEGIN
+        UPDATE store_film_availability
+        SET in_stock = in_stock - (NOT {OPEN_RENTAL.format("old.inventory_id")}),
+            on_rent = on_rent - {OPEN_RENTAL.format("old.inventory_id")}
+        WHERE store_id = old.store_id AND film_id = old.film_id;
+        DELETE FROM store_film_availability
+        WHERE store_id = old.store_id AND film_id = old.film_id AND in_stock = 0 AND on_rent = 0;
+    END;""",
+
+    f"""CREATE TRIGGER availability_inventory_update AFTER UPDATE OF store_id, film_id ON inventory
+    BEGIN
+        UPDATE store_film_availability
+        SET in_stock = in_stock - (NOT {OPEN_RENTAL.format("old.inventory_id")}),
+            on_rent = on_rent - {OPEN_RENTAL.format("old.inventory_id")}
+        WHERE store_id = old.store_id AND film_id = old.film_id;
+        DELETE FROM store_film_availability
+        WHERE store_id = old.store_id AND film_id = old.film_id AND in_stock = 0 AND on_rent = 0;
+        INSERT INTO store_film_availability (store_id, film_id, in_stock, on_rent)
+        VALUES (new.store_id, new.film_id, NOT {OPEN_RENTAL.format("new.inventory_id")},
+                {OPEN_RENTAL.format("new.inventory_id")})
+        ON CONFLICT (store_id, film_id) DO UPDATE
+        SET in_stock = in_stock + excluded.in_stock, on_rent = on_rent + excluded.on_rent;
+    END;""",
+]
+
+# The films_by_store query before the summary table, kept for the benchmark
+JOIN_QUERY = """
+SELECT DISTINCT f.title, l.name AS language, c.name AS category, f.rating AS rating
+FROM film AS f
+JOIN language AS l ON f.language_id = l.language_id
+JOIN film_category AS fc ON f.film_id = fc.film_id
+JOIN category AS c ON fc.category_id = c.category_id
+JOIN inventory AS i ON f.film_id = i.film_id
+WHERE i.store_id = ?
+"""
+
+BENCHMARK_RUNS = 50
+
+
+# Function to create the summary table and its triggers if they do not exist yet
+def create_availability(connection):
+    exists = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'store_film_availability'").fetchone()
+    if exists:
+        return
+    if connection.in_transaction:
+        connection.commit()
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        for statement in AVAILABILITY_SCHEMA:
+            connection.execute(statement)
+        connection.execute(f"INSERT INTO store_film_availability {AVAILABILITY_QUERY}")
+        connection.commit()
+    except sqlite3.Error:
+        connection.rollback()
+        raise
+
+# Function to recompute every count from inventory and rental
+def rebuild_availability(connection):
+    create_availability(connection)
+    if connection.in_transaction:
+        connection.commit()
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        connection.execute("DELETE FROM store_film_availability")
+        connection.execute(f"INSERT INTO store_film_availability {AVAILABILITY_QUERY}")
+        connection.commit()
+    except sqlite3.Error:
+        connection.rollback()
+        raise
+
+# Function to compare the summary table with a fresh computation
+# Returns a list of (store_id, film_id, stored counts, actual counts) for every row that differs
+def verify_availability(connection):
+    stored = {(row[0], row[1]): (row[2], row[3]) for row in
+              connection.execute("SELECT store_id, film_id, in_stock, on_rent FROM store_film_availability")}
+    actual = {(row[0], row[1]): (row[2], row[3]) for row in connection.execute(AVAILABILITY_QUERY)}
+    mismatches = []
+    for key in sorted(set(stored) | set(actual)):
+        if stored.get(key) != actual.get(key):
+            mismatches.append(key + (stored.get(key), actual.get(key)))
+    return mismatches
+
+# Timing Helper Function
+def time_query(connection, sql, params, runs):
+    connection.execute(sql, params).fetchall()
+    timings = []
+    for _ in range(runs):
+        start_time = time.perf_counter_ns()
+        connection.execute(sql, params).fetchall()
+        timings.append((time.perf_counter_ns() - start_time) / 1_000_000)
+    return statistics.median(timings)
+
+# Benchmark function comparing the five-table join with the summary table
+# Also times renting and returning a copy, to show what the triggers add to each write.
+# Runs on a temporary copy of the database.
+def run_benchmark(db_name, runs):
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_copy = os.path.join(work_dir, "availability.db")
+        shutil.copyfile(db_name, db_copy)
+        connection = sqlite3.connect(db_copy, cached_statements=STATEMENT_CACHE_SIZE)
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_rental_inventory_return ON rental(inventory_id, return_date)")
+        connection.commit()
+
+        # Writes without the triggers
+        inventory_id = connection.execute(
+            "SELECT inventory_id FROM inventory WHERE NOT " + OPEN_RENTAL.format("inventory.inventory_id")
+            + " LIMIT 1").fetchone()[0]
+
+        def rent_and_return():
+            cursor = connection.execute(
+                "INSERT INTO rental (rental_date, inventory_id, customer_id, staff_id) "
+                "VALUES (datetime('now'), ?, 1, 1)", (inventory_id,))
+            connection.execute("UPDATE rental SET return_date = datetime('now') WHERE rental_id = ?",
+                               (cursor.lastrowid,))
+
+        def time_writes():
+            timings = []
+            for _ in range(runs):
+                start_time = time.perf_counter_ns()
+                rent_and_return()
+                timings.append((time.perf_counter_ns() - start_time) / 1_000_000)
+            connection.rollback()
+            return statistics.median(timings)
+
+        results.append(("rent + return a copy, no triggers", time_writes()))
+        create_availability(connection)
+        results.append(("rent + return a copy, with triggers", time_writes()))
+
+        for store_id in [1, 2]:
+            results.append((f"films at store {store_id}, five-table join",
+                            time_query(connection, JOIN_QUERY, (store_id,), runs)))
+            results.append((f"films at store {store_id}, summary table",
+                            time_query(connection, QUERIES["films_by_store"], (store_id,), runs)))
+        connection.close()
+    return results
+
+# Main function to rebuild, verify or benchmark the summary table
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the store_film_availability summary table.")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help="sakila database file")
+    parser.add_argument("--rebuild", action="store_true", help="recompute every count")
+    parser.add_argument("--verify", action="store_true", help="compare the table with a fresh computation")
+    parser.add_argument("--benchmark", action="store_true", help="time lookups and writes on a temporary copy")
+    parser.add_argument("--runs", type=int, default=BENCHMARK_RUNS, help="timed runs for --benchmark")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Database file not found: {args.db}")
+        sys.exit(1)
+
+    if args.benchmark:
+        for label, median_ms in run_benchmark(args.db, max(1, args.runs)):
+            print(f"{label:<40} {median_ms:>9.3f} ms")
+        return
+
+    connection = sqlite3.connect(args.db)
+    if args.rebuild:
+        rebuild_availability(connection)
+        print("store_film_availability rebuilt.")
+    else:
+        create_availability(connection)
+    if args.verify or not args.rebuild:
+        mismatches = verify_availability(connection)
+        if mismatches:
+            print(f"{len(mismatches)} row(s) differ (store, film, stored in_stock/on_rent, actual in_stock/on_rent):")
+            for mismatch in mismatches[:20]:
+                print(f"  {mismatch}")
+            print("Run with --rebuild to fix them.")
+        else:
+            print("store_film_availability matches inventory and rental.")
+    connection.close()
+
+# Run the main function
+if __name__ == "__main__":
+    main()
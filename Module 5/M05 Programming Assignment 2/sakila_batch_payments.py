@@ -0,0 +1,224 @@
+"""
+Program name: sakila_batch_payments.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Batch payment posting for end-of-day reconciliation in the Sakila database.
+post_payments() takes any iterable of (customer_id, rental_id, amount, staff_id) rows. The rows are loaded into a
+temporary table and checked with one set-based query (customer, staff and rental exist, the rental belongs to the
+customer, it has no payment yet and it is not paid twice in the batch), then the valid rows are inserted with
+executemany in chunks. Everything happens in one transaction with a single commit, so there is one fsync for the
+whole batch instead of one per payment. It returns a result for every row plus throughput numbers.
+
+    python "Module 5/M05 Programming Assignment 2/sakila_batch_payments.py" payments.csv --chunk-size 1000
+
+CSV rows: customer_id,rental_id,amount[,staff_id]. A first row starting with "customer_id" is treated as a header.
+"""
+
+# Import necessary libraries
+import argparse
+import csv
+import math
+import os
+import pathlib
+import sqlite3
+import sys
+import time
+
+from sakila_queries import QUERIES, QUERY_WRITES, STATEMENT_CACHE_SIZE, create_indexes, registry
+
+# Note: Ensure the database file path is correct, as I had to change the path to run it on my machine.
+DEFAULT_DB_NAME = "Module 5/M05 Programming Assignment 2/sakila.db"
+
+# Default number of rows per executemany call
+DEFAULT_CHUNK_SIZE = 1000
+
+# Staff member used when a row does not name one
+DEFAULT_STAFF_ID = 1
+
+# Set-based validation of every row in the batch table
+VALIDATION_QUERY = """
+SELECT b.line,
+       c.customer_id IS NULL,
+       s.staff_id IS NULL,
+       r.rental_id IS NULL,
+       r.customer_id IS NOT b.customer_id,
+       EXISTS (SELECT 1 FROM payment AS p WHERE p.rental_id = b.rental_id),
+       EXISTS (SELECT 1 FROM temp.batch_payment AS d WHERE d.rental_id = b.rental_id AND d.line < b.line)
+FROM temp.batch_payment AS b
+LEFT JOIN customer AS c ON c.customer_id = b.customer_id
+LEFT JOIN staff AS s ON s.staff_id = b.staff_id
+LEFT JOIN rental AS r ON r.rental_id = b.rental_id
+ORDER BY b.line
+"""
+
+# Reasons for each validation column, in the order of VALIDATION_QUERY
+VALIDATION_REASONS = [
+    "customer ID does not exist",
+    "staff ID does not exist",
+    "rental ID does not exist",
+    "rental does not belong to this customer",
+    "rental has already been paid",
+    "rental is paid more than once in this batch",
+]
+
+
+# Row Parser Function
+# Returns ((customer_id, rental_id, amount, staff_id), None) or (None, reason)
+def parse_payment(row):
+    if len(row) not in [3, 4]:
+        return None, f"expected 3 or 4 fields, found {len(row)}"
+    try:
+        customer_id = int(row[0])
+        rental_id = int(row[1])
+        amount = round(float(row[2]), 2)
+        staff_id = int(row[3]) if len(row) == 4 and str(row[3]).strip() != "" else DEFAULT_STAFF_ID
+    except (TypeError, ValueError):
+        return None, "IDs must be whole numbers and the amount must be a number"
+    # float() also accepts "nan" and "inf"; NaN would be stored as NULL and fail the whole batch
+    if not math.isfinite(amount):
+        return None, "amount must be a finite number"
+    if amount <= 0:
+        return None, "amount must be greater than zero"
+    return (customer_id, rental_id, amount, staff_id), None
+
+# CSV Reader Function
+# Streams payment rows from a CSV file, skipping blank lines and a header row
+def read_payments_csv(path):
+    with open(path, newline="", encoding="utf-8") as file:
+        for line_number, row in enumerate(csv.reader(file), 1):
+            if not row or all(not field.strip() for field in row):
+                continue
+            if line_number == 1 and row[0].strip().lower() == "customer_id":
+                continue
+            yield [field.strip() for field in row]
+
+# Batch Posting Function
+# Validates and posts every payment in `payments` in a single transaction.
+# Returns (results, summary): one {"row", "status", "reason"} dict per input row (status is "posted" or
+# "rejected") and a summary with counts, timings and rows per second.
+def post_payments(connection, payments, chunk_size=DEFAULT_CHUNK_SIZE):
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+    start_time = time.perf_counter()
+
+    # Parse the rows; rows that cannot be parsed are rejected before touching the database
+    results = []
+    parsed = []
+    for row_number, row in enumerate(payments, 1):
+        payment, reason = parse_payment(row)
+        results.append({"row": row_number, "status": "rejected" if reason else "pending", "reason": reason})
+        if payment:
+            parsed.append((row_number,) + payment)
+
+    if connection.in_transaction:
+        connection.commit()
+    cursor = connection.cursor()
+    chunks = 0
+    try:
+        # One write transaction for validation and all inserts, so nothing can change in between
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("DROP TABLE IF EXISTS temp.batch_payment")
+        cursor.execute("CREATE TEMP TABLE batch_payment (line INTEGER PRIMARY KEY, customer_id INTEGER, "
+                       "rental_id INTEGER, amount REAL, staff_id INTEGER)")
+        cursor.execute("CREATE INDEX temp.idx_batch_payment_rental ON batch_payment(rental_id, line)")
+        cursor.executemany("INSERT INTO temp.batch_payment VALUES (?, ?, ?, ?, ?)", parsed)
+
+        # Validate every row with one query
+        validated_time = time.perf_counter()
+        valid = []
+        payments_by_line = {row[0]: row[1:] for row in parsed}
+        for line, *failures in cursor.execute(VALIDATION_QUERY):
+            reasons = [reason for failed, reason in zip(failures, VALIDATION_REASONS) if failed]
+            if reasons:
+                results[line - 1].update(status="rejected", reason="; ".join(reasons))
+            else:
+                customer_id, rental_id, amount, staff_id = payments_by_line[line]
+                valid.append((line, (customer_id, staff_id, rental_id, amount)))
+        validated_time = time.perf_counter() - validated_time
+
+        # Insert the valid rows in chunks and commit once
+        insert_time = time.perf_counter()
+        for start in range(0, len(valid), chunk_size):
+            chunk = valid[start:start + chunk_size]
+            cursor.executemany(QUERIES["record_payment"], [values for _, values in chunk])
+            chunks += 1
+        cursor.execute("DROP TABLE temp.batch_payment")
+        connection.commit()
+        insert_time = time.perf_counter() - insert_time
+    except sqlite3.Error as e:
+        if connection.in_transaction:
+            connection.rollback()
+        for result in results:
+            if result["status"] == "pending":
+                result.update(status="rejected", reason=f"batch rolled back: {e}")
+        valid = []
+        validated_time = insert_time = 0.0
+
+    for line, _ in valid:
+        results[line - 1]["status"] = "posted"
+    if valid:
+        # Cached results that read the payment table are out of date now
+        registry.invalidate(QUERY_WRITES["record_payment"])
+
+    elapsed = time.perf_counter() - start_time
+    summary = {
+        "rows": len(results),
+        "posted": len(valid),
+        "rejected": len(results) - len(valid),
+        "chunks": chunks,
+        "validate_seconds": validated_time,
+        "insert_seconds": insert_time,
+        "total_seconds": elapsed,
+        "rows_per_second": len(results) / elapsed if elapsed > 0 else 0.0,
+    }
+    return results, summary
+
+# Main function to post a CSV file of payments
+def main():
+    parser = argparse.ArgumentParser(description="Post a CSV file of Sakila payments in one transaction.")
+    parser.add_argument("input", help="CSV file of customer_id,rental_id,amount[,staff_id] rows")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help="sakila database file")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per executemany call")
+    parser.add_argument("--rejects", help="file for rejected rows (default: <input>.rejects.csv)")
+    args = parser.parse_args()
+
+    if args.chunk_size < 1:
+        print("Chunk size must be at least 1.")
+        sys.exit(1)
+    reject_path = args.rejects or args.input + ".rejects.csv"
+
+    if not os.path.exists(args.input):
+        print(f"File not found: {args.input}")
+        sys.exit(1)
+
+    # mode=rw opens an existing database only; as_uri() percent-encodes spaces and other special characters
+    try:
+        connection = sqlite3.connect(pathlib.Path(args.db).resolve().as_uri() + "?mode=rw", uri=True,
+                                     cached_statements=STATEMENT_CACHE_SIZE)
+    except sqlite3.Error as e:
+        print("Failed to connect to database:", e)
+        sys.exit(1)
+    create_indexes(connection)
+    # The CSV rows are streamed into post_payments, not read into a list first
+    results, summary = post_payments(connection, read_payments_csv(args.input), args.chunk_size)
+    connection.close()
+
+    print(f"Rows: {summary['rows']}, posted: {summary['posted']} in {summary['chunks']} chunks, "
+          f"rejected: {summary['rejected']}")
+    print(f"Validation: {summary['validate_seconds']:.3f} s, insert and commit: {summary['insert_seconds']:.3f} s, "
+          f"total: {summary['total_seconds']:.3f} s ({summary['rows_per_second']:,.0f} rows/sec)")
+
+    # The rejected rows' fields are read again from the CSV file, in a second pass
+    reasons = {result["row"]: result["reason"] for result in results if result["status"] == "rejected"}
+    if reasons:
+        with open(reject_path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["row", "reason", "customer_id", "rental_id", "amount", "staff_id"])
+            for row_number, row in enumerate(read_payments_csv(args.input), 1):
+                if row_number in reasons:
+                    writer.writerow([row_number, reasons[row_number]] + row)
+        print(f"Rejected rows written to {reject_path}")
+
+# Run the main function
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Program name: sakila_export.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Exports rental or payment history for one, several or all customers to CSV or JSON Lines.
+Rows are streamed from the database with fetchmany (see QueryRegistry.stream) and written as they arrive, so memory
+use stays flat no matter how many rows are exported. The export reports rows/sec, and with --trace-memory the peak
+Python memory used (tracing memory slows the export down, so it is off by default).
+
+    python "Module 5/M05 Programming Assignment 2/sakila_export.py" rentals rentals.csv
+    python "Module 5/M05 Programming Assignment 2/sakila_export.py" payments payments.jsonl --customer 5 --customer 148
+"""
+
+# Import necessary libraries
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+from John_Dostal_salika_assistant import iter_payment_details, iter_rentals_by_customer
+from sakila_queries import FETCH_ARRAYSIZE, STATEMENT_CACHE_SIZE, registry
+
+# Note: Ensure the database file path is correct, as I had to change the path to run it on my machine.
+DEFAULT_DB_NAME = "Module 5/M05 Programming Assignment 2/sakila.db"
+
+# Output columns and row source for each kind of export; customer_id is added as the first column
+EXPORTS = {
+    "rentals": (["rental_id", "rental_date", "title", "return_date", "staff_name"], iter_rentals_by_customer),
+    "payments": (["first_name", "last_name", "title", "amount", "payment_date", "staff_name"], iter_payment_details),
+}
+
+
+# Customer ID Generator Function
+# Yields the requested customer IDs, or every customer ID (streamed) when none are given
+def iter_customer_ids(cursor, customer_ids, arraysize):
+    if customer_ids:
+        yield from customer_ids
+    else:
+        for row in registry.stream(cursor, "customers", (), arraysize):
+            yield row[0]
+
+# Export Row Generator Function
+# Yields (customer_id, row) for every row of the export
+def iter_export_rows(cursor, kind, customer_ids, arraysize):
+    _, row_source = EXPORTS[kind]
+    for customer_id in iter_customer_ids(cursor, customer_ids, arraysize):
+        for row in row_source(cursor, customer_id, arraysize):
+            yield customer_id, row
+
+# CSV Writer Function
+def write_csv(file, columns, rows):
+    writer = csv.writer(file)
+    writer.writerow(["customer_id"] + columns)
+    count = 0
+    for customer_id, row in rows:
+        writer.writerow((customer_id,) + tuple(row))
+        count += 1
+    return count
+
+# JSON Lines Writer Function
+def write_jsonl(file, columns, rows):
+    count = 0
+    for customer_id, row in rows:
+        record = {"customer_id": customer_id}
+        record.update(zip(columns, row))
+        file.write(json.dumps(record) + "\n")
+        count += 1
+    return count
+
+# Export Function
+# Writes the export and returns (rows written, elapsed seconds, peak traced bytes or None)
+def export(cursor, kind, output_path, output_format, customer_ids=None, arraysize=FETCH_ARRAYSIZE,
+           trace_memory=False):
+    columns, _ = EXPORTS[kind]
+    writer = write_csv if output_format == "csv" else write_jsonl
+    if trace_memory:
+        tracemalloc.start()
+    start_time = time.perf_counter()
+    with open(output_path, "w", newline="", encoding="utf-8") as file:
+        count = writer(file, columns, iter_export_rows(cursor, kind, customer_ids, arraysize))
+    elapsed = time.perf_counter() - start_time
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return count, elapsed, peak
+
+# Main function to run an export from the command line
+def main():
+    parser = argparse.ArgumentParser(description="Export Sakila rental or payment history to CSV or JSON Lines.")
+    parser.add_argument("kind", choices=sorted(EXPORTS), help="history to export")
+    parser.add_argument("output", help="output file (.csv or .jsonl)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="output format (default: from the file name)")
+    parser.add_argument("--customer", type=int, action="append", help="customer ID to export (repeatable; default all)")
+    parser.add_argument("--arraysize", type=int, default=FETCH_ARRAYSIZE, help="rows read per fetchmany call")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help="sakila database file")
+    parser.add_argument("--trace-memory", action="store_true", help="report peak Python memory (slower)")
+    args = parser.parse_args()
+
+    if args.arraysize < 1:
+        print("Array size must be at least 1.")
+        sys.exit(1)
+    if not os.path.exists(args.db):
+        print(f"Database file not found: {args.db}")
+        sys.exit(1)
+    output_format = args.format or ("jsonl" if args.output.endswith((".jsonl", ".json")) else "csv")
+
+    connection = sqlite3.connect(args.db, cached_statements=STATEMENT_CACHE_SIZE)
+    count, elapsed, peak = export(connection.cursor(), args.kind, args.output, output_format, args.customer,
+                                  args.arraysize, args.trace_memory)
+    connection.close()
+
+    rate = count / elapsed if elapsed > 0 else 0
+    print(f"Exported {count} {args.kind} rows to {args.output} ({output_format}) in {elapsed:.3f} seconds "
+          f"({rate:,.0f} rows/sec, arraysize {args.arraysize})")
+    if peak is not None:
+        print(f"Peak traced memory: {peak / 1024:.1f} KiB")
+
+# Run the main function
+if __name__ == "__main__":
+    main()
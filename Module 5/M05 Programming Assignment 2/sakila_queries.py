@@ -0,0 +1,363 @@
+"""
+Program name: sakila_queries.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Query registry for the Sakila clerk assistant.
+Every statement the assistant runs is defined once here under a name. Running a statement by name always passes
+the same SQL string to sqlite3, so it is prepared once and then reused from the connection's statement cache
+(sized with STATEMENT_CACHE_SIZE when the connection is opened). The registry also keeps per-query statistics:
+call count, cumulative and maximum latency (execute plus fetch) and rows returned.
+Read queries listed in CACHED_QUERIES are answered from an LRU result cache with a byte limit and a TTL.
+Each cached result remembers the version of every table it read; a registered write bumps the version of the
+tables it writes, and a commit from another connection (seen through PRAGMA data_version) bumps them all,
+so a stale result is never returned.
+Large results can be streamed instead with stream(), which reads FETCH_ARRAYSIZE rows at a time, so memory
+use does not grow with the number of rows.
+"""
+
+# Import necessary libraries
+import sys
+import time
+from collections import OrderedDict
+
+# Number of prepared statements each connection keeps; must be at least the number of registered queries
+# plus the keyset pager's queries, or statements are re-prepared
+STATEMENT_CACHE_SIZE = 32
+
+# Result cache limits
+RESULT_CACHE_BYTES = 4 * 1024 * 1024
+RESULT_CACHE_TTL = 300          # seconds
+
+# Rows read per fetchmany call when streaming results
+FETCH_ARRAYSIZE = 500
+
+# Named statements used by the assistant
+QUERIES = {
+    "customers": """
+    SELECT customer_id, first_name, last_name FROM customer ORDER BY customer_id ASC
+    """,
+    "customer_exists": """
+    SELECT 1 FROM customer WHERE customer_id = ?
+    """,
+    "customer_details": """
+    SELECT c.first_name, c.last_name, a.address, a.phone, ci.city, co.country, c.email, c.active, c.last_update
+    FROM customer AS c
+    JOIN address AS a ON c.address_id = a.address_id
+    JOIN city AS ci ON a.city_id = ci.city_id
+    JOIN country AS co ON ci.country_id = co.country_id
+    WHERE c.customer_id = ?
+    """,
+    "rentals_by_customer": """
+    SELECT r.rental_id, r.rental_date, f.title, r.return_date, s.first_name || ' ' || s.last_name AS staff_name
+    FROM rental AS r
+    JOIN inventory AS i ON r.inventory_id = i.inventory_id
+    JOIN film AS f ON i.film_id = f.film_id
+    JOIN staff AS s ON r.staff_id = s.staff_id
+    WHERE r.customer_id = ?
+    """,
+    "films_by_store": """
+    SELECT f.title, l.name AS language, c.name AS category, f.rating AS rating, a.in_stock, a.on_rent
+    FROM store_film_availability AS a
+    JOIN film AS f ON a.film_id = f.film_id
+    JOIN language AS l ON f.language_id = l.language_id
+    JOIN film_category AS fc ON f.film_id = fc.film_id
+    JOIN category AS c ON fc.category_id = c.category_id
+    WHERE a.store_id = ? AND a.in_stock > 0
+    """,
+    "rental_status": """
+    SELECT r.customer_id, EXISTS (SELECT 1 FROM payment AS p WHERE p.rental_id = r.rental_id) AS paid
+    FROM rental AS r
+    WHERE r.rental_id = ?
+    """,
+    "film_search": """
+    SELECT f.film_id, f.title, f.release_year, f.rating, snippet(film_search, 1, '[', ']', '...', 12) AS excerpt
+    FROM film_search
+    JOIN film AS f ON f.film_id = film_search.rowid
+    WHERE film_search MATCH ?
+    ORDER BY bm25(film_search, 10.0, 1.0), f.film_id
+    LIMIT ? OFFSET ?
+    """,
+    "film_search_like": """
+    SELECT f.film_id, f.title, f.release_year, f.rating, f.description AS excerpt
+    FROM film AS f
+    WHERE f.title LIKE ? OR f.description LIKE ?
+    ORDER BY f.film_id
+    LIMIT ? OFFSET ?
+    """,
+    "record_payment": """
+    INSERT INTO payment (customer_id, staff_id, rental_id, amount, payment_date) VALUES (?, ?, ?, ?, datetime('now'));
+    """,
+    "payment_details": """
+    SELECT c.first_name, c.last_name, f.title, p.amount, p.payment_date, s.first_name || ' ' || s.last_name AS staff_name
+    FROM customer AS c
+    JOIN payment AS p ON c.customer_id = p.customer_id
+    JOIN rental AS r ON p.rental_id = r.rental_id
+    JOIN inventory AS i ON r.inventory_id = i.inventory_id
+    JOIN film AS f ON i.film_id = f.film_id
+    JOIN staff AS s ON p.staff_id = s.staff_id
+    WHERE c.customer_id = ?
+    """,
+}
+
+
+# Tables each statement reads, and the tables each write statement changes
+QUERY_TABLES = {
+    "customers": ["customer"],
+    "customer_exists": ["customer"],
+    "customer_details": ["customer", "address", "city", "country"],
+    "rentals_by_customer": ["rental", "inventory", "film", "staff"],
+    "films_by_store": ["store_film_availability", "film", "language", "film_category", "category"],
+    "payment_details": ["customer", "payment", "rental", "inventory", "film", "staff"],
+    "rental_status": ["rental", "payment"],
+    "film_search": ["film_search", "film"],
+    "film_search_like": ["film"],
+}
+QUERY_WRITES = {
+    "record_payment": ["payment"],
+}
+
+# Read queries whose results are cached. rentals_by_customer and payment_details are streamed with
+# registry.stream(), which does not use the result cache, so they are not listed here.
+CACHED_QUERIES = {"customer_details", "films_by_store"}
+
+# Indexes the registered queries rely on. rental_status looks up payments by rental_id, which
+# would otherwise scan the whole payment table.
+INDEX_STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS idx_payment_rental_id ON payment(rental_id);",
+]
+
+
+# Function to create the indexes the registered queries rely on
+def create_indexes(connection):
+    for statement in INDEX_STATEMENTS:
+        connection.execute(statement)
+    connection.commit()
+
+# Result Size Helper Function
+# Approximate memory used by a result: the list, each row tuple and each value
+def result_size(result):
+    if result is None:
+        return sys.getsizeof(None)
+    rows = result if isinstance(result, list) else [result]
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+    return size
+
+# Result Cache Class
+# LRU cache of query results limited by total size in bytes, with a time to live for each entry.
+# Entries are stored with the table versions they were read at and are dropped if those have changed.
+class ResultCache:
+    def __init__(self, max_bytes=RESULT_CACHE_BYTES, ttl=RESULT_CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.bytes_used = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0, "expirations": 0}
+
+    # Remove one entry
+    def _remove(self, key):
+        _, size, _, _ = self.entries.pop(key)
+        self.bytes_used -= size
+
+    # Return the cached result, or None on a miss. `versions` are the current versions of the tables read.
+    def get(self, key, versions):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        result, _, expires, entry_versions = entry
+        if entry_versions != versions:
+            self.stats["invalidations"] += 1
+            self.stats["misses"] += 1
+            self._remove(key)
+            return None
+        if time.monotonic() >= expires:
+            self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            self._remove(key)
+            return None
+        self.entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return result
+
+    # Store a result, evicting the least recently used entries until it fits
+    def put(self, key, result, versions):
+        size = result_size(result)
+        if size > self.max_bytes:
+            return
+        if key in self.entries:
+            self._remove(key)
+        while self.bytes_used + size > self.max_bytes:
+            self._remove(next(iter(self.entries)))
+            self.stats["evictions"] += 1
+        self.entries[key] = (result, size, time.monotonic() + self.ttl, versions)
+        self.bytes_used += size
+
+    # Drop every entry
+    def clear(self):
+        self.entries.clear()
+        self.bytes_used = 0
+
+    # Fraction of lookups answered from the cache
+    def hit_rate(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    # Return the cache report as one line
+    def report(self):
+        return (f"Result cache: {self.stats['hits']} hits, {self.stats['misses']} misses "
+                f"({self.hit_rate():.1%} hit rate), {len(self.entries)} entries, "
+                f"{self.bytes_used / 1024:.1f} / {self.max_bytes / 1024:.0f} KiB, "
+                f"{self.stats['evictions']} evictions, {self.stats['invalidations']} invalidations, "
+                f"{self.stats['expirations']} expirations")
+
+# Query Registry Class
+# Runs named statements and records how often each one runs, how long it takes and how many rows it returns.
+class QueryRegistry:
+    def __init__(self, queries, cache=None, cached_queries=()):
+        self.queries = dict(queries)
+        self.stats = {name: {"calls": 0, "total_ns": 0, "max_ns": 0, "rows": 0, "errors": 0, "cache_hits": 0}
+                      for name in self.queries}
+        self.cache = cache
+        self.cached_queries = set(cached_queries)
+        self.table_versions = {}
+        self.data_versions = {}
+
+    # Add or replace a named statement
+    def register(self, name, sql):
+        self.queries[name] = sql
+        self.stats.setdefault(name, {"calls": 0, "total_ns": 0, "max_ns": 0, "rows": 0, "errors": 0, "cache_hits": 0})
+
+    # Bump the version of each table so cached results that read it are no longer used
+    def invalidate(self, tables):
+        for table in tables:
+            self.table_versions[table] = self.table_versions.get(table, 0) + 1
+
+    # Current versions of the tables a query reads
+    # PRAGMA data_version changes when another connection commits; since it cannot say which tables
+    # changed, every table is treated as changed.
+    def versions(self, cursor, name):
+        connection = cursor.connection
+        data_version = connection.execute("PRAGMA data_version;").fetchone()[0]
+        if self.data_versions.get(id(connection), data_version) != data_version:
+            self.invalidate(set(self.table_versions) | {table for tables in QUERY_TABLES.values() for table in tables})
+        self.data_versions[id(connection)] = data_version
+        return tuple(self.table_versions.get(table, 0) for table in QUERY_TABLES.get(name, []))
+
+    # Run a named statement. `fetch` is "all", "one" or None (for statements that return no rows).
+    # Raises KeyError for an unknown name; database errors are counted and raised to the caller.
+    def run(self, cursor, name, params=(), fetch="all"):
+        sql = self.queries[name]
+        stats = self.stats[name]
+        start_time = time.perf_counter_ns()
+
+        # Answer cached read queries from the result cache when the tables have not changed
+        cache_key = None
+        if self.cache is not None and fetch is not None and name in self.cached_queries:
+            cache_key = (name, tuple(params), fetch)
+            versions = self.versions(cursor, name)
+            result = self.cache.get(cache_key, versions)
+            if result is not None:
+                duration = time.perf_counter_ns() - start_time
+                stats["calls"] += 1
+                stats["cache_hits"] += 1
+                stats["total_ns"] += duration
+                stats["max_ns"] = max(stats["max_ns"], duration)
+                stats["rows"] += len(result) if fetch == "all" else 1
+                return list(result) if fetch == "all" else result
+
+        try:
+            cursor.execute(sql, params)
+            if fetch == "all":
+                result = cursor.fetchall()
+                rows = len(result)
+            elif fetch == "one":
+                result = cursor.fetchone()
+                rows = 0 if result is None else 1
+            else:
+                result = None
+                rows = max(cursor.rowcount, 0)
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            duration = time.perf_counter_ns() - start_time
+            stats["calls"] += 1
+            stats["total_ns"] += duration
+            stats["max_ns"] = max(stats["max_ns"], duration)
+        stats["rows"] += rows
+        if name in QUERY_WRITES:
+            self.invalidate(QUERY_WRITES[name])
+        if cache_key is not None and result is not None:
+            self.cache.put(cache_key, list(result) if fetch == "all" else result, versions)
+        return result
+
+    # Run a named statement and yield its rows, reading `arraysize` rows at a time with fetchmany.
+    # A separate cursor is used so other queries can run while the rows are being consumed. Streamed results
+    # are never cached, and the latency recorded excludes the time the caller spends on each row.
+    def stream(self, cursor, name, params=(), arraysize=FETCH_ARRAYSIZE):
+        sql = self.queries[name]
+        stats = self.stats[name]
+        stream_cursor = cursor.connection.cursor()
+        stream_cursor.arraysize = arraysize
+        duration = 0
+        rows = 0
+        start_time = time.perf_counter_ns()
+        try:
+            stream_cursor.execute(sql, params)
+            while True:
+                batch = stream_cursor.fetchmany()
+                duration += time.perf_counter_ns() - start_time
+                start_time = None
+                if not batch:
+                    break
+                rows += len(batch)
+                yield from batch
+                start_time = time.perf_counter_ns()
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            if start_time is not None:
+                duration += time.perf_counter_ns() - start_time
+            stream_cursor.close()
+            stats["calls"] += 1
+            stats["total_ns"] += duration
+            stats["max_ns"] = max(stats["max_ns"], duration)
+            stats["rows"] += rows
+
+    # Run a named statement and return every row
+    def fetch_all(self, cursor, name, params=()):
+        return self.run(cursor, name, params, "all")
+
+    # Run a named statement and return the first row (or None)
+    def fetch_one(self, cursor, name, params=()):
+        return self.run(cursor, name, params, "one")
+
+    # Run a named statement that returns no rows (INSERT, UPDATE, DELETE)
+    def execute(self, cursor, name, params=()):
+        self.run(cursor, name, params, None)
+
+    # Clear the statistics
+    def reset(self):
+        for stats in self.stats.values():
+            stats.update(calls=0, total_ns=0, max_ns=0, rows=0, errors=0, cache_hits=0)
+
+    # Return the statistics report as a list of lines, slowest total time first
+    def report(self):
+        lines = [f"{'Query':<20} {'Calls':>6} {'Hits':>6} {'Total ms':>10} {'Avg ms':>9} {'Max ms':>9} "
+                 f"{'Rows':>8} {'Errors':>6}"]
+        for name, stats in sorted(self.stats.items(), key=lambda item: item[1]["total_ns"], reverse=True):
+            calls = stats["calls"]
+            average = stats["total_ns"] / calls / 1_000_000 if calls else 0.0
+            lines.append(f"{name:<20} {calls:>6} {stats['cache_hits']:>6} {stats['total_ns'] / 1_000_000:>10.3f} "
+                         f"{average:>9.3f} {stats['max_ns'] / 1_000_000:>9.3f} {stats['rows']:>8} {stats['errors']:>6}")
+        lines.append(f"Statement cache size: {STATEMENT_CACHE_SIZE} prepared statements per connection "
+                     f"({len(self.queries)} registered queries)")
+        if self.cache is not None:
+            lines.append(self.cache.report())
+        return lines
+
+# Registry shared by the assistant
+registry = QueryRegistry(QUERIES, ResultCache(), CACHED_QUERIES)
@@ -0,0 +1,162 @@
+"""
+Program name: sakila_search.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Full-text film search for the Sakila clerk assistant.
+film_search is an FTS5 index over film titles and descriptions, keyed by film_id (its rowid). It is seeded from
+the film_text table that ships with sakila and kept in sync with film by triggers. Results are ranked with bm25,
+with title matches weighted ten times higher than description matches.
+Run this file directly to benchmark the FTS5 search against LIKE '%term%' scans of the film table, for the first
+page of results (what the menu shows) and for every match. --inflate adds copies of the films to show how each
+approach scales: LIKE reads every film, FTS5 only reads the films that match.
+
+    python "Module 5/M05 Programming Assignment 2/sakila_search.py" --db "Module 5/M05 Programming Assignment 2/sakila.db"
+    python "Module 5/M05 Programming Assignment 2/sakila_search.py" --inflate 50
+"""
+
+# Import necessary libraries
+import argparse
+import os
+import re
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+from sakila_queries import STATEMENT_CACHE_SIZE, registry
+
+# Note: Ensure the database file path is correct, as I had to change the path to run it on my machine.
+DEFAULT_DB_NAME = "Module 5/M05 Programming Assignment 2/sakila.db"
+
+# Statements that create and seed the search index and the triggers that keep it in sync with film
+SEARCH_SCHEMA = [
+    "CREATE VIRTUAL TABLE film_search USING fts5(title, description, tokenize = 'porter unicode61');",
+    "INSERT INTO film_search (rowid, title, description) SELECT film_id, title, description FROM film_text;",
+    """CREATE TRIGGER film_search_insert AFTER INSERT ON film BEGIN
+        INSERT INTO film_search (rowid, title, description) VALUES (new.film_id, new.title, new.description);
+    END;""",
+    """CREATE TRIGGER film_search_update AFTER UPDATE OF film_id, title, description ON film BEGIN
+        DELETE FROM film_search WHERE rowid = old.film_id;
+        INSERT INTO film_search (rowid, title, description) VALUES (new.film_id, new.title, new.description);
+    END;""",
+    """CREATE TRIGGER film_search_delete AFTER DELETE ON film BEGIN
+        DELETE FROM film_search WHERE rowid = old.film_id;
+    END;""",
+]
+
+# Search terms used by the benchmark; the last one is the title query_2 in explain_query.py looks up
+BENCHMARK_TERMS = ["drama", "astronaut", "shark", "boat", "epic", "montezuma command"]
+BENCHMARK_RUNS = 50
+BENCHMARK_PAGE_SIZE = 10
+
+
+# Function to create the search index if it does not exist yet
+# Returns True when film search is available, False if this SQLite build has no FTS5.
+def create_film_search(connection):
+    exists = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'film_search'").fetchone()
+    if exists:
+        return True
+    if connection.in_transaction:
+        connection.commit()
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        for statement in SEARCH_SCHEMA:
+            connection.execute(statement)
+        connection.commit()
+    except sqlite3.OperationalError as e:
+        connection.rollback()
+        print("Film search is not available:", e)
+        return False
+    return True
+
+# Function to turn what the clerk typed into an FTS5 query
+# Every word must match, and each word also matches as a prefix ("astro" finds "astronaut").
+# Quoting each word means FTS5 operators and punctuation in the input can never cause a syntax error.
+def fts_query(text):
+    words = re.findall(r"\w+", text)
+    return " ".join(f'"{word}"*' for word in words)
+
+# Function to search films, best match first
+# Returns up to `limit` rows of (film_id, title, release_year, rating, excerpt) starting at `offset`.
+def search_films(cursor, text, limit, offset=0):
+    query = fts_query(text)
+    if not query:
+        return []
+    return registry.fetch_all(cursor, "film_search", (query, limit, offset))
+
+# Function to search films with LIKE '%term%' (used as the benchmark baseline)
+def search_films_like(cursor, text, limit, offset=0):
+    pattern = f"%{text}%"
+    return registry.fetch_all(cursor, "film_search_like", (pattern, pattern, limit, offset))
+
+# Function to add `copies` copies of every film, so the benchmark can run on a larger catalog
+# The inserts go through the film_search triggers, so the search index grows with the table.
+def inflate_films(connection, copies):
+    columns = ("description, release_year, language_id, original_language_id, rental_duration, rental_rate, "
+               "length, replacement_cost, rating, special_features")
+    original_count = connection.execute("SELECT MAX(film_id) FROM film").fetchone()[0]
+    for copy in range(1, copies + 1):
+        connection.execute(f"INSERT INTO film (title, {columns}) SELECT title || ' ' || ?, {columns} "
+                           f"FROM film WHERE film_id <= ?", (copy, original_count))
+    connection.commit()
+
+# Timing Helper Function
+# Returns the median ms of a search function returning up to `limit` rows
+def time_search(search, cursor, term, runs, limit):
+    timings = []
+    search(cursor, term, limit)
+    for _ in range(runs):
+        start_time = time.perf_counter_ns()
+        search(cursor, term, limit)
+        timings.append((time.perf_counter_ns() - start_time) / 1_000_000)
+    return statistics.median(timings)
+
+# Benchmark function comparing FTS5 search with LIKE scans
+# Runs on a temporary copy so the search index is not added to the original database
+def run_benchmark(db_name, runs, inflate=0):
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_copy = os.path.join(work_dir, "search.db")
+        shutil.copyfile(db_name, db_copy)
+        connection = sqlite3.connect(db_copy, cached_statements=STATEMENT_CACHE_SIZE)
+        if not create_film_search(connection):
+            connection.close()
+            return results
+        if inflate:
+            inflate_films(connection, inflate)
+        cursor = connection.cursor()
+        everything = connection.execute("SELECT COUNT(*) FROM film").fetchone()[0]
+        for term in BENCHMARK_TERMS:
+            for search in [search_films, search_films_like]:
+                matches = len(search(cursor, term, everything))
+                page_ms = time_search(search, cursor, term, runs, BENCHMARK_PAGE_SIZE)
+                all_ms = time_search(search, cursor, term, runs, everything)
+                results.append((term, "FTS5" if search is search_films else "LIKE", matches, page_ms, all_ms))
+        connection.close()
+    return results
+
+# Main function to run the benchmark
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FTS5 film search against LIKE scans.")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help="sakila database file (a temporary copy is used)")
+    parser.add_argument("--runs", type=int, default=BENCHMARK_RUNS, help="timed runs per search")
+    parser.add_argument("--inflate", type=int, default=0, help="add this many copies of every film first")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Database file not found: {args.db}")
+        sys.exit(1)
+
+    print(f"{'Term':<20} {'Method':<6} {'Matches':>8} {'Page ms':>9} {'All ms':>9}")
+    for term, method, matches, page_ms, all_ms in run_benchmark(args.db, max(1, args.runs), max(0, args.inflate)):
+        print(f"{term:<20} {method:<6} {matches:>8} {page_ms:>9.3f} {all_ms:>9.3f}")
+    print(f"\nPage ms is the first {BENCHMARK_PAGE_SIZE} results, All ms is every match.")
+    print("\nFTS5 matches whole words and word prefixes (with stemming); LIKE matches any substring,")
+    print("so the row counts can differ.")
+
+# Run the main function
+if __name__ == "__main__":
+    main()
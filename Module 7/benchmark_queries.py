@@ -0,0 +1,271 @@
+"""
+Program name: benchmark_queries.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Reproducible benchmark for the queries in explain_query.py.
+Unlike view_query(), which only times EXPLAIN QUERY PLAN, this runs each query to completion and fetches every row.
+Each query is run with and without the indexes from create_indexes(), both cold (a new connection for every
+run, so SQLite's page cache is empty) and warm (one connection, after a warm-up run). It reports p50/p95/p99
+latency, rows returned and SQLite VM steps, and writes the results as JSON so runs can be compared.
+The query plan of every run is saved with it, so each latency change can be attributed to a plan change:
+between the two variants, and between this run and a compared run.
+The benchmark works on a temporary copy of the database, so indexes are never added to or dropped from the original.
+
+    python "Module 7/benchmark_queries.py" --db "Module 7/sakila-1.db" --output results.json
+    python "Module 7/benchmark_queries.py" --db "Module 7/sakila-1.db" --compare results.json
+"""
+
+# Import necessary libraries
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+from explain_query import QUERY_FUNCTIONS, build_plan, create_indexes, diff_plans, drop_indexes
+
+# Note: Ensure the database file path is correct, as I had to change the path to run it on my machine.
+DEFAULT_DB_NAME = "Module 7/sakila-1.db"
+
+# Benchmark settings
+DEFAULT_WARM_ITERATIONS = 50
+DEFAULT_COLD_ITERATIONS = 10
+VARIANTS = ["no_indexes", "indexes"]
+
+# A p50 this much slower than the compared run is reported as a regression
+REGRESSION_THRESHOLD = 1.10
+
+
+# Percentile Helper Function
+# Linear interpolation between the closest ranks, the same method as numpy's default
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+# Summary Helper Function
+# Turns a list of durations in nanoseconds into the latency summary in milliseconds
+def summarize(durations_ns):
+    values = sorted(duration / 1_000_000 for duration in durations_ns)
+    return {
+        "runs": len(values),
+        "min_ms": round(values[0], 4),
+        "p50_ms": round(percentile(values, 0.50), 4),
+        "p95_ms": round(percentile(values, 0.95), 4),
+        "p99_ms": round(percentile(values, 0.99), 4),
+        "max_ms": round(values[-1], 4),
+    }
+
+# Run Query Helper Function
+# Executes the query, fetches every row and returns (duration in ns, row count)
+def run_query(connection, sql_query):
+    start_time = time.perf_counter_ns()
+    rows = connection.execute(sql_query).fetchall()
+    return time.perf_counter_ns() - start_time, len(rows)
+
+# VM Step Counter Function
+# The progress handler is called after every SQLite virtual machine instruction, so counting the calls gives the
+# number of VM steps. This slows the query down, so it is done in a separate, untimed run.
+def count_vm_steps(connection, sql_query):
+    steps = [0]
+
+    def progress():
+        steps[0] += 1
+        return 0
+
+    connection.set_progress_handler(progress, 1)
+    try:
+        connection.execute(sql_query).fetchall()
+    finally:
+        connection.set_progress_handler(None, 1)
+    return steps[0]
+
+# Cold Run Function
+# Opens a new connection for each run so nothing is left in SQLite's page cache
+def run_cold(db_name, sql_query, iterations):
+    durations = []
+    rows = 0
+    for _ in range(iterations):
+        connection = sqlite3.connect(db_name)
+        duration, rows = run_query(connection, sql_query)
+        connection.close()
+        durations.append(duration)
+    return durations, rows
+
+# Warm Run Function
+# Reuses one connection and discards a warm-up run so the pages and the prepared statement are cached
+def run_warm(connection, sql_query, iterations):
+    run_query(connection, sql_query)
+    durations = []
+    rows = 0
+    for _ in range(iterations):
+        duration, rows = run_query(connection, sql_query)
+        durations.append(duration)
+    return durations, rows
+
+# Plan Rows Helper Function
+# Returns the EXPLAIN QUERY PLAN rows as lists so they can be saved as JSON and rebuilt with build_plan()
+def plan_rows(connection, sql_query):
+    return [list(row) for row in connection.execute("EXPLAIN QUERY PLAN " + sql_query)]
+
+# Benchmark Function
+# Returns the full result document
+def run_benchmark(db_name, warm_iterations, cold_iterations):
+    results = []
+    plans = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_copy = os.path.join(work_dir, "benchmark.db")
+        shutil.copyfile(db_name, db_copy)
+
+        for variant in VARIANTS:
+            # Set up the indexes for this variant on the copy
+            connection = sqlite3.connect(db_copy)
+            if variant == "indexes":
+                create_indexes(connection.cursor())
+            else:
+                drop_indexes(connection.cursor())
+            connection.close()
+
+            connection = sqlite3.connect(db_copy)
+            for query_function in QUERY_FUNCTIONS:
+                sql_query = query_function(None)
+                vm_steps = count_vm_steps(connection, sql_query)
+                plans[(query_function.__name__, variant)] = plan_rows(connection, sql_query)
+                for mode in ["cold", "warm"]:
+                    if mode == "cold":
+                        durations, rows = run_cold(db_copy, sql_query, cold_iterations)
+                    else:
+                        durations, rows = run_warm(connection, sql_query, warm_iterations)
+                    result = {"query": query_function.__name__, "variant": variant, "mode": mode,
+                              "rows": rows, "vm_steps": vm_steps,
+                              "plan": plans[(query_function.__name__, variant)]}
+                    result.update(summarize(durations))
+                    results.append(result)
+            connection.close()
+
+    # How each query's plan changes when the indexes are added
+    plan_diffs = {}
+    for query_function in QUERY_FUNCTIONS:
+        name = query_function.__name__
+        plan_diffs[name] = diff_plans(build_plan(plans[(name, VARIANTS[0])]), build_plan(plans[(name, VARIANTS[1])]))
+
+    return {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "database": os.path.abspath(db_name),
+            "sqlite_version": sqlite3.sqlite_version,
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "warm_iterations": warm_iterations,
+            "cold_iterations": cold_iterations,
+        },
+        "results": results,
+        "plan_diffs": plan_diffs,
+    }
+
+# Result Key Helper Function
+def result_key(result):
+    return (result["query"], result["variant"], result["mode"])
+
+# Plan Change Helper Function
+# Compares the saved plans of two results; returns the diff_plans() result, or None if either has no plan
+def plan_change(result, other):
+    if "plan" not in result or "plan" not in other:
+        return None
+    return diff_plans(build_plan(other["plan"]), build_plan(result["plan"]))
+
+# Print Changes Helper Function
+def print_changes(diff, indent="    "):
+    if diff is None:
+        print(f"{indent}(no saved plan to compare)")
+    elif not diff["changed"]:
+        print(f"{indent}plan unchanged")
+    else:
+        for change in diff["changes"] or ["plan tree changed"]:
+            print(f"{indent}{change}")
+
+# Print Results Function
+# Prints a table of the results; if a previous run is given, also prints the p50 change against it.
+# Every latency change is listed with the plan change that goes with it.
+def print_results(document, baseline=None):
+    previous = {}
+    if baseline is not None:
+        previous = {result_key(result): result for result in baseline["results"]}
+
+    print(f"{'Query':<9} {'Variant':<11} {'Mode':<5} {'Rows':>6} {'VM steps':>10} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}" + (f" {'vs base':>9} {'Plan':>9}" if previous else ""))
+    regressions = []
+    for result in document["results"]:
+        line = (f"{result['query']:<9} {result['variant']:<11} {result['mode']:<5} {result['rows']:>6} "
+                f"{result['vm_steps']:>10} {result['p50_ms']:>9.3f} {result['p95_ms']:>9.3f} {result['p99_ms']:>9.3f}")
+        old = previous.get(result_key(result))
+        if old is not None and old["p50_ms"]:
+            ratio = result["p50_ms"] / old["p50_ms"]
+            diff = plan_change(result, old)
+            line += f" {ratio:>8.2f}x {'?' if diff is None else 'changed' if diff['changed'] else 'same':>9}"
+            if ratio > REGRESSION_THRESHOLD:
+                regressions.append((result_key(result), ratio, diff))
+        print(line)
+
+    # Latency change from adding the indexes, next to the plan change that caused it
+    current = {result_key(result): result for result in document["results"]}
+    print(f"\nEffect of the indexes ({VARIANTS[0]} -> {VARIANTS[1]}, warm p50):")
+    for query, diff in document.get("plan_diffs", {}).items():
+        before = current.get((query, VARIANTS[0], "warm"))
+        after = current.get((query, VARIANTS[1], "warm"))
+        if before is None or after is None:
+            continue
+        print(f"  {query}: {before['p50_ms']:.3f} ms -> {after['p50_ms']:.3f} ms")
+        print_changes(diff)
+
+    if previous:
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {REGRESSION_THRESHOLD:.2f}x:")
+            for key, ratio, diff in regressions:
+                print(f"  {' / '.join(key)}: {ratio:.2f}x")
+                print_changes(diff)
+        else:
+            print("\nNo regressions against the compared run.")
+
+# Main function to run the benchmark
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the explain_query.py queries.")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help="sakila database file")
+    parser.add_argument("--warm", type=int, default=DEFAULT_WARM_ITERATIONS, help="warm runs per query")
+    parser.add_argument("--cold", type=int, default=DEFAULT_COLD_ITERATIONS, help="cold runs per query")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file from an earlier run to compare against")
+    args = parser.parse_args()
+
+    # sqlite3.connect would quietly create an empty database, so check the file first
+    if not os.path.exists(args.db):
+        print(f"Database file not found: {args.db}")
+        sys.exit(1)
+    if args.warm < 1 or args.cold < 1:
+        print("Iteration counts must be at least 1.")
+        sys.exit(1)
+
+    document = run_benchmark(args.db, args.warm, args.cold)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as file:
+            baseline = json.load(file)
+    print_results(document, baseline)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(document, file, indent=2)
+        print(f"\nResults written to {args.output}")
+
+# Run the main function
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,25 @@
 """
 Program name: explain_query.py
 Author: John Dostal
-Date last updated: 10/11/2025
+Date last updated: 10/18/2026
 Purpose: Program to demonstrate the use of EXPLAIN QUERY PLAN in SQLite.
+Plans are shown as a tree built from the parent column of each plan row. Run with --diff to see how
+each plan changes when the indexes are added.
 """
 
 # Import the sqlite3 module
+import os
+import re
+import shutil
 import sqlite3
+import sys
+import tempfile
 import time
 
+# The shared SQL instrumentation (statement timings, slow-query log) lives in the Shared folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Shared"))
+from sql_instrumentation import connect, statement_stats
+
 
 # functions to create the SQL queries to be explained/run
 def query_1(sql_query):
@@ -61,61 +72,203 @@ def query_5(sql_query):
     """)
     return sql_query
 
-def create_indexes(cursor):
+# Indexes used to optimize the queries above
+INDEX_STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS idx_film_language_id ON film(language_id);",
+    "CREATE INDEX IF NOT EXISTS idx_language_language_id ON language(language_id);",
+    "CREATE INDEX IF NOT EXISTS idx_film_title ON film(title);",
+    "CREATE INDEX IF NOT EXISTS idx_inventory_film_id ON inventory(film_id);",
+    "CREATE INDEX IF NOT EXISTS idx_rental_inventory_id ON rental(inventory_id);",
+    "CREATE INDEX IF NOT EXISTS idx_payment_customer_id ON payment(customer_id);",
+    "CREATE INDEX IF NOT EXISTS idx_film_rental_rate ON film(rental_rate);",
+    "CREATE INDEX IF NOT EXISTS idx_film_actor_film_id ON film_actor(film_id);",
+    "CREATE INDEX IF NOT EXISTS idx_film_actor_actor_id ON film_actor(actor_id);",
+    "CREATE INDEX IF NOT EXISTS idx_rental_customer_id ON rental(customer_id);",
+    "CREATE INDEX IF NOT EXISTS idx_rental_return_date ON rental(return_date);",
+    "CREATE INDEX IF NOT EXISTS idx_address_address_id ON address(address_id);",
+    "CREATE INDEX IF NOT EXISTS idx_city_city_id ON city(city_id);",
+    "CREATE INDEX IF NOT EXISTS idx_country_country_id ON country(country_id);",
+]
 
-    # Connect to the database
-    conn = connect_to_database()
-    if conn is None:
-        return
+# Query functions in the order they are explained
+QUERY_FUNCTIONS = [query_1, query_2, query_3, query_4, query_5]
 
-    cursor = conn.cursor()
+# Function to get the name of every index in INDEX_STATEMENTS
+def index_names():
+    return [statement.split()[5] for statement in INDEX_STATEMENTS]
+
+def create_indexes(cursor):
+
+    # Connect to the database if no cursor was passed in
+    conn = None
+    if cursor is None:
+        conn = connect_to_database()
+        if conn is None:
+            return
+        cursor = conn.cursor()
 
     # Create indexes to optimize query performance
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_film_language_id ON film(language_id);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_language_language_id ON language(language_id);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_film_title ON film(title);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_inventory_film_id ON inventory(film_id);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_rental_inventory_id ON rental(inventory_id);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_payment_customer_id ON payment(customer_id);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_film_rental_rate ON film(rental_rate);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_film_actor_film_id ON film_actor(film_id);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_film_actor_actor_id ON film_actor(actor_id);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_rental_customer_id ON rental(customer_id);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_rental_return_date ON rental(return_date);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_address_address_id ON address(address_id);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_city_city_id ON city(city_id);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_country_country_id ON country(country_id);")
-
-    # Commit the changes and close the connection
-    conn.commit()
-    conn.close()
+    for statement in INDEX_STATEMENTS:
+        cursor.execute(statement)
+
+    # Commit the changes and close the connection if it was opened here
+    cursor.connection.commit()
+    if conn is not None:
+        conn.close()
 
     # Notify the user that indexes have been created
     print("Indexes created successfully.")
 
+# Function to drop the indexes created by create_indexes
+def drop_indexes(cursor):
+    for name in index_names():
+        cursor.execute(f"DROP INDEX IF EXISTS {name};")
+    cursor.connection.commit()
+
 # function to connect to the SQLite database
 def connect_to_database(db_name = "Module 7/sakila-1.db"):
 
     # Attempt to connect to the SQLite database
     # If connection fails, print an error message and exit the program
     try:
-        return sqlite3.connect(db_name)
+        return connect(db_name)
     except sqlite3.Error as e:
             print("Failed to connect to database:", e)
             print("Exiting program. \n")
             return None
 
+# Query plan node
+# One row of EXPLAIN QUERY PLAN output. Rows are (id, parent, notused, detail); a parent of 0 means a top level row.
+class PlanNode:
+    def __init__(self, node_id, parent_id, detail):
+        self.node_id = node_id
+        self.parent_id = parent_id
+        self.detail = detail
+        self.children = []
+        self.kind, self.table, self.index = classify_detail(detail)
+
+# Function to classify a plan row
+# Returns (kind, table or alias, index name). The kinds are:
+#   scan            - full table scan
+#   index scan      - every entry of an index is read, then the table row
+#   covering scan   - every entry of an index is read, the table is never touched
+#   rowid search    - lookup by INTEGER PRIMARY KEY
+#   index search    - lookup through an index, then the table row
+#   covering search - lookup through an index that holds every column needed
+#   temp b-tree     - a temporary b-tree is built to sort or to remove duplicates
+#   other           - subqueries, compound queries and the like
+def classify_detail(detail):
+    match = re.match(r"(SCAN|SEARCH) (\S+)", detail)
+    if match is None or detail.startswith("SCAN CONSTANT ROW"):
+        if "TEMP B-TREE" in detail:
+            return "temp b-tree", None, None
+        return "other", None, None
+
+    operation, table = match.groups()
+    index_match = re.search(r"USING (COVERING )?INDEX (\S+)", detail)
+    if operation == "SCAN":
+        if index_match is None:
+            return "scan", table, None
+        kind = "covering scan" if index_match.group(1) else "index scan"
+        return kind, table, index_match.group(2)
+    if index_match is None:
+        return "rowid search", table, None
+    kind = "covering search" if index_match.group(1) else "index search"
+    return kind, table, index_match.group(2)
+
+# Function to build the plan tree from EXPLAIN QUERY PLAN rows
+# Returns the list of top level nodes; each node's children follow the parent column, not the row order.
+def build_plan(plan_rows):
+    nodes = {}
+    roots = []
+    for node_id, parent_id, _, detail in plan_rows:
+        node = PlanNode(node_id, parent_id, detail)
+        nodes[node_id] = node
+        parent = nodes.get(parent_id)
+        if parent is None:
+            roots.append(node)
+        else:
+            parent.children.append(node)
+    return roots
+
+# Function to get the plan tree of a query
+def get_plan(cursor, sql_query):
+    cursor.execute("EXPLAIN QUERY PLAN " + str(sql_query))
+    return build_plan(cursor.fetchall())
+
+# Function to walk the plan tree in display order, yielding (depth, node)
+def walk_plan(nodes, depth=0):
+    for node in nodes:
+        yield depth, node
+        yield from walk_plan(node.children, depth + 1)
+
+# Function to render the plan tree as text lines, in the same layout as the sqlite3 shell
+def render_plan(roots):
+    lines = []
+
+    def render(nodes, prefix):
+        for position, node in enumerate(nodes):
+            last = position == len(nodes) - 1
+            lines.append(f"{prefix}{'`--' if last else '|--'}{node.detail}  [{node.kind}]")
+            render(node.children, prefix + ("   " if last else "|  "))
+
+    render(roots, "")
+    return lines
+
+# Function to compare two plans of the same query
+# Returns a dict with "changed" (True if the plan trees differ) and "changes", a list of readable
+# differences: the access path of each table before and after, and temp b-trees added or removed.
+# An alias can appear more than once (in a subquery or each arm of a UNION), so access paths are matched by
+# the path of parent rows above them (subquery, co-routine, ...), the alias and how often it has been seen there.
+def diff_plans(before_roots, after_roots):
+    def access_paths(roots):
+        paths = {}
+        seen = {}
+
+        def collect(nodes, parents):
+            for node in nodes:
+                if node.table is not None:
+                    key = (parents, node.table)
+                    seen[key] = seen.get(key, 0) + 1
+                    paths[key + (seen[key],)] = node.detail
+                # Access path rows are labelled by their alias, other rows by their text
+                label = node.table if node.table is not None else node.detail
+                collect(node.children, parents + (label,))
+
+        collect(roots, ())
+        return paths
+
+    def temp_btrees(roots):
+        return [node.detail for _, node in walk_plan(roots) if node.kind == "temp b-tree"]
+
+    changes = []
+    before_paths = access_paths(before_roots)
+    after_paths = access_paths(after_roots)
+    for key in list(before_paths) + [key for key in after_paths if key not in before_paths]:
+        before_detail = before_paths.get(key, "(not in plan)")
+        after_detail = after_paths.get(key, "(not in plan)")
+        if before_detail != after_detail:
+            context = f"in {' / '.join(key[0])}: " if key[0] else ""
+            changes.append(f"{context}{before_detail} -> {after_detail}")
+
+    before_temp = temp_btrees(before_roots)
+    after_temp = temp_btrees(after_roots)
+    changes += [f"removed: {detail}" for detail in before_temp if detail not in after_temp]
+    changes += [f"added: {detail}" for detail in after_temp if detail not in before_temp]
+
+    return {"changed": render_plan(before_roots) != render_plan(after_roots), "changes": changes}
+
 # Function to view query explanations
-# Also measures and prints the execution time of the EXPLAIN QUERY PLAN command
+# Also measures and prints how long the EXPLAIN QUERY PLAN command takes, then runs the query once and prints
+# the run time, rows and VM steps recorded by the shared instrumentation. benchmark_queries.py measures the
+# queries properly (many runs, warm and cold).
 def view_query(cursor, sql_query):
 
     # Start the timer
     start_time = time.perf_counter_ns()
-    
-    # Prepend EXPLAIN QUERY PLAN to the SQL query
-    sql_query = "EXPLAIN QUERY PLAN " + str(sql_query)
-    cursor.execute(sql_query)
-    plan_rows = cursor.fetchall()
+
+    # Get the plan tree for the query
+    roots = get_plan(cursor, sql_query)
 
     # End the timer
     end_time = time.perf_counter_ns()
@@ -123,17 +276,19 @@ def view_query(cursor, sql_query):
     # Calculate execution time in nanoseconds
     execution_time = end_time - start_time
 
-    # Initialize a counter for indentation
-    counter = 0
-
-    # Print each row of the query plan with indentation
+    # Print the plan tree; each row is indented under its parent row
     print("Query Plan:")
-    for row in plan_rows:
-        node_id, parent_id, unused, detail = row
-        indent = "  " * counter
-        print(f"{indent}ID: {node_id}, Parent: {parent_id}, Detail: {detail}")
-        counter += 1
-    print(f"\nExecution Time: {execution_time} nanoseconds")
+    for line in render_plan(roots):
+        print(line)
+    print(f"\nPlanning Time (EXPLAIN QUERY PLAN only): {execution_time} nanoseconds")
+
+    # Run the query once; the VM steps are only counted when the connection is instrumented
+    before = statement_stats.totals(sql_query)
+    start_time = time.perf_counter_ns()
+    rows = cursor.execute(sql_query).fetchall()
+    run_time = time.perf_counter_ns() - start_time
+    steps = statement_stats.totals(sql_query)["steps"] - before["steps"]
+    print(f"Run Time: {run_time / 1_000_000:.3f} ms, rows: {len(rows)}, VM steps (approx.): {steps}")
     input("Press Enter to continue...")
 
 # Main function to run the program
@@ -151,7 +306,7 @@ def main():
     cursor.execute("PRAGMA eqp = OFF;")
 
     # List of queries to explain
-    queries = [query_1(cursor), query_2(cursor), query_3(cursor), query_4(cursor), query_5(cursor)]
+    queries = [query_function(cursor) for query_function in QUERY_FUNCTIONS]
 
     # Loop through each query and display its explanation
     for i, sql_query in enumerate(queries, start=1):
@@ -161,11 +316,53 @@ def main():
     # Close the database connection
     conn.close()
 
+# Function to show how each query plan changes when the indexes are added
+# Plans are captured with the indexes from INDEX_STATEMENTS dropped and again after they are created.
+# The indexes are dropped and created on a temporary copy, so the database file itself is never changed.
+def view_plan_diff(db_name="Module 7/sakila-1.db"):
+
+    # sqlite3.connect would quietly create an empty database, so check the file first
+    if not os.path.exists(db_name):
+        print(f"Database file not found: {db_name}")
+        return
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_copy = os.path.join(work_dir, "explain.db")
+        shutil.copyfile(db_name, db_copy)
+
+        # Connect to the copy
+        conn = connect_to_database(db_copy)
+        if conn is None:
+            return
+        cursor = conn.cursor()
+
+        # Capture every plan without and then with the indexes
+        drop_indexes(cursor)
+        before = [get_plan(cursor, query_function(cursor)) for query_function in QUERY_FUNCTIONS]
+        create_indexes(cursor)
+        after = [get_plan(cursor, query_function(cursor)) for query_function in QUERY_FUNCTIONS]
+
+        # Close the connection before the copy is removed
+        conn.close()
+
+    # Print the differences for each query
+    for i, (before_roots, after_roots) in enumerate(zip(before, after), start=1):
+        diff = diff_plans(before_roots, after_roots)
+        print(f"\nPlan changes for Query {i}:")
+        if not diff["changed"]:
+            print("  No change.")
+        for change in diff["changes"]:
+            print(f"  {change}")
+
 # Run the main function
+# Run with --diff to compare the plans with and without the indexes instead
 if __name__ == "__main__":
 
-    create_indexes(None)
-    main()
+    if "--diff" in sys.argv:
+        view_plan_diff()
+    else:
+        create_indexes(None)
+        main()
     print("\n All query explanations have been displayed.")
     print("Exiting program. \n")
     input("Press Enter to continue...")
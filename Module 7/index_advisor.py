@@ -0,0 +1,476 @@
+"""
+Program name: index_advisor.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Index advisor driven by EXPLAIN QUERY PLAN.
+Reads a workload file of queries (see workload.sql), explains each one and looks for full table scans (SCAN)
+and temporary sorts (USE TEMP B-TREE). From the tables, filters, joins and GROUP BY / ORDER BY columns of those
+queries it proposes single column, composite and covering indexes. Each candidate is built on a temporary copy
+of the database and only kept if it changes a query plan and makes the workload faster (greedy selection).
+The baseline and the candidate are kept in two copies and timed in turn within the same pass, so both see the
+same machine load; a gain only counts when it is bigger than the run-to-run spread of those timings.
+It also flags existing indexes that are redundant and only add write cost.
+
+    python "Module 7/index_advisor.py" --db "Module 7/sakila-1.db" --workload "Module 7/workload.sql"
+    python "Module 7/index_advisor.py" --db "Module 7/sakila-1.db" --with-explain-indexes
+"""
+
+# Import necessary libraries
+import argparse
+import json
+import os
+import re
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+from explain_query import create_indexes
+
+# Note: Ensure the file paths are correct, as I had to change the path to run it on my machine.
+DEFAULT_DB_NAME = "Module 7/sakila-1.db"
+DEFAULT_WORKLOAD = "Module 7/workload.sql"
+
+# Advisor settings
+DEFAULT_RUNS = 10               # timed runs per query, the median is used and the spread is the noise
+MIN_GAIN_FRACTION = 0.05        # smallest improvement worth an index, as a share of the affected queries' time
+MAX_INDEX_COLUMNS = 5           # covering indexes wider than this are not proposed
+
+# SQL words that can follow a table name but are not an alias
+NOT_ALIASES = {"ON", "WHERE", "JOIN", "INNER", "LEFT", "RIGHT", "FULL", "CROSS", "NATURAL", "OUTER", "USING",
+               "GROUP", "ORDER", "LIMIT", "HAVING", "UNION", "EXCEPT", "INTERSECT", "WINDOW", "SET", "VALUES"}
+
+# Comparison operators; the first group can use an index for equality, the second for a range
+EQUALITY_OPERATORS = {"=", "==", "IS", "IN"}
+RANGE_OPERATORS = {"<", "<=", ">", ">=", "BETWEEN"}
+OPERATOR_PATTERN = r"(==|=|<=|>=|<|>|\bIS\b(?!\s+NOT)|\bIN\b|\bBETWEEN\b)"
+
+
+# Workload Loader Function
+# Returns a list of (name, sql) pairs. A "-- name: x" comment names the statement that follows it.
+def load_workload(path):
+    queries = []
+    name = None
+    buffer = []
+    with open(path, "r") as file:
+        for line in file:
+            stripped = line.strip()
+            if stripped.lower().startswith("-- name:"):
+                name = stripped.split(":", 1)[1].strip()
+                continue
+            if stripped.startswith("--") and not buffer:
+                continue
+            buffer.append(line)
+            statement = "".join(buffer)
+            if sqlite3.complete_statement(statement):
+                queries.append((name or f"statement_{len(queries) + 1}", statement.strip()))
+                name = None
+                buffer = []
+    if "".join(buffer).strip():
+        queries.append((name or f"statement_{len(queries) + 1}", "".join(buffer).strip()))
+    return queries
+
+# Table Column Helper Function
+def table_columns(connection, table):
+    return [row[1] for row in connection.execute(f'PRAGMA table_info("{table}");')]
+
+# Rowid Alias Helper Function
+# Returns the INTEGER PRIMARY KEY column of a table, or None. The table itself is stored in this column's
+# order, so an index that starts with it never helps.
+def rowid_alias(connection, table):
+    primary_key = [row for row in connection.execute(f'PRAGMA table_info("{table}");') if row[5]]
+    if len(primary_key) == 1 and primary_key[0][2].upper() == "INTEGER":
+        return primary_key[0][1]
+    return None
+
+# Existing Index Helper Function
+# Returns every index that is on plain columns (expression indexes are skipped)
+def existing_indexes(connection):
+    indexes = []
+    tables = [row[0] for row in connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+    for table in tables:
+        for _, name, unique, origin, partial in connection.execute(f'PRAGMA index_list("{table}");'):
+            columns = [row[2] for row in connection.execute(f'PRAGMA index_info("{name}");')]
+            if None in columns:
+                continue
+            indexes.append({"name": name, "table": table, "columns": columns, "unique": bool(unique),
+                            "origin": origin, "partial": bool(partial)})
+    return indexes
+
+# Query Parser Function
+# A light-weight parser for the SELECT statements in the workload. It finds the tables and their aliases,
+# the filter and join columns of each alias, GROUP BY / ORDER BY columns and every column referenced.
+def parse_query(connection, sql):
+    # Blank out string literals so their contents are never mistaken for SQL
+    text = re.sub(r"'(?:[^']|'')*'", "?", sql)
+
+    aliases = {}
+    for table, alias in re.findall(r"\b(?:FROM|JOIN)\s+([A-Za-z_]\w*)(?:\s+(?:AS\s+)?([A-Za-z_]\w*))?", text, re.I):
+        if not alias or alias.upper() in NOT_ALIASES:
+            alias = table
+        aliases[alias] = table
+
+    columns = {alias: table_columns(connection, table) for alias, table in aliases.items()}
+    parsed = {"aliases": aliases, "equality": {}, "range": {}, "joins": {}, "group_order": [], "referenced": {}}
+
+    def add(kind, alias, column):
+        if alias in aliases and column in columns[alias]:
+            values = parsed[kind].setdefault(alias, [])
+            if column not in values:
+                values.append(column)
+
+    # Join conditions: a.x = b.y
+    join_spans = []
+    for match in re.finditer(r"\b(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)", text):
+        add("joins", match.group(1), match.group(2))
+        add("joins", match.group(3), match.group(4))
+        join_spans.append(match.span())
+
+    # Filters: a.x = value, a.x IS NULL, a.x < value ...
+    for match in re.finditer(r"\b(\w+)\.(\w+)\s*" + OPERATOR_PATTERN, text, re.I):
+        if any(start <= match.start() < end for start, end in join_spans):
+            continue
+        operator = match.group(3).upper()
+        add("equality" if operator in EQUALITY_OPERATORS else "range", match.group(1), match.group(2))
+
+    # Unqualified filters are only unambiguous when there is a single table
+    where = re.search(r"\bWHERE\b(.*?)(?:\bGROUP\b|\bORDER\b|\bLIMIT\b|;|$)", text, re.I | re.S)
+    if len(aliases) == 1 and where:
+        alias = next(iter(aliases))
+        for column, operator in re.findall(r"(?<![.\w])([A-Za-z_]\w*)\s*" + OPERATOR_PATTERN, where.group(1), re.I):
+            add("equality" if operator.upper() in EQUALITY_OPERATORS else "range", alias, column)
+
+    # GROUP BY and ORDER BY columns
+    for clause in re.findall(r"\b(?:GROUP|ORDER)\s+BY\b(.*?)(?:\bHAVING\b|\bORDER\b|\bLIMIT\b|;|$)", text, re.I | re.S):
+        for item in clause.split(","):
+            item = re.sub(r"\s+(ASC|DESC)\s*$", "", item.strip(), flags=re.I)
+            if "." in item:
+                alias, column = item.split(".", 1)
+            elif len(aliases) == 1:
+                alias, column = next(iter(aliases)), item
+            else:
+                continue
+            if alias in aliases and column in columns[alias]:
+                parsed["group_order"].append((alias, column))
+
+    # Every referenced column, used to build covering indexes
+    for alias, column in re.findall(r"\b(\w+)\.(\w+)\b", text):
+        add("referenced", alias, column)
+    if len(aliases) == 1:
+        alias = next(iter(aliases))
+        for column in columns[alias]:
+            if re.search(rf"(?<![.\w]){re.escape(column)}(?!\w)", text):
+                add("referenced", alias, column)
+    return parsed
+
+# Explain Function
+def explain(connection, sql):
+    return connection.execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+
+# Plan Findings Function
+# Returns the full scans and temporary b-trees in a query plan
+def plan_findings(plan_rows):
+    findings = []
+    for _, _, _, detail in plan_rows:
+        if detail.startswith("SCAN "):
+            findings.append({"kind": "SCAN", "alias": detail.split()[1], "detail": detail})
+        elif detail.startswith("USE TEMP B-TREE"):
+            findings.append({"kind": "TEMP B-TREE", "alias": None, "detail": detail})
+    return findings
+
+# Candidate Generator Function
+# Proposes indexes for one query. Returns a list of {"table", "columns", "reason"} entries.
+def candidates_for_query(connection, parsed, findings, indexes):
+    candidates = []
+    if not findings:
+        return candidates
+    aliases = parsed["aliases"]
+
+    def propose(alias, key_columns, reason):
+        table = aliases[alias]
+        key_columns = list(dict.fromkeys(key_columns))
+        if not key_columns or len(key_columns) > MAX_INDEX_COLUMNS:
+            return
+        if key_columns[0] == rowid_alias(connection, table):
+            return
+        # Skip it if an existing index already starts with these columns
+        for index in indexes:
+            if index["table"] == table and index["columns"][:len(key_columns)] == key_columns:
+                return
+        candidates.append({"table": table, "columns": key_columns, "reason": reason})
+
+    for alias in aliases:
+        equality = parsed["equality"].get(alias, [])
+        ranges = parsed["range"].get(alias, [])
+        joins = parsed["joins"].get(alias, [])
+        referenced = parsed["referenced"].get(alias, [])
+
+        # Single column indexes for filters and joins
+        for column in equality + ranges:
+            propose(alias, [column], f"filter on {alias}.{column}")
+        for column in joins:
+            propose(alias, [column], f"join on {alias}.{column}")
+
+        # Composite index: equality columns first, then one range column
+        key = equality + ranges[:1]
+        if len(key) > 1:
+            propose(alias, key, f"composite filter on {alias}")
+
+        # Covering indexes: the key plus every other column the query reads from this table
+        for key in [equality + ranges[:1], joins[:1]]:
+            if key:
+                extra = [column for column in referenced if column not in key]
+                if extra:
+                    propose(alias, key + extra, f"covering index for {alias}")
+
+    # GROUP BY / ORDER BY on one table can be read in index order instead of sorted in a temp b-tree
+    if any(finding["kind"] == "TEMP B-TREE" for finding in findings) and parsed["group_order"]:
+        group_aliases = {alias for alias, _ in parsed["group_order"]}
+        if len(group_aliases) == 1:
+            alias = group_aliases.pop()
+            propose(alias, [column for _, column in parsed["group_order"]], f"GROUP BY / ORDER BY on {alias}")
+    return candidates
+
+# Interleaved Timing Function
+# Runs the query `runs` times on every connection in turn and returns one list of milliseconds per connection.
+# The order is reversed on every other run so neither connection always goes first.
+def time_interleaved(connections, sql, runs):
+    for connection in connections:
+        connection.execute(sql).fetchall()
+    timings = [[] for _ in connections]
+    for run in range(runs):
+        order = list(enumerate(connections))
+        if run % 2:
+            order.reverse()
+        for position, connection in order:
+            start_time = time.perf_counter_ns()
+            connection.execute(sql).fetchall()
+            timings[position].append((time.perf_counter_ns() - start_time) / 1_000_000)
+    return timings
+
+# Noise Helper Function
+# How far the 95th percentile of the samples lies above their median
+def p95_spread(samples):
+    if len(samples) < 2:
+        return 0.0
+    return statistics.quantiles(samples, n=20, method="inclusive")[18] - statistics.median(samples)
+
+# Index Name Helper Function
+def candidate_name(candidate):
+    return "idx_advisor_" + candidate["table"] + "_" + "_".join(candidate["columns"])
+
+# Index DDL Helper Function
+def candidate_sql(candidate):
+    return (f'CREATE INDEX IF NOT EXISTS {candidate_name(candidate)} ON {candidate["table"]}('
+            + ", ".join(candidate["columns"]) + ");")
+
+# Database Size Helper Function
+# Bytes in use; pages on the freelist (left by a dropped index and reused by the next one) are not counted
+def database_bytes(connection):
+    page_count = connection.execute("PRAGMA page_count;").fetchone()[0]
+    freelist_count = connection.execute("PRAGMA freelist_count;").fetchone()[0]
+    page_size = connection.execute("PRAGMA page_size;").fetchone()[0]
+    return (page_count - freelist_count) * page_size
+
+# Greedy Selection Function
+# Repeatedly tries every remaining candidate on top of the indexes already chosen and keeps the one that
+# saves the most workload time, until no candidate changes a plan and saves enough time.
+# `baseline` holds the indexes chosen so far; each candidate is built in `trial`, which is otherwise the same.
+def choose_indexes(baseline, trial, workload, parsed_queries, candidates, runs):
+    chosen = []
+    plans = {name: [row[3] for row in explain(baseline, sql)] for name, sql in workload}
+    remaining = list(candidates)
+
+    while remaining:
+        best = None
+        for candidate in remaining:
+            affected = [(name, sql) for name, sql in workload
+                        if candidate["table"] in parsed_queries[name]["aliases"].values()]
+            size_before = database_bytes(trial)
+            trial.execute(candidate_sql(candidate))
+            size = database_bytes(trial) - size_before
+
+            changed = [name for name, sql in affected if [row[3] for row in explain(trial, sql)] != plans[name]]
+            before_totals = [0.0] * runs
+            after_totals = [0.0] * runs
+            for name, sql in affected:
+                if name in changed:
+                    before_runs, after_runs = time_interleaved([baseline, trial], sql, runs)
+                    before_totals = [total + value for total, value in zip(before_totals, before_runs)]
+                    after_totals = [total + value for total, value in zip(after_totals, after_runs)]
+            trial.execute(f"DROP INDEX {candidate_name(candidate)};")
+            if not changed:
+                continue
+
+            before = statistics.median(before_totals)
+            after = statistics.median(after_totals)
+            gain = before - after
+            noise = max(p95_spread(before_totals), p95_spread(after_totals))
+            if gain > noise and gain >= MIN_GAIN_FRACTION * before:
+                if best is None or gain > best["gain_ms"]:
+                    best = {"candidate": candidate, "gain_ms": gain, "noise_ms": noise, "before_ms": before,
+                            "after_ms": after, "queries": changed, "size_bytes": size}
+        if best is None:
+            break
+
+        # Keep the best candidate in both copies and measure the next round on top of it
+        candidate = best["candidate"]
+        baseline.execute(candidate_sql(candidate))
+        trial.execute(candidate_sql(candidate))
+        for name in best["queries"]:
+            plans[name] = [row[3] for row in explain(baseline, dict(workload)[name])]
+        chosen.append({"sql": candidate_sql(candidate), "table": candidate["table"], "columns": candidate["columns"],
+                       "reason": candidate["reason"], "gain_ms": round(best["gain_ms"], 4),
+                       "noise_ms": round(best["noise_ms"], 4), "before_ms": round(best["before_ms"], 4),
+                       "after_ms": round(best["after_ms"], 4), "queries": best["queries"],
+                       "size_bytes": best["size_bytes"]})
+        remaining = [other for other in remaining if other is not candidate]
+    return chosen
+
+# Redundant Index Function
+# Flags indexes that cannot help any query: ones that start with the table's INTEGER PRIMARY KEY,
+# and ones whose columns are a leading prefix of (or equal to) another index on the same table.
+def find_redundant_indexes(connection):
+    redundant = []
+    indexes = existing_indexes(connection)
+    for index in indexes:
+        if index["origin"] != "c" or index["partial"]:
+            continue
+        primary_key = rowid_alias(connection, index["table"])
+        if index["columns"][0] == primary_key:
+            redundant.append({"name": index["name"], "table": index["table"],
+                              "reason": f"starts with {primary_key}, the INTEGER PRIMARY KEY the table is stored by"})
+            continue
+        if index["unique"]:
+            continue
+        for other in indexes:
+            if other is index or other["table"] != index["table"] or other["partial"]:
+                continue
+            if other["columns"][:len(index["columns"])] == index["columns"]:
+                # For two identical indexes keep the autoindex, or the first one by name
+                if other["columns"] == index["columns"] and other["origin"] == "c" and other["name"] > index["name"]:
+                    continue
+                redundant.append({"name": index["name"], "table": index["table"],
+                                  "reason": f"columns are a prefix of {other['name']}({', '.join(other['columns'])})"})
+                break
+    return redundant
+
+# Advisor Function
+def run_advisor(db_name, workload_path, runs, with_explain_indexes):
+    workload = load_workload(workload_path)
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_copy = os.path.join(work_dir, "advisor.db")
+        shutil.copyfile(db_name, db_copy)
+        connection = sqlite3.connect(db_copy, isolation_level=None)
+        if with_explain_indexes:
+            create_indexes(connection.cursor())
+
+        # Explain every query and collect candidates
+        indexes = existing_indexes(connection)
+        report_queries = []
+        parsed_queries = {}
+        candidates = []
+        for name, sql in workload:
+            parsed = parse_query(connection, sql)
+            parsed_queries[name] = parsed
+            findings = plan_findings(explain(connection, sql))
+            report_queries.append({"name": name, "findings": findings})
+            for candidate in candidates_for_query(connection, parsed, findings, indexes):
+                if all(candidate["table"] != other["table"] or candidate["columns"] != other["columns"]
+                       for other in candidates):
+                    candidates.append(candidate)
+
+        # Indexes the current plans never use
+        used = set()
+        for name, sql in workload:
+            for row in explain(connection, sql):
+                match = re.search(r"USING (?:COVERING )?INDEX (\w+)", row[3])
+                if match:
+                    used.add(match.group(1))
+        unused = [index["name"] for index in indexes if index["origin"] == "c" and index["name"] not in used]
+        redundant = find_redundant_indexes(connection)
+
+        # advisor.db stays as it started; the chosen indexes go into the baseline copy
+        connections = [connection]
+        for copy_name in ["baseline.db", "trial.db"]:
+            shutil.copyfile(db_copy, os.path.join(work_dir, copy_name))
+            connections.append(sqlite3.connect(os.path.join(work_dir, copy_name), isolation_level=None))
+        original, baseline, trial = connections
+        chosen = choose_indexes(baseline, trial, workload, parsed_queries, candidates, runs)
+
+        # Before and after come from the same interleaved pass over the original and the advised copy
+        before = {}
+        after = {}
+        for name, sql in workload:
+            before_runs, after_runs = time_interleaved([original, baseline], sql, runs)
+            before[name] = statistics.median(before_runs)
+            after[name] = statistics.median(after_runs)
+        for connection in connections:
+            connection.close()
+
+    return {"queries": report_queries, "candidates": candidates, "recommended": chosen, "redundant": redundant,
+            "unused_by_workload": unused, "before_ms": before, "after_ms": after}
+
+# Report Function
+def print_report(report):
+    print("=== Plan findings ===")
+    for query in report["queries"]:
+        details = "; ".join(finding["detail"] for finding in query["findings"]) or "no scans or temp b-trees"
+        print(f"{query['name']:<20} {details}")
+
+    print(f"\n=== Candidates considered: {len(report['candidates'])} ===")
+    for candidate in report["candidates"]:
+        print(f"  {candidate['table']}({', '.join(candidate['columns'])})  - {candidate['reason']}")
+
+    print("\n=== Recommended indexes (in order chosen) ===")
+    if not report["recommended"]:
+        print("  None. No candidate changed a plan and saved enough time.")
+    for choice in report["recommended"]:
+        print(f"  {choice['sql']}")
+        print(f"      {choice['before_ms']:.3f} -> {choice['after_ms']:.3f} ms on {', '.join(choice['queries'])} "
+              f"(saves {choice['gain_ms']:.3f} ms, noise {choice['noise_ms']:.3f} ms), "
+              f"index size about {choice['size_bytes'] / 1024:.0f} KiB")
+
+    print("\n=== Redundant indexes (safe to drop) ===")
+    if not report["redundant"]:
+        print("  None.")
+    for index in report["redundant"]:
+        print(f"  DROP INDEX {index['name']};  -- {index['reason']}")
+
+    if report["unused_by_workload"]:
+        print("\nIndexes not used by any workload query: " + ", ".join(report["unused_by_workload"]))
+
+    print("\n=== Workload time (median ms) ===")
+    for name, before in report["before_ms"].items():
+        print(f"  {name:<20} {before:9.3f} -> {report['after_ms'][name]:9.3f}")
+    print(f"  {'total':<20} {sum(report['before_ms'].values()):9.3f} -> {sum(report['after_ms'].values()):9.3f}")
+
+# Main function to run the advisor
+def main():
+    parser = argparse.ArgumentParser(description="Recommend indexes for a workload using EXPLAIN QUERY PLAN.")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help="database file (a temporary copy is used)")
+    parser.add_argument("--workload", default=DEFAULT_WORKLOAD, help="SQL file of workload queries")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="timed runs per query")
+    parser.add_argument("--with-explain-indexes", action="store_true",
+                        help="add the create_indexes() indexes from explain_query.py to the copy first")
+    parser.add_argument("--output", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    for path in [args.db, args.workload]:
+        if not os.path.exists(path):
+            print(f"File not found: {path}")
+            sys.exit(1)
+
+    report = run_advisor(args.db, args.workload, max(1, args.runs), args.with_explain_indexes)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nReport written to {args.output}")
+
+# Run the main function
+if __name__ == "__main__":
+    main()
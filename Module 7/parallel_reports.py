@@ -0,0 +1,272 @@
+"""
+Program name: parallel_reports.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Runs the nightly sakila reports from explain_query.py across a pool of worker processes.
+    customer_totals      query_3: total payments for every customer
+    outstanding_rentals  query_5: name and address of every customer with a rental not yet returned
+The customers are split into key ranges: by store_id first, then into customer_id ranges of about the same size
+within each store. Every worker process opens its own read-only connection (sqlite_readonly.py) and runs the
+report for one range at a time. The parent merges the partial results: payment totals are added up per customer
+(each partial sum is turned into whole cents first, so the order the partials arrive in cannot change the result)
+and the outstanding rentals are combined as a set, which keeps the DISTINCT of the original query. Each merged report is checked against the
+original query run on a single connection.
+The runner works on a temporary copy of the database with the indexes from create_indexes(). --inflate 10 makes
+the copy ten times bigger: the customers and their rentals and payments are copied under new IDs, and each copied
+customer's last name gets the copy number (SMITH-2, SMITH-3, ...) so the DISTINCT of outstanding_rentals keeps them.
+
+    python "Module 7/parallel_reports.py" --db "Module 7/sakila-1.db" --workers 1 2 4 8 --inflate 10
+    python "Module 7/parallel_reports.py" --db "Module 7/sakila-1.db" --workers 4 --output reports
+"""
+
+# Import necessary libraries
+import argparse
+import csv
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+from explain_query import create_indexes, query_3, query_5
+
+# The shared SQL instrumentation and the read-only connection helper live in the Shared folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Shared"))
+from sql_instrumentation import configure
+from sqlite_readonly import connect_readonly
+
+# Note: Ensure the database file path is correct, as I had to change the path to run it on my machine.
+DEFAULT_DB_NAME = "Module 7/sakila-1.db"
+
+# Runner settings
+DEFAULT_WORKERS = [1, 2, 4]
+DEFAULT_RUNS = 3
+PARTITIONS_PER_WORKER = 4       # more ranges than workers, so a slow range does not leave the others idle
+
+# Partial queries; each one covers the customers of one store with customer_id between two values
+CUSTOMER_TOTALS_PARTIAL = """
+    SELECT c.customer_id, c.first_name, c.last_name, SUM(p.amount)
+    FROM customer AS c
+    JOIN payment AS p ON c.customer_id = p.customer_id
+    WHERE c.store_id = ? AND c.customer_id BETWEEN ? AND ?
+    GROUP BY c.customer_id, c.first_name, c.last_name;
+    """
+
+OUTSTANDING_RENTALS_PARTIAL = """
+    SELECT DISTINCT c.first_name, c.last_name, a.address, ci.city, co.country, a.postal_code, a.phone
+    FROM customer AS c
+    JOIN address AS a ON c.address_id = a.address_id
+    JOIN city AS ci ON a.city_id = ci.city_id
+    JOIN country AS co ON ci.country_id = co.country_id
+    JOIN rental AS r ON c.customer_id = r.customer_id
+    WHERE r.return_date IS NULL AND c.store_id = ? AND c.customer_id BETWEEN ? AND ?;
+    """
+
+# The read-only connection of a worker process, opened by init_worker()
+worker_connection = None
+
+
+# Merge Functions
+# Each takes the list of partial results and returns the finished report rows in a fixed order
+def merge_customer_totals(partials):
+    totals = {}
+    for rows in partials:
+        for customer_id, first_name, last_name, amount in rows:
+            key = (customer_id, first_name, last_name)
+            totals[key] = totals.get(key, 0) + round(amount * 100)
+    return [key + (cents / 100,) for key, cents in sorted(totals.items())]
+
+def merge_outstanding_rentals(partials):
+    merged = set()
+    for rows in partials:
+        merged.update(rows)
+    return sorted(merged)
+
+# Normalize Functions
+# Put the single-connection result in the same form as the merged one, so the two can be compared
+def normalize_customer_totals(rows):
+    return sorted((customer_id, first_name, last_name, round(total, 2))
+                  for customer_id, first_name, last_name, total in rows)
+
+def normalize_outstanding_rentals(rows):
+    return sorted(set(rows))
+
+# Reports: name -> (original query function, partial query, merge function, normalize function, CSV columns)
+REPORTS = {
+    "customer_totals": (query_3, CUSTOMER_TOTALS_PARTIAL, merge_customer_totals, normalize_customer_totals,
+                        ["customer_id", "first_name", "last_name", "total_amount"]),
+    "outstanding_rentals": (query_5, OUTSTANDING_RENTALS_PARTIAL, merge_outstanding_rentals,
+                            normalize_outstanding_rentals,
+                            ["first_name", "last_name", "address", "city", "country", "postal_code", "phone"]),
+}
+
+
+# Inflate Database Function
+# Adds `factor - 1` copies of every customer with their rentals and payments, under new IDs.
+# The last name is suffixed with the copy number; identical copies would collapse in query_5's DISTINCT.
+def inflate_database(connection, factor):
+    customer_offset = connection.execute("SELECT MAX(customer_id) FROM customer").fetchone()[0]
+    rental_offset = connection.execute("SELECT MAX(rental_id) FROM rental").fetchone()[0]
+    payment_offset = connection.execute("SELECT MAX(payment_id) FROM payment").fetchone()[0]
+    with connection:
+        for copy in range(1, factor):
+            connection.execute("""
+                INSERT INTO customer (customer_id, store_id, first_name, last_name, email, address_id, active,
+                                      create_date, last_update)
+                SELECT customer_id + ?, store_id, first_name, last_name || '-' || ?, email, address_id, active,
+                       create_date, last_update
+                FROM customer WHERE customer_id <= ?;
+                """, (copy * customer_offset, copy + 1, customer_offset))
+            connection.execute("""
+                INSERT INTO rental (rental_id, rental_date, inventory_id, customer_id, return_date, staff_id,
+                                    last_update)
+                SELECT rental_id + ?, rental_date, inventory_id, customer_id + ?, return_date, staff_id, last_update
+                FROM rental WHERE rental_id <= ?;
+                """, (copy * rental_offset, copy * customer_offset, rental_offset))
+            connection.execute("""
+                INSERT INTO payment (payment_id, customer_id, staff_id, rental_id, amount, payment_date, last_update)
+                SELECT payment_id + ?, customer_id + ?, staff_id, rental_id + ?, amount, payment_date, last_update
+                FROM payment WHERE payment_id <= ?;
+                """, (copy * payment_offset, copy * customer_offset, copy * rental_offset, payment_offset))
+
+# Prepare Database Function
+# Copies the database into `work_dir`, inflates it and adds the indexes; returns the path of the copy
+def prepare_database(db_name, work_dir, factor):
+    copy_path = os.path.join(work_dir, "reports.db")
+    shutil.copyfile(db_name, copy_path)
+    connection = sqlite3.connect(copy_path)
+    if factor > 1:
+        inflate_database(connection, factor)
+    create_indexes(connection.cursor())
+    connection.execute("ANALYZE;")
+    connection.commit()
+    connection.close()
+    return copy_path
+
+# Partition Function
+# Splits the customers into about `count` key ranges of (store_id, first customer_id, last customer_id).
+# A range never spans two stores, so each store's customers end up in whole ranges of their own.
+def partition_ranges(connection, count):
+    rows = connection.execute("SELECT store_id, customer_id FROM customer ORDER BY store_id, customer_id").fetchall()
+    size = max(1, -(-len(rows) // count))
+    ranges = []
+    start = 0
+    for position in range(1, len(rows) + 1):
+        if position == len(rows) or position - start == size or rows[position][0] != rows[start][0]:
+            ranges.append((rows[start][0], rows[start][1], rows[position - 1][1]))
+            start = position
+    return ranges
+
+# Worker Initializer Function
+# Runs once in every worker process and opens its read-only connection
+def init_worker(db_name):
+    global worker_connection
+    configure(enabled=False)
+    worker_connection = connect_readonly(db_name)
+
+# Worker Task Function
+# Runs one report's partial query for one key range
+def run_partition(task):
+    report, key_range = task
+    return worker_connection.execute(REPORTS[report][1], key_range).fetchall()
+
+# Parallel Report Function
+# Runs the report on the pool for every range and merges the partial results as they arrive
+def run_parallel(pool, report, ranges):
+    partials = pool.imap_unordered(run_partition, [(report, key_range) for key_range in ranges])
+    return REPORTS[report][2](partials)
+
+# Serial Report Function
+# The original query on one connection
+def run_serial(connection, report):
+    return connection.execute(REPORTS[report][0](None)).fetchall()
+
+# Timing Helper Function
+# Median ms of `runs` calls after one untimed call; returns (median ms, result of the last call)
+def time_runs(function, runs):
+    result = function()
+    timings = []
+    for _ in range(runs):
+        start_time = time.perf_counter_ns()
+        result = function()
+        timings.append((time.perf_counter_ns() - start_time) / 1_000_000)
+    return statistics.median(timings), result
+
+# Write Report Function
+def write_report(output_dir, report, rows):
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{report}.csv")
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(REPORTS[report][4])
+        writer.writerows(rows)
+    return path
+
+# Runner Function
+# Times every report serially and with each worker count; returns (result rows, merged reports)
+def run_reports(db_name, reports, worker_counts, runs):
+    configure(enabled=False)
+    connection = connect_readonly(db_name)
+    results = []
+    merged = {}
+    serial = {}
+    for report in reports:
+        serial_ms, rows = time_runs(lambda: run_serial(connection, report), runs)
+        serial[report] = (serial_ms, REPORTS[report][3](rows))
+        results.append((report, "serial", 1, serial_ms, 1.0, len(rows), True))
+
+    for workers in worker_counts:
+        ranges = partition_ranges(connection, workers * PARTITIONS_PER_WORKER)
+        with multiprocessing.Pool(workers, initializer=init_worker, initargs=(db_name,)) as pool:
+            for report in reports:
+                parallel_ms, rows = time_runs(lambda: run_parallel(pool, report, ranges), runs)
+                serial_ms, expected = serial[report]
+                results.append((report, f"{workers} workers", len(ranges), parallel_ms, serial_ms / parallel_ms,
+                                len(rows), rows == expected))
+                merged[report] = rows
+    connection.close()
+    return results, merged
+
+# Main function to run the reports
+def main():
+    parser = argparse.ArgumentParser(description="Run the sakila reports in parallel, partitioned by key range.")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help="sakila database file")
+    parser.add_argument("--report", choices=list(REPORTS), nargs="+", default=list(REPORTS), help="reports to run")
+    parser.add_argument("--workers", type=int, nargs="+", default=DEFAULT_WORKERS, help="worker processes per run")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="timed runs per measurement")
+    parser.add_argument("--inflate", type=int, default=1, help="make the copy this many times bigger")
+    parser.add_argument("--output", help="write each merged report as CSV into this folder")
+    args = parser.parse_args()
+
+    # sqlite3.connect would quietly create an empty database, so check the file first
+    if not os.path.exists(args.db):
+        print(f"Database file not found: {args.db}")
+        sys.exit(1)
+    if min(args.workers) < 1 or args.runs < 1 or args.inflate < 1:
+        print("Workers, runs and the inflate factor must be at least 1.")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        start_time = time.perf_counter()
+        db_name = prepare_database(args.db, work_dir, args.inflate)
+        print(f"Prepared a {args.inflate}x copy in {time.perf_counter() - start_time:.1f} s "
+              f"({os.path.getsize(db_name) / 1_048_576:.1f} MB), {os.cpu_count()} CPU(s).\n")
+        results, merged = run_reports(db_name, args.report, args.workers, args.runs)
+
+    print(f"{'Report':<20} {'Run':<11} {'Ranges':>6} {'Median ms':>10} {'Speedup':>8} {'Rows':>7} {'Matches':>8}")
+    for report, run, ranges, elapsed_ms, speedup, rows, matches in results:
+        print(f"{report:<20} {run:<11} {ranges:>6} {elapsed_ms:>10.1f} {speedup:>7.2f}x {rows:>7} "
+              f"{'yes' if matches else 'NO':>8}")
+    if not all(result[6] for result in results):
+        print("\nA merged report does not match the single-connection query.")
+
+    if args.output:
+        for report, rows in merged.items():
+            print(f"Wrote {write_report(args.output, report, rows)}")
+
+# Run the main function
+if __name__ == "__main__":
+    main()
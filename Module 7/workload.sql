@@ -0,0 +1,78 @@
+-- Workload for index_advisor.py
+-- Each statement may be preceded by a "-- name:" comment. Parameters are written as literal values
+-- because the advisor times the statements as well as explaining them.
+
+-- name: query_1
+SELECT f.title, f.description, l.name
+FROM film AS f
+JOIN language AS l ON f.language_id = l.language_id
+LIMIT 300;
+
+-- name: query_2
+SELECT DISTINCT r.customer_id
+FROM rental AS r
+JOIN inventory AS i ON r.inventory_id = i.inventory_id
+JOIN film AS f ON i.film_id = f.film_id
+WHERE f.title = 'MONTEZUMA COMMAND';
+
+-- name: query_3
+SELECT c.customer_id, c.first_name, c.last_name, SUM(p.amount) AS total_amount
+FROM customer AS c
+JOIN payment AS p ON c.customer_id = p.customer_id
+GROUP BY c.customer_id, c.first_name, c.last_name;
+
+-- name: query_4
+SELECT DISTINCT a.actor_id, a.first_name, a.last_name
+FROM actor AS a
+JOIN film_actor AS fa ON a.actor_id = fa.actor_id
+JOIN film AS f ON fa.film_id = f.film_id
+WHERE f.rental_rate = 0.99;
+
+-- name: query_5
+SELECT DISTINCT c.first_name, c.last_name, a.address, ci.city, co.country, a.postal_code, a.phone
+FROM customer AS c
+JOIN address AS a ON c.address_id = a.address_id
+JOIN city AS ci ON a.city_id = ci.city_id
+JOIN country AS co ON ci.country_id = co.country_id
+JOIN rental AS r ON c.customer_id = r.customer_id
+WHERE r.return_date IS NULL;
+
+-- Sakila clerk assistant (Module 5/M05 Programming Assignment 2/John_Dostal_salika_assistant.py)
+
+-- name: customer_details
+SELECT c.first_name, c.last_name, a.address, a.phone, ci.city, co.country, c.email, c.active, c.last_update
+FROM customer AS c
+JOIN address AS a ON c.address_id = a.address_id
+JOIN city AS ci ON a.city_id = ci.city_id
+JOIN country AS co ON ci.country_id = co.country_id
+WHERE c.customer_id = 148;
+
+-- name: rentals_by_customer
+SELECT r.rental_id, r.rental_date, f.title, r.return_date, s.first_name || ' ' || s.last_name AS staff_name
+FROM rental AS r
+JOIN inventory AS i ON r.inventory_id = i.inventory_id
+JOIN film AS f ON i.film_id = f.film_id
+JOIN staff AS s ON r.staff_id = s.staff_id
+WHERE r.customer_id = 148;
+
+-- name: films_by_store
+SELECT DISTINCT f.title, l.name AS language, c.name AS category, f.rating AS rating
+FROM film AS f
+JOIN language AS l ON f.language_id = l.language_id
+JOIN film_category AS fc ON f.film_id = fc.film_id
+JOIN category AS c ON fc.category_id = c.category_id
+JOIN inventory AS i ON f.film_id = i.film_id
+WHERE i.store_id = 1;
+
+-- name: payment_details
+SELECT c.first_name, c.last_name, f.title, p.amount, p.payment_date, s.first_name || ' ' || s.last_name AS staff_name
+FROM customer AS c
+JOIN payment AS p ON c.customer_id = p.customer_id
+JOIN rental AS r ON p.rental_id = r.rental_id
+JOIN inventory AS i ON r.inventory_id = i.inventory_id
+JOIN film AS f ON i.film_id = f.film_id
+JOIN staff AS s ON p.staff_id = s.staff_id
+WHERE c.customer_id = 148;
+
+-- name: customer_list
+SELECT customer_id, first_name, last_name FROM customer ORDER BY customer_id ASC;
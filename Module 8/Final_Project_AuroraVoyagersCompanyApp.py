@@ -1,71 +1,100 @@
 """
 Program name: Final_Project_AuroraVoyagersCompanyApp.py
 Author: John Dostal
-Date last updated: 10/16/2025
+Date last updated: 10/18/2026
 Purpose: This program is a command-line application for managing customers and spaceship orders for Aurora Voyagers Company.
 It allows users to register new customers, view available spaceships, order spaceships, view and update customer information.
+All menu options share one long-lived connection pool (see aurora_db_pool.py) instead of reconnecting for every choice.
+The revenue report reads only the trigger-maintained rollup tables (see aurora_revenue.py).
 """
 
 # Import necessary libraries
-import datetime
+import os
+import re
 import sqlite3
+import sys
 
-# Database Connection Function
-# Note: Ensure the database file path is correct, as I had to change the path to run it on my machine.
-def connect_db(db_name='Module 8/AuroraVoyagersCompany.db'):
-    try:
-        return sqlite3.connect(db_name)
-    except sqlite3.Error as e:
-        print("Failed to connect to database:", e)
-        print("Exiting program. \n")
-        return None
+from aurora_db_pool import create_pool
+from aurora_revenue import create_revenue_rollups, run_report
+from order_engine import OrderError, place_order
+from schema_catalog import SchemaCatalog
+
+# The shared SQL instrumentation (statement timings, slow-query log) and the keyset pager live in the Shared folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Shared"))
+from keyset_pager import KeysetPager
+from sql_instrumentation import connection_factory
+
+# Connection pool size. A single clerk only ever needs one connection at a time.
+POOL_SIZE = 2
 
-# Database Close Function
-def close_db(connection):
-    if connection:
-        connection.close()
+# Number of spaceship rows pulled from SQLite per fetchmany() call when listing the inventory
+SPACESHIP_BATCH_SIZE = 50
 
-# Pagination Helper Function
-def paginate(data, per_page):
-    for i in range(0, len(data), per_page):
-        yield data[i:i + per_page]
+# Columns returned by the spaceship listing, in display order
+SPACESHIP_COLUMNS = ["SpaceshipID", "SerialNumber", "Make", "Model", "ShipName", "ModelYear", "Condition",
+                     "Modifications", "SalePrice", "LastMaintenanceDate", "Available"]
+
+# Number of extra customer pages read ahead with each page query
+CUSTOMER_PREFETCH_PAGES = 1
 
 
 # Get Table Columns Helper Function
-def get_Table_Columns(table_name):
-    connection = connect_db()
-    if connection is None:
-        return []
-    cursor = connection.cursor()
-    cursor.execute(f"PRAGMA table_info({table_name});")
-    columns = [info[1] for info in cursor.fetchall()]
-    close_db(connection)
-    return columns
+# Reads the column list from the schema catalog, which only goes back to SQLite if the schema changed
+def get_Table_Columns(catalog, connection, table_name):
+    catalog.refresh(connection)
+    return catalog.columns(table_name)
 
 # Register New Customer
-def register_customer(cursor, connection):
+def register_customer(cursor, connection, catalog):
     print("=== Register New Customer ===")
     if connection is None:
         return
-    Customer_Columns = get_Table_Columns("Customer")
+    Customer_Columns = get_Table_Columns(catalog, connection, "Customer")
     customer_values = []
     for col in Customer_Columns:
         col_value = input(f"Enter {col}: ").strip()
         customer_values.append(col_value)
-    cursor.execute("INSERT INTO Customer VALUES (" + ", ".join(["?"] * len(customer_values)) + ")", customer_values)
+    cursor.execute(catalog.insert_statement("Customer"), customer_values)
     connection.commit()
 
-# Get List of all Spaceships
-def get_spaceships(cursor):
-    query = "SELECT SpaceshipID, Make, Model, ShipName, SerialNumber, ModelYear, Condition, Modifications, SalePrice, LastMaintenanceDate, Available FROM Spaceship WHERE Available != 0"
-    cursor.execute(query)
-    return cursor.fetchall()
+# List Spaceships Function
+# Returns every needed spaceship column in a single query and streams the rows in batches,
+# so the inventory is never loaded into memory all at once. Rows are sqlite3.Row objects,
+# so columns are read by name (ship["Make"]) instead of by tuple position.
+def list_spaceships(cursor, available_only=True, batch_size=SPACESHIP_BATCH_SIZE):
+    listing_cursor = cursor.connection.cursor()
+    listing_cursor.row_factory = sqlite3.Row
+    listing_cursor.arraysize = batch_size
+    query = "SELECT " + ", ".join(SPACESHIP_COLUMNS) + " FROM Spaceship"
+    if available_only:
+        query += " WHERE Available != 0"
+    query += " ORDER BY SpaceshipID"
+    listing_cursor.execute(query)
+    try:
+        while True:
+            batch = listing_cursor.fetchmany()
+            if not batch:
+                break
+            yield from batch
+    finally:
+        listing_cursor.close()
 
 # Get Spaceship Details by ID
 def get_spaceship_details(cursor, spaceship_id):
-    query = "SELECT * FROM Spaceship WHERE SpaceshipID = ?"
-    cursor.execute(query, (spaceship_id,))
-    return cursor.fetchone()
+    details_cursor = cursor.connection.cursor()
+    details_cursor.row_factory = sqlite3.Row
+    query = "SELECT " + ", ".join(SPACESHIP_COLUMNS) + " FROM Spaceship WHERE SpaceshipID = ?"
+    details_cursor.execute(query, (spaceship_id,))
+    details = details_cursor.fetchone()
+    details_cursor.close()
+    return details
+
+# Print Spaceship Helper Function
+def print_spaceship(ship):
+    print(f"\nDetails for Spaceship ID {ship['SpaceshipID']}:")
+    print(f"Make: {ship['Make']}, Model: {ship['Model']}, Ship Name: {ship['ShipName']}, Serial Number:  {ship['SerialNumber']}")
+    print(f"Model Year: {ship['ModelYear']}, Condition:  {ship['Condition']}, Last Maintenance Date: {ship['LastMaintenanceDate']}")
+    print(f"Modifications: {ship['Modifications']}, Sale Price: {ship['SalePrice']}, Stock Available:  {ship['Available']}, ")
 
 
 # Get List of all Customers
@@ -74,6 +103,12 @@ def get_customers(cursor):
     cursor.execute(query)
     return cursor.fetchall()
 
+# Page Through Customers
+# Returns a keyset pager over CustomerID, last name, and first name, ordered by CustomerID.
+def get_customer_pager(cursor, page_size):
+    return KeysetPager(cursor, "Customer", "CustomerID", ["CustomerID", "CustomerLastName", "CustomerFirstName"],
+                       page_size, CUSTOMER_PREFETCH_PAGES)
+
 # Get Customer Details by ID
 def get_customer_details(cursor, customer_id):
     query = "SELECT * FROM Customer WHERE CustomerID = ?"
@@ -82,8 +117,6 @@ def get_customer_details(cursor, customer_id):
 
 # View Customer Information
 def view_customer_info(cursor):
-    cursor = cursor
-    customers = get_customers(cursor)
 
 # Prompt user to see if they know the customer ID
 # If yes, prompt for ID and display details
@@ -109,26 +142,26 @@ def view_customer_info(cursor):
 # If customer_id is not known, display paginated list of customers to choose from
         elif known_customer == 'n':
             page_size = int(input("How many customers per page? ").strip())
-            pages = list(paginate(customers, page_size))
-            current = 0
+            pager = get_customer_pager(cursor, page_size)
+            pager.first()
 
             # Loop to navigate pages and select customer
             while True:
-                print(f"\n--- Page {current + 1}/{len(pages)} ---\n")
-                for i, cust in enumerate(pages[current], 1):
+                print(f"\n--- Page {pager.page_number} ---\n")
+                for i, cust in enumerate(pager.current, 1):
                     print(f"Entry # {i} | Customer ID: {cust[0]} | Name:{cust[2]} {cust[1]}")
                 selection = input("\nSelect which entry you would like to view more information on. (Hit 0 for next page, -1 for previous page): \n")
 
                 if selection == '0':
-                    current = (current + 1) % len(pages)
+                    pager.next()
                 elif selection == '-1':
-                    current = (current - 1) % len(pages)
+                    pager.previous()
                 else:
                     try:
                         index = int(selection) - 1
 
-                        if 0 <= index < len(pages[current]):
-                            cust_id = pages[current][index][0]
+                        if 0 <= index < len(pager.current):
+                            cust_id = pager.current[index][0]
                             details = get_customer_details(cursor, cust_id)
                             print(f"\nDetails for Customer ID {cust_id}:")
                             print(f"Name: {details[2]}, {details[1]}")
@@ -159,18 +192,25 @@ def view_customer_info(cursor):
         return
     
 # Update Customer Information
-def update_customer():
+def update_customer(cursor, connection, catalog):
     print("=== Update Customer Info ===")
+    if connection is None:
+        return
     CustomerID = input("Enter Customer ID to update: ").strip()
-    Customer_Columns = get_Table_Columns("Customer")
+    Customer_Columns = get_Table_Columns(catalog, connection, "Customer")
     print("Available columns to update:", Customer_Columns)
     column_to_update = input("Enter the column to update: ").strip()
-    new_value = input("Enter the new value: ").strip()
-    connection = connect_db()
-    if not connection:
+
+    # Only columns listed in the catalog can be updated
+    try:
+        update_statement = catalog.update_statement("Customer", column_to_update)
+    except ValueError as e:
+        print(f"\n{e} Returning to main menu. \n")
+        input("Press Enter to continue...")
         return
-    cursor = connection.cursor()
-    cursor.execute(f"UPDATE Customer SET {column_to_update} = ? WHERE CustomerID = ?", (new_value, CustomerID))
+
+    new_value = input("Enter the new value: ").strip()
+    cursor.execute(update_statement, (new_value, CustomerID))
     connection.commit()
 
 # View Available Spaceships
@@ -178,13 +218,8 @@ def view_spaceships(cursor, connection):
     print("=== Available Spaceships ===")
     if connection is None:
         return
-    Spaceships = get_spaceships(cursor)
-    for spaceship in Spaceships:
-        details = get_spaceship_details(cursor, spaceship[0])
-        print(f"\nDetails for Spaceship ID {spaceship[0]}:")
-        print(f"Make: {details[4]}, Model: {details[5]}, Ship Name: {details[6]}, Serial Number:  {details[1]}")
-        print(f"Model Year: {details[7]}, Condition:  {details[8]}, Last Maintenance Date: {details[11]}")
-        print(f"Modifications: {details[9]}, Sale Price: {details[10]}, Stock Available:  {details[12]}, ")
+    for spaceship in list_spaceships(cursor):
+        print_spaceship(spaceship)
         input("Press Enter to continue...")
 
 # Select Spaceship Helper Function
@@ -200,10 +235,7 @@ def select_Spaceship(cursor, connection):
                 spaceship_id = int(input("Enter spaceship ID: ").strip())
                 details = get_spaceship_details(cursor, spaceship_id)
                 if details:
-                    print(f"\nDetails for Spaceship ID {spaceship_id}:")
-                    print(f"Make: {details[1]}, Model: {details[2]}, Ship Name: {details[3]}, Serial Number:  {details[4]}")
-                    print(f"Model Year: {details[5]}, Condition:  {details[6]}, Last Maintenance Date: {details[9]}")
-                    print(f"Modifications: {details[7]}, Sale Price: {details[8]}, Stock Available:  {details[10]}, ")
+                    print_spaceship(details)
                     input("Press Enter to continue...")
             except ValueError:
                 print("Invalid input. Returning to main menu. \n")
@@ -262,53 +294,87 @@ def order_spaceship(cursor, connection):
             return
         
         # Check spaceship availability
+        # This is only a hint for the clerk; the stock is checked again inside the purchase transaction
         Spaceship_quantity = cursor.execute("SELECT Available FROM Spaceship WHERE SpaceshipID = ?", (SpaceshipID,)).fetchone()[0]
-        if Spaceship_quantity > 0:
-            cursor.execute("UPDATE Spaceship SET Available = 0 WHERE SpaceshipID = ?", (SpaceshipID,))
-        else:
+        if Spaceship_quantity <= 0:
             print("Sorry, this spaceship is not available.")
             print("Please choose another spaceship.")
+            return
         
         # Confirm purchase loop
-        Continue = True
-        while Continue == True:
+        while True:
             confirm = input(f"Confirm purchase of Spaceship ID {SpaceshipID} (yes/no): ").strip().lower()
-            if confirm in ['yes', 'no']:
-                if confirm == 'no':
-                    print("Purchase cancelled.")
-                    Continue = False
-                    break
-                elif confirm == 'yes':
-
-                    # Get user input for order details
-                    # Creates new Order for transaction
-                    Destination = input("Enter the destination for delivery: ")
-                    OrderStatus = "Processing"
-                    DiscountApplied = 0
-                    SalePrice = cursor.execute("SELECT SalePrice FROM Spaceship WHERE SpaceshipID = ?", (SpaceshipID,)).fetchone()[0]
-                    TaxRate = 1.1  # Assuming a fixed tax rate of 10%
-                    OrderTotal = (SalePrice - DiscountApplied) * TaxRate
-                    OrderDateTime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    HighestOrderID = cursor.execute("SELECT MAX(OrderID) FROM Orders").fetchone()[0]
-                    if HighestOrderID is None:
-                        NewOrderID = 1
-                    else:
-                        NewOrderID = HighestOrderID + 1
-                    cursor.execute("""INSERT INTO Orders (OrderID, InvoiceID, CustomerID, SpaceshipID, OrderDateTime, Destination,
-                                        OrderStatus, DiscountApplied, OrderTotal)
-                                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                                    (NewOrderID, "Null", CustomerID, SpaceshipID, OrderDateTime, Destination,
-                                    OrderStatus, DiscountApplied, OrderTotal))
-                    # Commit transaction and close connection
-                    connection.commit()
-                    print("Purchase successful!")
+            if confirm == 'no':
+                print("Purchase cancelled.")
+                break
+            elif confirm == 'yes':
+
+                # Get user input for order details
+                # The order engine reserves the ship and creates the order in one transaction
+                Destination = input("Enter the destination for delivery: ")
+                try:
+                    order = place_order(connection, CustomerID, SpaceshipID, Destination)
+                except OrderError as e:
+                    print(f"Sorry, the purchase could not be completed. {e}")
                     break
-                else:
-                    print("Invalid input. Please enter 'yes' or 'no'.")
+                print(f"Purchase successful! Order ID: {order['OrderID']}, Order Total: {order['OrderTotal']:.2f}")
+                break
+            else:
+                print("Invalid input. Please enter 'yes' or 'no'.")
+        return
+
+# Money Helper Function
+# The rollups store revenue in whole cents
+def format_cents(revenue_cents):
+    return f"{revenue_cents / 100:,.2f}"
+
+# View Revenue Report
+# Every figure comes from the revenue rollup tables, so the report does not aggregate the Orders or Payment rows
+def view_revenue_report(cursor):
+    print("=== Revenue Report ===")
+    month = input("Enter a month (YYYY-MM), or press Enter for every month: ").strip()
+
+    # No month: one line per month
+    if month == "":
+        for period, orders, revenue_cents in run_report(cursor, "monthly_revenue"):
+            print(f"Month: {period}, Orders: {orders}, Revenue: {format_cents(revenue_cents)}")
+        input("Press Enter to continue...")
+        return
+    if not re.fullmatch(r"\d{4}-\d{2}", month):
+        print("Invalid month. Returning to main menu. \n")
+        input("Press Enter to continue...")
         return
 
+    # One month: daily revenue, top customers, spaceship makes and models, and payments by status
+    days = run_report(cursor, "daily_revenue", month)
+    if not days:
+        print(f"No orders in {month}.")
+    for period, orders, revenue_cents in days:
+        print(f"Day: {period}, Orders: {orders}, Revenue: {format_cents(revenue_cents)}")
+    print(f"\nTop customers in {month}:")
+    for customer_id, first_name, last_name, orders, revenue_cents in run_report(cursor, "top_customers", month):
+        print(f"Customer ID: {customer_id} | Name: {first_name} {last_name} | Orders: {orders} | "
+              f"Revenue: {format_cents(revenue_cents)}")
+    print(f"\nRevenue by spaceship make and model in {month}:")
+    for make, model, orders, revenue_cents in run_report(cursor, "models", month):
+        print(f"Make: {make}, Model: {model}, Orders: {orders}, Revenue: {format_cents(revenue_cents)}")
+    print(f"\nPayments by status in {month}:")
+    for status, payments, revenue_cents in run_report(cursor, "payment_status", month):
+        print(f"Status: {status}, Payments: {payments}, Amount: {format_cents(revenue_cents)}")
+    input("Press Enter to continue...")
+
 # Main Program Function
 def main():
+    # Open the connection pool once for the whole session
+    pool = create_pool(size=POOL_SIZE, factory=connection_factory())
+    if not pool:
+        return
+
+    # Create the revenue rollups on first use, then load the schema catalog once at startup
+    with pool.connection() as connection:
+        create_revenue_rollups(connection)
+        catalog = SchemaCatalog(connection)
+
     # Display menu and prompt for user choice using loop
     while True:
         print("\n=== Generic Store Menu ===")
@@ -317,46 +383,29 @@ def main():
         print("3. Order Spaceship")
         print("4. View Customer Info")
         print("5. Update Customer Info")
-        print("6. Exit")
+        print("6. Revenue Report")
+        print("7. Exit")
         choice = input("Select an option: ")
 
         # Execute the corresponding function based on user choice
-        if choice == '1':
-            connection = connect_db()
-            if not connection:
-                return
-            cursor = connection.cursor()
-            register_customer(cursor, connection)
-            close_db(connection)
-        elif choice == '2':
-            connection = connect_db()
-            if not connection:
-                return
-            cursor = connection.cursor()
-            view_spaceships(cursor, connection)
-            close_db(connection)
-        elif choice == '3':
-            connection = connect_db()
-            if not connection:
-                return
-            cursor = connection.cursor()
-            order_spaceship(cursor, connection)
-            close_db(connection)
-        elif choice == '4':
-            connection = connect_db()
-            if not connection:
-                return
-            cursor = connection.cursor()
-            view_customer_info(cursor)
-            close_db(connection)
-        elif choice == '5':
-            connection = connect_db()
-            if not connection:
-                return
-            cursor = connection.cursor()
-            update_customer()
-            close_db(connection)
-        elif choice == '6':
+        # Every option borrows a connection from the pool and hands it back afterwards
+        if choice in ['1', '2', '3', '4', '5', '6']:
+            with pool.connection() as connection:
+                cursor = connection.cursor()
+                if choice == '1':
+                    register_customer(cursor, connection, catalog)
+                elif choice == '2':
+                    view_spaceships(cursor, connection)
+                elif choice == '3':
+                    order_spaceship(cursor, connection)
+                elif choice == '4':
+                    view_customer_info(cursor)
+                elif choice == '5':
+                    update_customer(cursor, connection, catalog)
+                elif choice == '6':
+                    view_revenue_report(cursor)
+                cursor.close()
+        elif choice == '7':
             print("Goodbye! \n")
             input("Press Enter to continue...")
             break
@@ -364,6 +413,10 @@ def main():
             print("\nInvalid option. Try again. \n")
             input("Press Enter to continue...")
 
+    # Close the pool and show how the connections were used
+    print("Connection pool usage:", pool.report())
+    pool.close()
+
 # Run the main function
 if __name__ == '__main__':
     main()
@@ -0,0 +1,311 @@
+"""
+Program name: aurora_benchmarks.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Benchmarks for the Aurora Voyagers Company application.
+Runs against a temporary copy of the database so the real data file is never modified.
+    python "Module 8/aurora_benchmarks.py" spaceships --ships 5000
+    python "Module 8/aurora_benchmarks.py" orders --threads 8 --ships 50 --stock 20
+    python "Module 8/aurora_benchmarks.py" scale --scales 10000 100000 1000000
+"""
+
+# Import necessary libraries
+import argparse
+import itertools
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from aurora_data_generator import DEFAULT_DDL, DEFAULT_SEED, generate_database
+from aurora_db_pool import ConnectionPool
+from Final_Project_AuroraVoyagersCompanyApp import (get_customer_details, get_customer_pager, get_customers,
+                                                    get_spaceship_details, list_spaceships)
+from order_engine import OrderError, place_order
+from schema_catalog import SchemaCatalog
+
+# Note: Ensure the database file path is correct, as I had to change the path to run it on my machine.
+DEFAULT_DB_NAME = 'Module 8/AuroraVoyagersCompany.db'
+
+# Scale test settings: total generated rows per run, and page size of the customer pager
+DEFAULT_SCALES = [10_000, 100_000, 1_000_000]
+DEFAULT_SAMPLES = 200
+SCALE_PAGE_SIZE = 20
+
+
+# Copy Database Helper Function
+# Returns the path of a throwaway copy of the database inside `work_dir`
+def copy_database(db_name, work_dir):
+    copy_path = os.path.join(work_dir, "benchmark.db")
+    shutil.copyfile(db_name, copy_path)
+    return copy_path
+
+# Round Trip Counter Helper Function
+# Counts every statement SQLite executes on the connection using the trace callback
+def count_round_trips(connection):
+    counter = {"statements": 0}
+
+    def trace(statement):
+        counter["statements"] += 1
+
+    connection.set_trace_callback(trace)
+    return counter
+
+# Grow Spaceship Table Helper Function
+# Copies the existing spaceships with new IDs until the table holds `ship_count` available rows
+def grow_spaceships(connection, ship_count):
+    columns = [info[1] for info in connection.execute("PRAGMA table_info(Spaceship);")]
+    connection.execute("UPDATE Spaceship SET Available = 1")
+    templates = connection.execute("SELECT * FROM Spaceship").fetchall()
+    next_id = connection.execute("SELECT COALESCE(MAX(SpaceshipID), 0) + 1 FROM Spaceship").fetchone()[0]
+    current = len(templates)
+    rows = []
+    id_index = columns.index("SpaceshipID")
+    while current < ship_count:
+        row = list(templates[current % len(templates)])
+        row[id_index] = next_id
+        rows.append(row)
+        next_id += 1
+        current += 1
+    placeholders = ", ".join(["?"] * len(columns))
+    connection.executemany(f"INSERT INTO Spaceship VALUES ({placeholders})", rows)
+    connection.commit()
+
+# Timer Helper Function
+# Runs `work` `repeat` times and returns the median duration in milliseconds
+def median_ms(work, repeat):
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter_ns()
+        work()
+        timings.append((time.perf_counter_ns() - start_time) / 1_000_000)
+    return statistics.median(timings)
+
+# Sample Timer Helper Function
+# Calls `work(sample)` once per sample and returns the median and 95th percentile in milliseconds
+def sample_ms(work, samples):
+    timings = []
+    for sample in samples:
+        start_time = time.perf_counter_ns()
+        work(sample)
+        timings.append((time.perf_counter_ns() - start_time) / 1_000_000)
+    timings.sort()
+    return statistics.median(timings), timings[int(0.95 * (len(timings) - 1))]
+
+# Legacy Spaceship Listing
+# The pattern view_spaceships() used before: list every ship, then query each one again by ID
+def legacy_spaceship_listing(cursor):
+    cursor.execute("SELECT SpaceshipID, Make, Model, ShipName, SerialNumber, ModelYear, Condition, Modifications, "
+                   "SalePrice, LastMaintenanceDate, Available FROM Spaceship WHERE Available != 0")
+    ships = cursor.fetchall()
+    return [get_spaceship_details(cursor, ship[0]) for ship in ships]
+
+# Batched Spaceship Listing
+def batched_spaceship_listing(cursor):
+    return list(list_spaceships(cursor))
+
+# Spaceship Listing Benchmark
+# Compares the old N+1 listing with the single batched query
+def benchmark_spaceships(db_name, ship_count, repeat):
+    with tempfile.TemporaryDirectory() as work_dir:
+        connection = sqlite3.connect(copy_database(db_name, work_dir))
+        grow_spaceships(connection, ship_count)
+        cursor = connection.cursor()
+        counter = count_round_trips(connection)
+
+        print(f"=== Spaceship listing ({ship_count} available ships, median of {repeat} runs) ===")
+        for label, work in [("N+1 listing", legacy_spaceship_listing), ("Batched listing", batched_spaceship_listing)]:
+            counter["statements"] = 0
+            rows = len(work(cursor))
+            round_trips = counter["statements"]
+            elapsed = median_ms(lambda: work(cursor), repeat)
+            print(f"{label:<16} rows: {rows:>8} | round trips: {round_trips:>8} | median: {elapsed:10.3f} ms")
+        connection.close()
+
+# Order Stress Test
+# Several threads, each with its own pooled connection, keep buying random ships until all stock is sold.
+# Afterwards every ship must have exactly `stock` orders and no negative stock, otherwise something was double-sold.
+def benchmark_orders(db_name, thread_count, ship_count, stock):
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_copy = copy_database(db_name, work_dir)
+        connection = sqlite3.connect(db_copy)
+        grow_spaceships(connection, ship_count)
+        ship_ids = [row[0] for row in connection.execute(
+            "SELECT SpaceshipID FROM Spaceship ORDER BY SpaceshipID LIMIT ?", (ship_count,))]
+        connection.execute("UPDATE Spaceship SET Available = 0")
+        connection.executemany("UPDATE Spaceship SET Available = ? WHERE SpaceshipID = ?",
+                               [(stock, ship_id) for ship_id in ship_ids])
+        customer_id = connection.execute("SELECT MIN(CustomerID) FROM Customer").fetchone()[0]
+        orders_before = connection.execute("SELECT COUNT(*) FROM Orders").fetchone()[0]
+        connection.commit()
+        connection.close()
+
+        pool = ConnectionPool(db_copy, size=thread_count)
+        results = {"orders": 0, "sold_out": 0, "retries": 0, "errors": 0}
+        results_lock = threading.Lock()
+        start_barrier = threading.Barrier(thread_count)
+
+        def terminal(seed):
+            rng = random.Random(seed)
+            remaining = list(ship_ids)
+            with pool.connection() as terminal_connection:
+                start_barrier.wait()
+                while remaining:
+                    ship_id = rng.choice(remaining)
+                    try:
+                        order = place_order(terminal_connection, customer_id, ship_id, "Stress Test")
+                        outcome, retries = "orders", order["Attempts"] - 1
+                    except OrderError:
+                        remaining.remove(ship_id)
+                        outcome, retries = "sold_out", 0
+                    except sqlite3.Error:
+                        outcome, retries = "errors", 0
+                    with results_lock:
+                        results[outcome] += 1
+                        results["retries"] += retries
+
+        threads = [threading.Thread(target=terminal, args=(seed,)) for seed in range(thread_count)]
+        start_time = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start_time
+        pool.close()
+
+        # Check for double sells
+        connection = sqlite3.connect(db_copy)
+        placeholders = ", ".join(["?"] * len(ship_ids))
+        sold = dict(connection.execute(f"""SELECT SpaceshipID, COUNT(*) FROM Orders
+                                           WHERE OrderID > ? AND SpaceshipID IN ({placeholders})
+                                           GROUP BY SpaceshipID""", [orders_before] + ship_ids).fetchall())
+        negative_stock = connection.execute("SELECT COUNT(*) FROM Spaceship WHERE Available < 0").fetchone()[0]
+        connection.close()
+        oversold = [ship_id for ship_id in ship_ids if sold.get(ship_id, 0) != stock]
+
+        print(f"=== Order stress test ({thread_count} threads, {ship_count} ships x {stock} in stock) ===")
+        print(f"Orders placed: {results['orders']} of {ship_count * stock} | sold-out rejections: {results['sold_out']} "
+              f"| busy retries: {results['retries']} | errors: {results['errors']}")
+        print(f"Elapsed: {elapsed:.3f} s | throughput: {results['orders'] / elapsed:,.0f} orders/sec")
+        if oversold or negative_stock:
+            print(f"FAILED: ships with wrong order counts: {oversold[:10]}, ships with negative stock: {negative_stock}")
+        else:
+            print("OK: every ship sold exactly its stock, no double sells.")
+
+# Scale Operations Function
+# Returns (label, work, samples) for every application operation, run against one generated database.
+# Point operations pick random IDs; whole-table operations run `repeat` times.
+def scale_operations(connection, catalog, rng, samples, repeat):
+    cursor = connection.cursor()
+    customer_count = connection.execute("SELECT MAX(CustomerID) FROM Customer").fetchone()[0]
+    ship_count = connection.execute("SELECT MAX(SpaceshipID) FROM Spaceship").fetchone()[0]
+    customer_ids = [rng.randint(1, customer_count) for _ in range(samples)]
+    ship_ids = [rng.randint(1, ship_count) for _ in range(samples)]
+
+    # Restock the ships the order test buys so every order succeeds
+    connection.executemany("UPDATE Spaceship SET Available = Available + 1 WHERE SpaceshipID = ?",
+                           [(ship_id,) for ship_id in ship_ids])
+    connection.commit()
+
+    insert_statement = catalog.insert_statement("Customer")
+    new_customer = [None if column in ["CustomerID", "VendorID"] else "Scale Test" for column in catalog.columns("Customer")]
+    update_statement = catalog.update_statement("Customer", "PhoneNumber")
+
+    def register(_):
+        cursor.execute(insert_statement, new_customer)
+        connection.commit()
+
+    def update(customer_id):
+        cursor.execute(update_statement, ("555-0000", customer_id))
+        connection.commit()
+
+    def wrap_to_last_page(_):
+        pager = get_customer_pager(cursor, SCALE_PAGE_SIZE)
+        pager.first()
+        pager.previous()
+
+    def next_pages(_):
+        pager = get_customer_pager(cursor, SCALE_PAGE_SIZE)
+        pager.first()
+        for _ in range(5):
+            pager.next()
+
+    once = [None] * repeat
+    return [
+        ("Register customer", register, [None] * samples),
+        ("View spaceships (first 10)", lambda _: list(itertools.islice(list_spaceships(cursor), 10)), once),
+        ("View spaceships (all)", lambda _: sum(1 for _ in list_spaceships(cursor)), once),
+        ("Spaceship details", lambda ship_id: get_spaceship_details(cursor, ship_id), ship_ids),
+        ("Customer pages (first + 5 next)", next_pages, once),
+        ("Customer pages (wrap to last)", wrap_to_last_page, once),
+        ("Customer list (all)", lambda _: get_customers(cursor), once),
+        ("Customer details", lambda customer_id: get_customer_details(cursor, customer_id), customer_ids),
+        ("Update customer", update, customer_ids),
+        ("Order spaceship", lambda pair: place_order(connection, pair[0], pair[1], "Scale Test"),
+         list(zip(customer_ids, ship_ids))),
+    ]
+
+# Scale Benchmark
+# Generates a database of each size with aurora_data_generator.py and times every application operation on it
+def benchmark_scale(scales, seed, ddl_path, samples, repeat):
+    results = {}
+    for total_rows in scales:
+        with tempfile.TemporaryDirectory() as work_dir:
+            db_name = os.path.join(work_dir, "scale.db")
+            counts, elapsed = generate_database(db_name, total_rows, seed, ddl_path)
+            size_mb = os.path.getsize(db_name) / 1_048_576
+            print(f"Generated {sum(counts.values()):,} rows ({counts['Customer']:,} customers, "
+                  f"{counts['Spaceship']:,} spaceships, {counts['Orders']:,} orders) in {elapsed:.1f} s, {size_mb:.1f} MiB",
+                  flush=True)
+
+            pool = ConnectionPool(db_name, size=1)
+            with pool.connection() as connection:
+                catalog = SchemaCatalog(connection)
+                rng = random.Random(seed)
+                for label, work, work_samples in scale_operations(connection, catalog, rng, samples, repeat):
+                    results.setdefault(label, {})[total_rows] = sample_ms(work, work_samples)
+            pool.close()
+
+    print("\n=== Application operations by scale (median / p95 ms; total rows across all 11 tables) ===")
+    header = f"{'Operation':<32}" + "".join(f"{total_rows:>20,}" for total_rows in scales)
+    print(header)
+    for label, by_scale in results.items():
+        print(f"{label:<32}" + "".join(f"{by_scale[total_rows][0]:>11.3f} /{by_scale[total_rows][1]:>7.3f}"
+                                        for total_rows in scales))
+
+# Main function to parse the command line and run the chosen benchmark
+def main():
+    parser = argparse.ArgumentParser(description="Aurora Voyagers Company benchmarks")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help="database file to copy for the benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per measurement")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    spaceships_parser = subparsers.add_parser("spaceships", help="N+1 vs batched spaceship listing")
+    spaceships_parser.add_argument("--ships", type=int, default=1000, help="number of available ships to list")
+
+    orders_parser = subparsers.add_parser("orders", help="multi-threaded order placement stress test")
+    orders_parser.add_argument("--threads", type=int, default=8, help="number of concurrent terminals")
+    orders_parser.add_argument("--ships", type=int, default=50, help="number of ships for sale")
+    orders_parser.add_argument("--stock", type=int, default=20, help="units in stock per ship")
+
+    scale_parser = subparsers.add_parser("scale", help="every application operation on generated databases")
+    scale_parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="total rows per database")
+    scale_parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="generator seed")
+    scale_parser.add_argument("--ddl", default=DEFAULT_DDL, help="CREATE TABLE script for the generator")
+    scale_parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="random IDs per point operation")
+
+    args = parser.parse_args()
+    if args.benchmark == "spaceships":
+        benchmark_spaceships(args.db, args.ships, args.repeat)
+    elif args.benchmark == "orders":
+        benchmark_orders(args.db, args.threads, args.ships, args.stock)
+    elif args.benchmark == "scale":
+        benchmark_scale(args.scales, args.seed, args.ddl, max(1, args.samples), max(1, args.repeat))
+
+# Run the main function
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,368 @@
+"""
+Program name: aurora_data_generator.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Seeded synthetic data generator for the AuroraVoyagersCompany schema.
+The tables are created by running the DDL in Module 5/M05 Project Activity - SQL/tables.sql, and the generator
+reads the columns, types and foreign keys back from SQLite (PRAGMA table_info / foreign_key_list). Every column
+gets a value generator from its type and foreign key, and COLUMN_OVERRIDES adds realistic or linked values where
+the column name calls for it. The same seed and row count always give the same database.
+All 11 tables are filled, with --rows spread across them by TABLE_SHARES. IDs run from 1 to the table's row count,
+so every foreign key points at an existing row. Order N, Invoice N and Payment N belong together and name the same
+customer. The load runs in one transaction with journaling off and executemany in chunks. The database is switched
+to WAL (like the app's pool) and analyzed at the end.
+
+    python "Module 8/aurora_data_generator.py" aurora_1m.db --rows 1000000 --seed 210
+    python "Module 8/aurora_data_generator.py" aurora_10k.db --rows 10000 --check
+"""
+
+# Import necessary libraries
+import argparse
+import datetime
+import os
+import random
+import re
+import sqlite3
+import sys
+import time
+
+# Note: Ensure the DDL file path is correct, as I had to change the path to run it on my machine.
+DEFAULT_DDL = 'Module 5/M05 Project Activity - SQL/tables.sql'
+
+# Generator settings
+DEFAULT_ROWS = 10_000
+DEFAULT_SEED = 210
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Share of the total row count given to each table
+# Orders, Invoice and Payment have the same share because each order has one invoice and one payment.
+TABLE_SHARES = {
+    "Vendor": 0.005,
+    "Employee": 0.005,
+    "Customer": 0.10,
+    "Spaceship": 0.05,
+    "Part": 0.05,
+    "Orders": 0.15,
+    "Invoice": 0.15,
+    "Payment": 0.15,
+    "OrderParts": 0.20,
+    "MaintenanceRequest": 0.07,
+    "FinanceRequest": 0.07,
+}
+
+# Range of generated dates
+DATE_START = datetime.date(2015, 1, 1)
+DATE_DAYS = 12 * 365
+
+# Value pools
+FIRST_NAMES = ["John", "Emily", "Carlos", "Sophia", "Ethan", "Ava", "Liam", "Mia", "Noah", "Zara", "Kai", "Luna",
+               "Omar", "Priya", "Jonas", "Ingrid", "Mateo", "Aiko", "Felix", "Nadia"]
+LAST_NAMES = ["Smith", "Johnson", "Ruiz", "Martinez", "Ford", "Reed", "Nakamura", "Okafor", "Novak", "Larsen",
+              "Haddad", "Singh", "Costa", "Weber", "Kowalski", "Moreau", "Tanaka", "Silva", "Byrne", "Volkov"]
+COMPANY_WORDS = ["Galactic", "Starlight", "Hyperdrive", "Quantum", "Nebula", "Orion", "Comet", "Pulsar", "Vega",
+                 "Andromeda"]
+COMPANY_KINDS = ["Supplies Co.", "Engineering", "Mechanics", "Fuel Ltd.", "Tech", "Shipyards", "Logistics",
+                 "Outfitters"]
+STREETS = ["Alpha Way", "Nova Lane", "Warp Dr", "Delta Dr", "Epsilon Ct", "Orbit Rd", "Comet Blvd", "Ion St"]
+MAKES = ["Orion Shipyards", "Vega Motors", "Nebula Works", "Comet Industries", "Pulsar Dynamics"]
+MODELS = ["RZ-1", "X-70", "Falcon", "Nomad", "Seraph", "Titan", "Wisp", "Zephyr"]
+CONDITIONS = ["New", "Used", "Refurbished", "Salvage"]
+MODIFICATIONS = ["None", "Extended Fuel Tanks", "Shield Upgrade", "Cargo Expansion", "Stealth Plating"]
+DESTINATIONS = ["Mars", "Europa", "Titan", "Luna Base", "Ceres", "Alpha Centauri", "Kepler-22b", "Ganymede"]
+ORDER_STATUSES = ["Processing", "Shipped", "Delivered", "Cancelled"]
+PART_NAMES = ["Hyperdrive", "Shield Generator", "Navigation Computer", "Thruster", "Life Support Unit",
+              "Sensor Array", "Fuel Cell", "Landing Gear"]
+PART_STATUSES = ["Available", "Backordered", "Discontinued"]
+PAYMENT_METHODS = ["Credit Card", "Bank Transfer", "Crypto", "Cash"]
+PAYMENT_STATUSES = ["Completed", "Pending", "Failed", "Refunded"]
+CURRENCIES = ["Republic Credits", "Galactic Standard", "USD"]
+ROLES = ["Engineer", "Sales", "Manager", "Technician", "Accountant", "Pilot"]
+DEPARTMENTS = ["Engineering", "Sales", "Finance", "Maintenance", "Operations"]
+EMPLOYMENT_STATUSES = ["Active", "On Leave", "Terminated"]
+VENDOR_TYPES = ["Parts", "Fuel", "Spaceships", "Services"]
+VENDOR_STATUSES = ["Active", "Inactive"]
+REQUEST_TYPES = ["Repair", "Inspection", "Upgrade", "Cleaning"]
+PRIORITIES = ["Low", "Medium", "High", "Critical"]
+REQUEST_STATUSES = ["Open", "In Progress", "Completed"]
+FINANCE_TYPES = ["Lease", "Loan", "Purchase"]
+APPROVAL_STATUSES = ["Approved", "Pending", "Denied"]
+
+
+# Read Table Definitions Function
+# Returns {table: {"columns": [(name, type, is_primary_key)], "foreign_keys": {column: parent table}}} in DDL order
+def read_tables(connection):
+    tables = {}
+    names = [row[0] for row in connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY rowid")]
+    for table in names:
+        columns = [(row[1], row[2].upper(), bool(row[5])) for row in connection.execute(f"PRAGMA table_info({table})")]
+        foreign_keys = {row[3]: row[2] for row in connection.execute(f"PRAGMA foreign_key_list({table})")}
+        tables[table] = {"columns": columns, "foreign_keys": foreign_keys}
+    return tables
+
+# Row Count Function
+# Splits the total row count between the tables, at least one row each
+def table_counts(tables, total_rows):
+    counts = {}
+    for table in tables:
+        counts[table] = max(1, int(total_rows * TABLE_SHARES.get(table, 0.01)))
+    return counts
+
+# Spread Helper Function
+# Maps an ID to a well mixed number in 0..modulus-1, so linked rows can agree on a value without storing it
+def spread(row_id, seed, modulus):
+    return ((row_id * 2654435761 + seed * 40503) % 4294967296) % modulus
+
+# Order Customer Helper Function
+# The customer of order N, shared by Orders, Invoice and Payment
+def order_customer(context, order_id):
+    return spread(order_id, context["seed"], context["counts"]["Customer"]) + 1
+
+# Date Helper Functions
+# The date strings are made once; formatting a date per value was a large share of the load time
+DATES = [(DATE_START + datetime.timedelta(days=day)).isoformat() for day in range(DATE_DAYS)]
+
+def random_date(rng):
+    return DATES[int(rng.random() * DATE_DAYS)]
+
+def random_datetime(rng):
+    seconds = int(rng.random() * 86400)
+    return f"{random_date(rng)} {seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+# Random Number Helper Functions
+# rng.random() is much cheaper than randint/choice, which matters at millions of values
+def between(rng, low, high):
+    return low + int(rng.random() * (high - low + 1))
+
+def choose(rng, pool):
+    return pool[int(rng.random() * len(pool))]
+
+# Choice Override Helper Function
+def pick(pool):
+    return lambda rng, row_id, row, context: choose(rng, pool)
+
+# Column overrides: (table, column) -> function(rng, row_id, row, context); `row` holds the columns already made
+COLUMN_OVERRIDES = {
+    ("Customer", "CustomerFirstName"): pick(FIRST_NAMES),
+    ("Customer", "CustomerLastName"): pick(LAST_NAMES),
+    ("Customer", "CompanyName"): lambda rng, row_id, row, context: f"{choose(rng, COMPANY_WORDS)} {choose(rng, COMPANY_KINDS)}",
+    ("Customer", "PhoneNumber"): lambda rng, row_id, row, context: f"555-{row_id % 10000:04d}",
+    ("Customer", "Email"): lambda rng, row_id, row, context:
+        f"{row['CustomerFirstName'][0]}.{row['CustomerLastName']}{row_id}@example.com".lower(),
+    ("Customer", "Address"): lambda rng, row_id, row, context: f"{between(rng, 1, 999)} {choose(rng, STREETS)}",
+    ("Customer", "IdentityVerified"): lambda rng, row_id, row, context: "Yes" if rng.random() < 0.8 else "No",
+    ("Customer", "VendorID"): lambda rng, row_id, row, context:
+        between(rng, 1, context["counts"]["Vendor"]) if rng.random() < 0.1 else None,
+    ("Spaceship", "SerialNumber"): lambda rng, row_id, row, context: f"SN{row_id:08d}",
+    ("Spaceship", "Make"): pick(MAKES),
+    ("Spaceship", "Model"): pick(MODELS),
+    ("Spaceship", "ShipName"): lambda rng, row_id, row, context: f"{choose(rng, COMPANY_WORDS)}-{row_id}",
+    ("Spaceship", "ModelYear"): lambda rng, row_id, row, context: between(rng, 2000, 2026),
+    ("Spaceship", "Condition"): pick(CONDITIONS),
+    ("Spaceship", "Modifications"): pick(MODIFICATIONS),
+    ("Spaceship", "SalePrice"): lambda rng, row_id, row, context: between(rng, 50, 4999) * 1000,
+    ("Spaceship", "Available"): lambda rng, row_id, row, context: choose(rng, [0, 1, 1, 1, 2, 3]),
+    ("Orders", "InvoiceID"): lambda rng, row_id, row, context: row_id,
+    ("Orders", "CustomerID"): lambda rng, row_id, row, context: order_customer(context, row_id),
+    ("Orders", "OrderDateTime"): lambda rng, row_id, row, context: random_datetime(rng),
+    ("Orders", "Destination"): pick(DESTINATIONS),
+    ("Orders", "OrderStatus"): pick(ORDER_STATUSES),
+    ("Orders", "DiscountApplied"): lambda rng, row_id, row, context: choose(rng, [0, 0, 0, 500, 1000, 5000]),
+    ("Orders", "OrderTotal"): lambda rng, row_id, row, context: round(between(rng, 50, 4999) * 1100.0, 2),
+    ("OrderParts", "OrderID"): lambda rng, row_id, row, context: (row_id - 1) % context["counts"]["Orders"] + 1,
+    ("OrderParts", "PartID"): lambda rng, row_id, row, context: (
+        spread(row["OrderID"], context["seed"], context["counts"]["Part"])
+        + (row_id - 1) // context["counts"]["Orders"]) % context["counts"]["Part"] + 1,
+    ("OrderParts", "QuantityUsed"): lambda rng, row_id, row, context: between(rng, 1, 5),
+    ("Part", "QuantityInStock"): lambda rng, row_id, row, context: between(rng, 0, 200),
+    ("Part", "UnitPrice"): lambda rng, row_id, row, context: between(rng, 10, 99999),
+    ("Part", "PartName"): pick(PART_NAMES),
+    ("Part", "Manufacturer"): lambda rng, row_id, row, context: f"{choose(rng, COMPANY_WORDS)} {choose(rng, COMPANY_KINDS)}",
+    ("Part", "PartNumber"): lambda rng, row_id, row, context: f"PN-{row_id:08d}",
+    ("Part", "PartStatus"): pick(PART_STATUSES),
+    ("Payment", "InvoiceID"): lambda rng, row_id, row, context: row_id,
+    ("Payment", "VendorID"): lambda rng, row_id, row, context: None,
+    ("Payment", "OrderID"): lambda rng, row_id, row, context: row_id,
+    ("Payment", "CustomerID"): lambda rng, row_id, row, context: order_customer(context, row_id),
+    ("Payment", "PaymentMethod"): pick(PAYMENT_METHODS),
+    ("Payment", "PaymentDateTime"): lambda rng, row_id, row, context: random_datetime(rng),
+    ("Payment", "TransactionID"): lambda rng, row_id, row, context: 100_000_000 + row_id,
+    ("Payment", "PaymentStatus"): pick(PAYMENT_STATUSES),
+    ("Payment", "Currency"): pick(CURRENCIES),
+    ("Employee", "EmployeeFirstName"): pick(FIRST_NAMES),
+    ("Employee", "EmployeeLastName"): pick(LAST_NAMES),
+    ("Employee", "Role"): pick(ROLES),
+    ("Employee", "Department"): pick(DEPARTMENTS),
+    ("Employee", "SupervisorID"): lambda rng, row_id, row, context: between(rng, 1, row_id - 1) if row_id > 1 else None,
+    ("Employee", "EmploymentStatus"): pick(EMPLOYMENT_STATUSES),
+    ("Employee", "Salary"): lambda rng, row_id, row, context: between(rng, 40, 249) * 1000,
+    ("MaintenanceRequest", "RequestType"): pick(REQUEST_TYPES),
+    ("MaintenanceRequest", "PriorityLevel"): pick(PRIORITIES),
+    ("MaintenanceRequest", "RequestStatus"): pick(REQUEST_STATUSES),
+    ("FinanceRequest", "RequestType"): pick(FINANCE_TYPES),
+    ("FinanceRequest", "ApprovalStatus"): pick(APPROVAL_STATUSES),
+    ("Invoice", "InvoiceDateTime"): lambda rng, row_id, row, context: random_datetime(rng),
+    ("Invoice", "Currency"): pick(CURRENCIES),
+    ("Invoice", "VendorID"): lambda rng, row_id, row, context: None,
+    ("Invoice", "CustomerID"): lambda rng, row_id, row, context: order_customer(context, row_id),
+    ("Invoice", "OrderID"): lambda rng, row_id, row, context: row_id,
+    ("Invoice", "PaymentID"): lambda rng, row_id, row, context: row_id,
+    ("Invoice", "InvoiceNumber"): lambda rng, row_id, row, context: 10_000_000 + row_id,
+    ("Vendor", "VendorName"): lambda rng, row_id, row, context: f"{choose(rng, COMPANY_WORDS)} {choose(rng, COMPANY_KINDS)}",
+    ("Vendor", "VendorContact"): lambda rng, row_id, row, context: f"{choose(rng, FIRST_NAMES)} {choose(rng, LAST_NAMES)}",
+    ("Vendor", "PhoneNumber"): lambda rng, row_id, row, context: f"555-{row_id % 10000:04d}",
+    ("Vendor", "Address"): lambda rng, row_id, row, context: f"{between(rng, 1, 999)} {choose(rng, STREETS)}",
+    ("Vendor", "VendorType"): pick(VENDOR_TYPES),
+    ("Vendor", "VendorStatus"): pick(VENDOR_STATUSES),
+    ("Vendor", "VendorRating"): lambda rng, row_id, row, context: between(rng, 1, 5),
+}
+
+# Column Generator Function
+# Picks the value generator for one column: an override, the row ID for the primary key, a random parent ID
+# for a foreign key, or a value made from the declared type
+def column_generator(table, name, column_type, is_primary_key, parent, single_key):
+    override = COLUMN_OVERRIDES.get((table, name))
+    if override:
+        return override
+    if is_primary_key and single_key:
+        return lambda rng, row_id, row, context: row_id
+    if parent:
+        return lambda rng, row_id, row, context: between(rng, 1, context["counts"][parent])
+    if "DATETIME" in name.upper():
+        return lambda rng, row_id, row, context: random_datetime(rng)
+    if column_type == "DATE":
+        return lambda rng, row_id, row, context: random_date(rng)
+    if column_type == "DECIMAL":
+        return lambda rng, row_id, row, context: between(rng, 100, 9_999_999) / 100
+    if column_type.startswith("INT"):
+        return lambda rng, row_id, row, context: between(rng, 0, 100)
+    length = re.search(r"\((\d+)\)", column_type)
+    limit = int(length.group(1)) if length else 35
+    return lambda rng, row_id, row, context: f"{name} {row_id}"[:limit]
+
+# Table Row Generator Function
+# Yields `count` rows for one table, in column order
+def generate_rows(table, definition, count, context):
+    rng = random.Random(f"{context['seed']}:{table}")
+    primary_key = [name for name, _, is_primary_key in definition["columns"] if is_primary_key]
+    generators = [(name, column_generator(table, name, column_type, is_primary_key,
+                                          definition["foreign_keys"].get(name), len(primary_key) == 1))
+                  for name, column_type, is_primary_key in definition["columns"]]
+    for row_id in range(1, count + 1):
+        row = {}
+        for name, generator in generators:
+            row[name] = generator(rng, row_id, row, context)
+        yield tuple(row.values())
+
+# Generate Database Function
+# Creates the tables from the DDL file and fills them. Returns {table: rows inserted} and the elapsed seconds.
+def generate_database(db_name, total_rows, seed=DEFAULT_SEED, ddl_path=DEFAULT_DDL, chunk_size=DEFAULT_CHUNK_SIZE,
+                      progress=None):
+    with open(ddl_path, encoding="utf-8") as file:
+        ddl = file.read()
+    start_time = time.perf_counter()
+    connection = sqlite3.connect(db_name)
+    connection.executescript(ddl)
+    tables = read_tables(connection)
+    counts = table_counts(tables, total_rows)
+    if "Orders" in counts:
+        for table in ["Invoice", "Payment"]:
+            if table in counts:
+                counts[table] = counts["Orders"]
+        if "Part" in counts and "OrderParts" in counts:
+            counts["OrderParts"] = min(counts["OrderParts"], counts["Orders"] * counts["Part"])
+    context = {"seed": seed, "counts": counts}
+
+    # Bulk load settings: no rollback journal or fsync, and a large page cache, for the one load transaction
+    connection.execute("PRAGMA journal_mode = OFF")
+    connection.execute("PRAGMA synchronous = OFF")
+    connection.execute("PRAGMA cache_size = -262144")
+    connection.execute("BEGIN")
+    for table, definition in tables.items():
+        placeholders = ", ".join(["?"] * len(definition["columns"]))
+        statement = f"INSERT INTO {table} VALUES ({placeholders})"
+        rows = generate_rows(table, definition, counts[table], context)
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                connection.executemany(statement, chunk)
+                chunk = []
+        if chunk:
+            connection.executemany(statement, chunk)
+        if progress:
+            progress(table, counts[table], time.perf_counter() - start_time)
+    connection.commit()
+
+    # Leave the database the way the application expects it
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("ANALYZE")
+    connection.commit()
+    connection.close()
+    return counts, time.perf_counter() - start_time
+
+# Check Database Function
+# Returns a list of problems: foreign keys pointing at missing rows, or orders whose invoice and payment disagree
+def check_database(db_name):
+    connection = sqlite3.connect(db_name)
+    problems = []
+    for table, rowid, parent, _ in connection.execute("PRAGMA foreign_key_check"):
+        problems.append(f"{table} row {rowid} references a missing {parent} row")
+        if len(problems) >= 20:
+            break
+    mismatched = connection.execute("""SELECT COUNT(*) FROM Orders AS o
+                                       JOIN Invoice AS i ON i.InvoiceID = o.InvoiceID
+                                       JOIN Payment AS p ON p.InvoiceID = i.InvoiceID
+                                       WHERE i.OrderID IS NOT o.OrderID OR p.OrderID IS NOT o.OrderID
+                                          OR i.CustomerID IS NOT o.CustomerID OR p.CustomerID IS NOT o.CustomerID
+                                          OR i.PaymentID IS NOT p.PaymentID""").fetchone()[0]
+    if mismatched:
+        problems.append(f"{mismatched} orders whose invoice or payment does not match")
+    connection.close()
+    return problems
+
+# Main function to generate a database from the command line
+def main():
+    parser = argparse.ArgumentParser(description="Generate a seeded AuroraVoyagersCompany database of any size.")
+    parser.add_argument("output", help="database file to create")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="total rows across all tables")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="random seed")
+    parser.add_argument("--ddl", default=DEFAULT_DDL, help="CREATE TABLE script to build the schema from")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per executemany call")
+    parser.add_argument("--check", action="store_true", help="check every foreign key after loading")
+    parser.add_argument("--force", action="store_true", help="replace the output file if it exists")
+    args = parser.parse_args()
+
+    if args.rows < 1 or args.chunk_size < 1:
+        print("Rows and chunk size must be at least 1.")
+        sys.exit(1)
+    if not os.path.exists(args.ddl):
+        print(f"DDL file not found: {args.ddl}")
+        sys.exit(1)
+    if os.path.exists(args.output):
+        if not args.force:
+            print(f"{args.output} already exists. Use --force to replace it.")
+            sys.exit(1)
+        for suffix in ["", "-wal", "-shm"]:
+            if os.path.exists(args.output + suffix):
+                os.remove(args.output + suffix)
+
+    def progress(table, count, elapsed):
+        print(f"{table:<20} {count:>12,} rows  ({elapsed:7.2f} s)", flush=True)
+
+    counts, elapsed = generate_database(args.output, args.rows, args.seed, args.ddl, args.chunk_size, progress)
+    total = sum(counts.values())
+    print(f"\nGenerated {total:,} rows in {elapsed:.2f} seconds ({total / elapsed:,.0f} rows/sec) into {args.output}")
+
+    if args.check:
+        problems = check_database(args.output)
+        if problems:
+            print("FAILED:")
+            for problem in problems:
+                print(" ", problem)
+            sys.exit(1)
+        print("OK: every foreign key points at an existing row and orders match their invoices and payments.")
+
+# Run the main function
+if __name__ == '__main__':
+    main()
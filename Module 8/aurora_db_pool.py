@@ -0,0 +1,191 @@
+"""
+Program name: aurora_db_pool.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Long-lived connection pool for the Aurora Voyagers Company application.
+Connections are opened once, configured with the PRAGMA settings below, health checked on checkout
+and handed back to the pool instead of being closed after every menu option.
+"""
+
+# Import necessary libraries
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Default database path and pool settings
+# Note: Ensure the database file path is correct, as I had to change the path to run it on my machine.
+DEFAULT_DB_NAME = 'Module 8/AuroraVoyagersCompany.db'
+DEFAULT_POOL_SIZE = 4
+DEFAULT_CHECKOUT_TIMEOUT = 5.0
+
+# PRAGMA settings applied to every new connection
+# cache_size is negative so it is read as KiB (here 16 MiB), mmap_size is in bytes (here 64 MiB)
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -16384,
+    "mmap_size": 67108864,
+    "busy_timeout": 5000,
+}
+
+
+# Connection Pool Class
+# Keeps up to `size` open connections. Idle connections are stored in a LIFO queue so the most
+# recently used connection (the one with the warmest page cache) is handed out first.
+class ConnectionPool:
+    def __init__(self, db_name=DEFAULT_DB_NAME, size=DEFAULT_POOL_SIZE, pragmas=None,
+                 timeout=DEFAULT_CHECKOUT_TIMEOUT, health_check=True, factory=sqlite3.Connection):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.db_name = db_name
+        self.size = size
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.timeout = timeout
+        self.health_check = health_check
+        self.factory = factory
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._closed = False
+        self.stats = {
+            "connections_opened": 0,
+            "connections_discarded": 0,
+            "checkouts": 0,
+            "reuses": 0,
+            "waits": 0,
+            "health_check_failures": 0,
+        }
+
+    # Open and configure a brand new connection
+    # check_same_thread is off because a connection may be checked out by different threads over its life,
+    # but the pool still guarantees only one thread uses it at a time.
+    def _open_connection(self):
+        connection = sqlite3.connect(self.db_name, check_same_thread=False, factory=self.factory)
+        for name, value in self.pragmas.items():
+            connection.execute(f"PRAGMA {name} = {value};")
+        return connection
+
+    # Check that a pooled connection is still usable
+    def _is_healthy(self, connection):
+        try:
+            connection.execute("SELECT 1;").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    # Throw away a connection that failed a health check and free its slot
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._opened -= 1
+            self.stats["connections_discarded"] += 1
+
+    # Take a connection out of the pool, opening a new one if the pool is not full yet
+    # Blocks for up to `timeout` seconds when every connection is already checked out.
+    def acquire(self):
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed.")
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+                reused = True
+            except queue.Empty:
+                connection = None
+                with self._lock:
+                    if self._opened < self.size:
+                        self._opened += 1
+                        reused = False
+                    else:
+                        reused = None
+                if reused is False:
+                    try:
+                        connection = self._open_connection()
+                    except sqlite3.Error:
+                        with self._lock:
+                            self._opened -= 1
+                        raise
+                    with self._lock:
+                        self.stats["connections_opened"] += 1
+                else:
+                    with self._lock:
+                        self.stats["waits"] += 1
+                    try:
+                        connection = self._idle.get(timeout=self.timeout)
+                    except queue.Empty:
+                        raise TimeoutError(f"No database connection available after {self.timeout} seconds.")
+                    reused = True
+
+            if reused and self.health_check and not self._is_healthy(connection):
+                with self._lock:
+                    self.stats["health_check_failures"] += 1
+                self._discard(connection)
+                continue
+
+            with self._lock:
+                self.stats["checkouts"] += 1
+                if reused:
+                    self.stats["reuses"] += 1
+            return connection
+
+    # Give a connection back to the pool
+    # Any transaction left open by the caller is rolled back so the next user starts clean.
+    def release(self, connection):
+        if connection is None:
+            return
+        if self._closed:
+            connection.close()
+            return
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+        except sqlite3.Error:
+            self._discard(connection)
+            return
+        self._idle.put_nowait(connection)
+
+    # Context manager for borrowing a connection
+    @contextmanager
+    def connection(self):
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    # Close every idle connection and stop handing out new ones
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            connection.close()
+            with self._lock:
+                self._opened -= 1
+
+    # Report the pool counters
+    def report(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["open_connections"] = self._opened
+            stats["idle_connections"] = self._idle.qsize()
+        return stats
+
+
+# Create Pool Helper Function
+# Prints an error and returns None on failure, matching connect_db() in the application.
+def create_pool(db_name=DEFAULT_DB_NAME, size=DEFAULT_POOL_SIZE, **options):
+    try:
+        pool = ConnectionPool(db_name, size, **options)
+        # Open the first connection up front so a bad path or locked file is reported at startup
+        pool.release(pool.acquire())
+        return pool
+    except (sqlite3.Error, TimeoutError) as e:
+        print("Failed to connect to database:", e)
+        print("Exiting program. \n")
+        return None
@@ -0,0 +1,237 @@
+"""
+Program name: aurora_load_generator.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Load generator for the Aurora Voyagers server (aurora_server.py).
+Simulates showroom terminals: each client keeps one request in flight and sends a mix of spaceship listings,
+customer and spaceship lookups, customer updates, registrations and orders for a fixed time. It reports
+throughput and tail latency (p50/p95/p99) for each number of concurrent clients, plus how many requests the
+server answered with "busy".
+By default a server is started on a temporary copy of the database (with every ship given plenty of stock so
+orders keep succeeding). Use --host/--port to load an already running server instead.
+
+    python "Module 8/aurora_load_generator.py" --clients 1 8 64 --duration 5
+    python "Module 8/aurora_load_generator.py" --port 8765
+"""
+
+# Import necessary libraries
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+from aurora_server import BUSY_ERROR, DEFAULT_HOST, DEFAULT_MAX_PENDING, DEFAULT_WORKERS
+
+# The read-only connection helper lives in the Shared folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Shared"))
+from sqlite_readonly import readonly_uri
+
+# Note: Ensure the database file path is correct, as I had to change the path to run it on my machine.
+DEFAULT_DB_NAME = 'Module 8/AuroraVoyagersCompany.db'
+
+# Benchmark settings
+DEFAULT_CLIENTS = [1, 8, 64]
+DEFAULT_DURATION = 5.0
+SERVER_START_TIMEOUT = 10.0
+SEED = 210
+
+# Share of each operation in the request mix (reads dominate, like a showroom floor)
+OPERATION_MIX = [
+    ("list_spaceships", 40),
+    ("get_spaceship", 20),
+    ("get_customer", 20),
+    ("update_customer", 8),
+    ("order", 8),
+    ("register_customer", 4),
+]
+
+# Stock given to every ship in the temporary copy
+BENCHMARK_STOCK = 1_000_000
+
+
+# Percentile Helper Function
+# Nearest-rank percentile of an already sorted list
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+# Free Port Helper Function
+def free_port(host):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind((host, 0))
+        return probe.getsockname()[1]
+
+# Prepare Database Helper Function
+# Copies the database into `work_dir` and restocks every ship; returns (copy path, customer IDs, spaceship IDs)
+def prepare_database(db_name, work_dir):
+    copy_path = os.path.join(work_dir, "load.db")
+    shutil.copyfile(db_name, copy_path)
+    for suffix in ["-wal", "-shm"]:
+        if os.path.exists(db_name + suffix):
+            shutil.copyfile(db_name + suffix, copy_path + suffix)
+    connection = sqlite3.connect(copy_path)
+    connection.execute("UPDATE Spaceship SET Available = ?", (BENCHMARK_STOCK,))
+    connection.commit()
+    connection.close()
+    return copy_path
+
+# Read IDs Helper Function
+# Reads the customer and spaceship IDs the clients pick from
+def read_ids(db_name):
+    # immutable=False: a running server may be writing to the database
+    connection = sqlite3.connect(readonly_uri(db_name, immutable=False), uri=True)
+    customer_ids = [row[0] for row in connection.execute("SELECT CustomerID FROM Customer")]
+    spaceship_ids = [row[0] for row in connection.execute("SELECT SpaceshipID FROM Spaceship")]
+    connection.close()
+    return customer_ids, spaceship_ids
+
+# Start Server Helper Function
+# Runs aurora_server.py in its own process (so the clients do not share its interpreter) and waits for it to listen
+def start_server(db_name, host, port, workers, max_pending):
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "aurora_server.py")
+    process = subprocess.Popen([sys.executable, script, "--db", db_name, "--host", host, "--port", str(port),
+                                "--workers", str(workers), "--max-pending", str(max_pending)],
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Server exited during startup:\n" + process.stdout.read())
+        try:
+            socket.create_connection((host, port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Server did not start listening in time.")
+
+# Build Request Helper Function
+# Returns a random request from the operation mix
+def build_request(rng, customer_ids, spaceship_ids, terminal):
+    op = rng.choices([name for name, _ in OPERATION_MIX], weights=[weight for _, weight in OPERATION_MIX])[0]
+    if op == "list_spaceships":
+        return {"op": op, "limit": 10}
+    if op == "get_spaceship":
+        return {"op": op, "spaceship_id": rng.choice(spaceship_ids)}
+    if op == "get_customer":
+        return {"op": op, "customer_id": rng.choice(customer_ids)}
+    if op == "update_customer":
+        return {"op": op, "customer_id": rng.choice(customer_ids), "column": "PhoneNumber",
+                "value": f"555-{rng.randrange(10000):04d}"}
+    if op == "order":
+        return {"op": op, "customer_id": rng.choice(customer_ids), "spaceship_id": rng.choice(spaceship_ids),
+                "destination": "Load Test Bay"}
+    return {"op": op, "customer": {"CustomerFirstName": "Load", "CustomerLastName": f"Terminal {terminal}",
+                                   "IdentityVerified": "No"}}
+
+# Client Coroutine
+# Sends requests one at a time until `deadline`, recording the latency of each successful request
+async def run_client(host, port, terminal, deadline, customer_ids, spaceship_ids, latencies, counts):
+    rng = random.Random(SEED + terminal)
+    reader, writer = await asyncio.open_connection(host, port)
+    request_id = 0
+    try:
+        while time.perf_counter() < deadline:
+            request_id += 1
+            request = build_request(rng, customer_ids, spaceship_ids, terminal)
+            request["id"] = request_id
+            start_time = time.perf_counter()
+            writer.write(json.dumps(request).encode("utf-8") + b"\n")
+            await writer.drain()
+            line = await reader.readline()
+            if not line:
+                counts["errors"] += 1
+                break
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            response = json.loads(line)
+            if response.get("ok"):
+                latencies.append(elapsed_ms)
+            elif response.get("error") == BUSY_ERROR:
+                counts["busy"] += 1
+                await asyncio.sleep(0.001)
+            else:
+                counts["errors"] += 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+# Load Level Function
+# Runs `clients` concurrent clients for `duration` seconds and returns the measurements
+async def run_level(host, port, clients, duration, customer_ids, spaceship_ids):
+    latencies = []
+    counts = {"busy": 0, "errors": 0}
+    start_time = time.perf_counter()
+    deadline = start_time + duration
+    await asyncio.gather(*[run_client(host, port, terminal, deadline, customer_ids, spaceship_ids, latencies, counts)
+                           for terminal in range(clients)])
+    elapsed = time.perf_counter() - start_time
+    latencies.sort()
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "per_second": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "max": latencies[-1] if latencies else 0.0,
+        "busy": counts["busy"],
+        "errors": counts["errors"],
+    }
+
+# Main function to run the load test
+def main():
+    parser = argparse.ArgumentParser(description="Measure Aurora server throughput and tail latency.")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help="database to copy for the test server")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="server address")
+    parser.add_argument("--port", type=int, help="port of a running server (default: start one on a copy)")
+    parser.add_argument("--clients", type=int, nargs="+", default=DEFAULT_CLIENTS, help="concurrent clients per run")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="seconds per run")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="worker threads of the test server")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING, help="max pending of the test server")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Database file not found: {args.db}")
+        sys.exit(1)
+    if min(args.clients) < 1 or args.duration <= 0:
+        print("Clients must be at least 1 and the duration must be positive.")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        process = None
+        port = args.port
+        if port is None:
+            db_name = prepare_database(args.db, work_dir)
+            port = free_port(args.host)
+            process = start_server(db_name, args.host, port, args.workers, args.max_pending)
+        else:
+            db_name = args.db
+        customer_ids, spaceship_ids = read_ids(db_name)
+
+        try:
+            print(f"{'Clients':>7} {'Requests':>9} {'Req/sec':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+                  f"{'Max ms':>8} {'Busy':>6} {'Errors':>6}")
+            for clients in args.clients:
+                result = asyncio.run(run_level(args.host, port, clients, args.duration, customer_ids, spaceship_ids))
+                print(f"{result['clients']:>7} {result['requests']:>9} {result['per_second']:>9,.0f} "
+                      f"{result['p50']:>8.2f} {result['p95']:>8.2f} {result['p99']:>8.2f} {result['max']:>8.2f} "
+                      f"{result['busy']:>6} {result['errors']:>6}")
+        finally:
+            if process:
+                process.terminate()
+                process.wait()
+
+    print("\nLatency is measured from sending a request to reading its response, for successful requests only.")
+    print("Busy counts requests the server shed because its queue was full; those clients retried after 1 ms.")
+
+# Run the main function
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,432 @@
+"""
+Program name: aurora_revenue.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Revenue rollup tables for the Aurora Voyagers Company database.
+Each rollup holds the number of rows and the revenue (in whole cents, so adding and taking away amounts is exact)
+for every day ("day", period YYYY-MM-DD) and every month ("month", period YYYY-MM):
+    revenue_total           all orders (Orders.OrderTotal)
+    revenue_customer        orders per customer
+    revenue_model           orders per spaceship make and model
+    revenue_payment_status  payments per payment status (Payment.PaymentAmount)
+Triggers on Orders and Payment add a new row's amount and take away the old one when an amount, date, customer,
+spaceship or status changes, so the reports read a few rollup rows instead of aggregating every order. Triggers
+on Spaceship move a ship's orders when it is renamed to another make or model, deleted, added (orders that
+already pointed at its ID) or given a new SpaceshipID. Rows without a usable
+date are left out; a missing customer counts as customer 0 and a missing make, model or status as "(none)".
+
+    python "Module 8/aurora_revenue.py" --verify
+    python "Module 8/aurora_revenue.py" --rebuild
+    python "Module 8/aurora_revenue.py" --benchmark --scales 10000 100000 1000000
+"""
+
+# Import necessary libraries
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+from aurora_data_generator import DEFAULT_DDL, DEFAULT_SEED, generate_database
+from order_engine import place_order
+
+# Note: Ensure the database file path is correct, as I had to change the path to run it on my machine.
+DEFAULT_DB_NAME = 'Module 8/AuroraVoyagersCompany.db'
+
+# Benchmark settings: total generated rows per run (about 15% of them are orders)
+DEFAULT_SCALES = [10_000, 100_000, 1_000_000]
+DEFAULT_SAMPLES = 50
+TOP_ROWS = 10
+
+# Period of each grain, computed from a date column
+GRAINS = {
+    "day": "date({})",
+    "month": "strftime('%Y-%m', {})",
+}
+
+# Rollups: name -> (count column, source table, date column, amount column, [(key column, type, expression)])
+# In the key expressions {row} is the source row: NEW or OLD in a trigger, the table itself when rebuilding.
+ROLLUPS = {
+    "revenue_total": ("orders", "Orders", "OrderDateTime", "OrderTotal", []),
+    "revenue_customer": ("orders", "Orders", "OrderDateTime", "OrderTotal", [
+        ("CustomerID", "INTEGER", "IFNULL({row}.CustomerID, 0)"),
+    ]),
+    "revenue_model": ("orders", "Orders", "OrderDateTime", "OrderTotal", [
+        ("Make", "TEXT", "IFNULL((SELECT Make FROM Spaceship WHERE SpaceshipID = {row}.SpaceshipID), '(none)')"),
+        ("Model", "TEXT", "IFNULL((SELECT Model FROM Spaceship WHERE SpaceshipID = {row}.SpaceshipID), '(none)')"),
+    ]),
+    "revenue_payment_status": ("payments", "Payment", "PaymentDateTime", "PaymentAmount", [
+        ("PaymentStatus", "TEXT", "IFNULL({row}.PaymentStatus, '(none)')"),
+    ]),
+}
+
+# Source columns whose change moves a row to another rollup row
+TRIGGER_COLUMNS = {
+    "Orders": ["OrderDateTime", "OrderTotal", "CustomerID", "SpaceshipID"],
+    "Payment": ["PaymentDateTime", "PaymentAmount", "PaymentStatus"],
+}
+
+
+# SQL Helper Functions
+# Build the statements of every rollup from the ROLLUPS definitions
+def cents(expression):
+    return f"CAST(ROUND(IFNULL({expression}, 0) * 100) AS INTEGER)"
+
+def key_columns(name):
+    return [column for column, _, _ in ROLLUPS[name][4]]
+
+def key_expressions(name, row):
+    return [expression.format(row=row) for _, _, expression in ROLLUPS[name][4]]
+
+def rollup_table(name):
+    count_column = ROLLUPS[name][0]
+    keys = "".join(f"{column} {column_type} NOT NULL, " for column, column_type, _ in ROLLUPS[name][4])
+    primary_key = ", ".join(["grain", "period"] + key_columns(name))
+    return f"""CREATE TABLE {name} (
+        grain TEXT NOT NULL, period TEXT NOT NULL, {keys}{count_column} INTEGER NOT NULL,
+        revenue_cents INTEGER NOT NULL,
+        PRIMARY KEY ({primary_key})
+    ) WITHOUT ROWID;"""
+
+# The rollup rows computed from the source table, for the rebuild and the verify
+def rollup_query(name):
+    count_column, source, date_column, amount_column, _ = ROLLUPS[name]
+    keys = key_columns(name)
+    expressions = key_expressions(name, source)
+    selects = [f"SELECT '{grain}' AS grain, {period.format(f'{source}.{date_column}')} AS period, "
+               + "".join(f"{expression} AS {column}, " for column, expression in zip(keys, expressions))
+               + f"{cents(f'{source}.{amount_column}')} AS cents FROM {source}"
+               for grain, period in GRAINS.items()]
+    group = ", ".join(["grain", "period"] + keys)
+    return (f"SELECT {group}, COUNT(*) AS {count_column}, SUM(cents) AS revenue_cents "
+            f"FROM ({' UNION ALL '.join(selects)}) WHERE period IS NOT NULL GROUP BY {group}")
+
+# Trigger statement that adds (sign 1) or takes away (sign -1) one source row's amount in every grain
+def apply_row(name, row, sign):
+    count_column, _, date_column, amount_column, _ = ROLLUPS[name]
+    columns = ", ".join(["grain", "period"] + key_columns(name) + [count_column, "revenue_cents"])
+    periods = " UNION ALL ".join(f"SELECT '{grain}' AS grain, {period.format(f'{row}.{date_column}')} AS period"
+                                 for grain, period in GRAINS.items())
+    values = ", ".join(["grain", "period"] + key_expressions(name, row)
+                       + [str(sign), f"{sign} * {cents(f'{row}.{amount_column}')}"])
+    conflict = ", ".join(["grain", "period"] + key_columns(name))
+    return f"""INSERT INTO {name} ({columns})
+        SELECT {values} FROM ({periods}) WHERE period IS NOT NULL
+        ON CONFLICT ({conflict}) DO UPDATE SET {count_column} = {count_column} + excluded.{count_column},
+            revenue_cents = revenue_cents + excluded.revenue_cents;"""
+
+# Trigger statement that drops the rollup rows an old source row left empty
+def drop_empty(name, row):
+    count_column, _, date_column, _, _ = ROLLUPS[name]
+    periods = " OR ".join(f"(grain = '{grain}' AND period = {period.format(f'{row}.{date_column}')})"
+                          for grain, period in GRAINS.items())
+    keys = "".join(f" AND {column} = {expression}"
+                   for column, expression in zip(key_columns(name), key_expressions(name, row)))
+    return f"DELETE FROM {name} WHERE {count_column} = 0 AND ({periods}){keys};"
+
+# Insert, update and delete triggers of one source table
+def source_triggers(source):
+    names = [name for name, definition in ROLLUPS.items() if definition[1] == source]
+    add_new = "\n        ".join(apply_row(name, "new", 1) for name in names)
+    remove_old = "\n        ".join(apply_row(name, "old", -1) for name in names)
+    drop_old = "\n        ".join(drop_empty(name, "old") for name in names)
+    prefix = source.lower()
+    return [
+        f"""CREATE TRIGGER revenue_{prefix}_insert AFTER INSERT ON {source}
+        BEGIN
+        {add_new}
+        END;""",
+        f"""CREATE TRIGGER revenue_{prefix}_update AFTER UPDATE OF {', '.join(TRIGGER_COLUMNS[source])} ON {source}
+        BEGIN
+        {remove_old}
+        {add_new}
+        {drop_old}
+        END;""",
+        f"""CREATE TRIGGER revenue_{prefix}_delete AFTER DELETE ON {source}
+        BEGIN
+        {remove_old}
+        {drop_old}
+        END;""",
+    ]
+
+# Spaceship Trigger Helper Functions
+# Add (sign 1) or take away (sign -1) the orders of one SpaceshipID under a make and model (SQL expressions);
+# `condition`, if given, limits the statement to the cases where it applies
+def model_delta(spaceship_id, make, model, sign, condition=None):
+    where = f"SpaceshipID = {spaceship_id}" + (f" AND {condition}" if condition else "")
+    selects = [f"SELECT '{grain}' AS grain, {period.format('OrderDateTime')} AS period, "
+               f"{cents('OrderTotal')} AS cents FROM Orders WHERE {where}"
+               for grain, period in GRAINS.items()]
+    return f"""INSERT INTO revenue_model (grain, period, Make, Model, orders, revenue_cents)
+        SELECT grain, period, {make}, {model}, {sign} * COUNT(*), {sign} * SUM(cents)
+        FROM ({' UNION ALL '.join(selects)}) WHERE period IS NOT NULL GROUP BY grain, period
+        ON CONFLICT (grain, period, Make, Model) DO UPDATE SET orders = orders + excluded.orders,
+            revenue_cents = revenue_cents + excluded.revenue_cents;"""
+
+def drop_empty_model(make, model):
+    return f"DELETE FROM revenue_model WHERE orders = 0 AND Make = {make} AND Model = {model};"
+
+# Moves the orders of one SpaceshipID from one make and model to another
+def move_orders(spaceship_id, from_label, to_label, condition=None):
+    return [model_delta(spaceship_id, *from_label, -1, condition), model_delta(spaceship_id, *to_label, 1, condition)]
+
+# Triggers that keep revenue_model right when a spaceship is added, removed, renamed or given a new SpaceshipID.
+# The update trigger runs BEFORE the update: an ON UPDATE CASCADE onto Orders runs after the Spaceship row has
+# changed, and the Orders update trigger then moves each re-pointed order from "(none)" (the old ID no longer
+# exists) to the new make and model. So the old ID's orders are moved to "(none)" here, and the orders that
+# already pointed at the new ID (orphans until now) to the new make and model; with or without the cascade
+# every order ends up under the make and model it now belongs to.
+def spaceship_triggers():
+    none = ("'(none)'", "'(none)'")
+    old = ("IFNULL(old.Make, '(none)')", "IFNULL(old.Model, '(none)')")
+    new = ("IFNULL(new.Make, '(none)')", "IFNULL(new.Model, '(none)')")
+    same_id = "new.SpaceshipID IS old.SpaceshipID"
+    old_orders_to = (f"CASE WHEN {same_id} THEN {new[0]} ELSE '(none)' END",
+                     f"CASE WHEN {same_id} THEN {new[1]} ELSE '(none)' END")
+    update = (move_orders("old.SpaceshipID", old, old_orders_to)
+              + move_orders("new.SpaceshipID", none, new, "new.SpaceshipID IS NOT old.SpaceshipID")
+              + [drop_empty_model(*old), drop_empty_model(*none)])
+    insert = move_orders("new.SpaceshipID", none, new) + [drop_empty_model(*none)]
+    delete = move_orders("old.SpaceshipID", old, none) + [drop_empty_model(*old)]
+    update, insert, delete = ("\n        ".join(statements) for statements in [update, insert, delete])
+    return [
+        f"""CREATE TRIGGER revenue_spaceship_update BEFORE UPDATE OF SpaceshipID, Make, Model ON Spaceship
+        WHEN old.SpaceshipID IS NOT new.SpaceshipID OR old.Make IS NOT new.Make OR old.Model IS NOT new.Model
+        BEGIN
+        {update}
+        END;""",
+        f"""CREATE TRIGGER revenue_spaceship_insert AFTER INSERT ON Spaceship
+        BEGIN
+        {insert}
+        END;""",
+        f"""CREATE TRIGGER revenue_spaceship_delete AFTER DELETE ON Spaceship
+        BEGIN
+        {delete}
+        END;""",
+    ]
+
+# Statements that create the rollup tables, the index the spaceship triggers use and every trigger
+REVENUE_SCHEMA = ([rollup_table(name) for name in ROLLUPS]
+                  + ["CREATE INDEX IF NOT EXISTS idx_orders_spaceship ON Orders(SpaceshipID);"]
+                  + source_triggers("Orders") + source_triggers("Payment") + spaceship_triggers())
+
+
+# Reports: name -> (rollup query, the same report aggregated from the source tables)
+# A "month" parameter is YYYY-MM; the source queries are kept for the benchmark and to check the rollups
+REPORTS = {
+    "monthly_revenue": (
+        "SELECT period, orders, revenue_cents FROM revenue_total WHERE grain = 'month' ORDER BY period",
+        f"""SELECT strftime('%Y-%m', OrderDateTime) AS period, COUNT(*), SUM({cents('OrderTotal')})
+            FROM Orders WHERE period IS NOT NULL GROUP BY period ORDER BY period"""),
+    "daily_revenue": (
+        """SELECT period, orders, revenue_cents FROM revenue_total
+           WHERE grain = 'day' AND period BETWEEN :month || '-01' AND :month || '-31' ORDER BY period""",
+        f"""SELECT date(OrderDateTime) AS period, COUNT(*), SUM({cents('OrderTotal')})
+            FROM Orders WHERE strftime('%Y-%m', OrderDateTime) = :month GROUP BY period ORDER BY period"""),
+    "top_customers": (
+        f"""SELECT r.CustomerID, c.CustomerFirstName, c.CustomerLastName, r.orders, r.revenue_cents
+            FROM revenue_customer AS r LEFT JOIN Customer AS c ON c.CustomerID = r.CustomerID
+            WHERE r.grain = 'month' AND r.period = :month
+            ORDER BY r.revenue_cents DESC, r.CustomerID LIMIT {TOP_ROWS}""",
+        f"""SELECT o.CustomerID, c.CustomerFirstName, c.CustomerLastName, COUNT(*), SUM({cents('o.OrderTotal')})
+            FROM Orders AS o LEFT JOIN Customer AS c ON c.CustomerID = o.CustomerID
+            WHERE strftime('%Y-%m', o.OrderDateTime) = :month
+            GROUP BY o.CustomerID ORDER BY 5 DESC, o.CustomerID LIMIT {TOP_ROWS}"""),
+    "models": (
+        """SELECT Make, Model, orders, revenue_cents FROM revenue_model
+           WHERE grain = 'month' AND period = :month ORDER BY revenue_cents DESC, Make, Model""",
+        f"""SELECT IFNULL(s.Make, '(none)') AS Make, IFNULL(s.Model, '(none)') AS Model, COUNT(*),
+                   SUM({cents('o.OrderTotal')}) AS revenue_cents
+            FROM Orders AS o LEFT JOIN Spaceship AS s ON s.SpaceshipID = o.SpaceshipID
+            WHERE strftime('%Y-%m', o.OrderDateTime) = :month
+            GROUP BY 1, 2 ORDER BY revenue_cents DESC, Make, Model"""),
+    "payment_status": (
+        """SELECT PaymentStatus, payments, revenue_cents FROM revenue_payment_status
+           WHERE grain = 'month' AND period = :month ORDER BY PaymentStatus""",
+        f"""SELECT IFNULL(PaymentStatus, '(none)') AS status, COUNT(*), SUM({cents('PaymentAmount')})
+            FROM Payment WHERE strftime('%Y-%m', PaymentDateTime) = :month GROUP BY status ORDER BY status"""),
+}
+
+
+# Function to create the rollup tables and their triggers if they do not exist yet
+# A database whose rollups only have the older rename trigger gets the spaceship triggers and a rebuild.
+def create_revenue_rollups(connection):
+    exists = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'revenue_total'").fetchone()
+    if exists:
+        current = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'revenue_spaceship_delete'").fetchone()
+        if not current:
+            upgrade_spaceship_triggers(connection)
+        return
+    if connection.in_transaction:
+        connection.commit()
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        for statement in REVENUE_SCHEMA:
+            connection.execute(statement)
+        for name in ROLLUPS:
+            connection.execute(f"INSERT INTO {name} {rollup_query(name)}")
+        connection.commit()
+    except sqlite3.Error:
+        connection.rollback()
+        raise
+
+# Function to replace the older rename-only spaceship trigger and recompute the rollups it may have missed
+def upgrade_spaceship_triggers(connection):
+    if connection.in_transaction:
+        connection.commit()
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        connection.execute("DROP TRIGGER IF EXISTS revenue_spaceship_rename")
+        for statement in spaceship_triggers():
+            connection.execute(statement)
+        for name in ROLLUPS:
+            connection.execute(f"DELETE FROM {name}")
+            connection.execute(f"INSERT INTO {name} {rollup_query(name)}")
+        connection.commit()
+    except sqlite3.Error:
+        connection.rollback()
+        raise
+
+# Function to recompute every rollup from Orders and Payment
+def rebuild_revenue_rollups(connection):
+    create_revenue_rollups(connection)
+    if connection.in_transaction:
+        connection.commit()
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        for name in ROLLUPS:
+            connection.execute(f"DELETE FROM {name}")
+            connection.execute(f"INSERT INTO {name} {rollup_query(name)}")
+        connection.commit()
+    except sqlite3.Error:
+        connection.rollback()
+        raise
+
+# Function to compare the rollups with a fresh computation
+# Returns a list of (rollup, key, stored (count, cents), actual (count, cents)) for every row that differs
+def verify_revenue_rollups(connection):
+    mismatches = []
+    for name in ROLLUPS:
+        columns = ", ".join(["grain", "period"] + key_columns(name) + [ROLLUPS[name][0], "revenue_cents"])
+        stored = {row[:-2]: row[-2:] for row in connection.execute(f"SELECT {columns} FROM {name}")}
+        actual = {row[:-2]: row[-2:] for row in connection.execute(rollup_query(name))}
+        for key in sorted(set(stored) | set(actual)):
+            if stored.get(key) != actual.get(key):
+                mismatches.append((name, key, stored.get(key), actual.get(key)))
+    return mismatches
+
+# Report Function
+# Runs one report from the rollups (or, with from_source=True, from Orders and Payment) and returns the rows
+def run_report(cursor, report, month=None, from_source=False):
+    return cursor.execute(REPORTS[report][1 if from_source else 0], {"month": month}).fetchall()
+
+
+# Timing Helper Function
+# Median ms of work(sample) over the samples, after one untimed call
+def median_ms(work, samples):
+    work(samples[0])
+    timings = []
+    for sample in samples:
+        start_time = time.perf_counter_ns()
+        work(sample)
+        timings.append((time.perf_counter_ns() - start_time) / 1_000_000)
+    return statistics.median(timings)
+
+# Order Benchmark Helper Function
+# Median ms of placing an order (one committed transaction each) for random customers and ships
+def time_orders(connection, rng, samples):
+    customer_count = connection.execute("SELECT MAX(CustomerID) FROM Customer").fetchone()[0]
+    ship_count = connection.execute("SELECT MAX(SpaceshipID) FROM Spaceship").fetchone()[0]
+    pairs = [(rng.randint(1, customer_count), rng.randint(1, ship_count)) for _ in range(samples + 1)]
+    # Two units per sample, since median_ms() also runs the first sample untimed
+    connection.executemany("UPDATE Spaceship SET Available = Available + 2 WHERE SpaceshipID = ?",
+                           [(ship_id,) for _, ship_id in pairs])
+    connection.commit()
+    return median_ms(lambda pair: place_order(connection, pair[0], pair[1], "Revenue Test"), pairs)
+
+# Benchmark Function
+# Generates a database of each size and times every report from the source tables and from the rollups,
+# building the rollups and placing an order with and without the triggers
+def run_benchmark(scales, seed, ddl_path, samples):
+    results = {}
+    order_counts = []
+    for total_rows in scales:
+        with tempfile.TemporaryDirectory() as work_dir:
+            db_name = os.path.join(work_dir, "revenue.db")
+            counts, _ = generate_database(db_name, total_rows, seed, ddl_path)
+            order_counts.append(counts["Orders"])
+            connection = sqlite3.connect(db_name)
+            rng = random.Random(seed)
+            months = [row[0] for row in connection.execute(
+                "SELECT DISTINCT strftime('%Y-%m', OrderDateTime) FROM Orders WHERE OrderDateTime IS NOT NULL")]
+            month_samples = [rng.choice(months) for _ in range(samples)] if months else ["2024-01"] * samples
+            measurements = {"Place order, no triggers": time_orders(connection, rng, samples)}
+
+            start_time = time.perf_counter()
+            create_revenue_rollups(connection)
+            measurements["Build rollups (once)"] = (time.perf_counter() - start_time) * 1000
+            measurements["Place order, with triggers"] = time_orders(connection, rng, samples)
+
+            cursor = connection.cursor()
+            for report in REPORTS:
+                for from_source in [True, False]:
+                    label = f"{report}, {'source tables' if from_source else 'rollup'}"
+                    measurements[label] = median_ms(lambda month: run_report(cursor, report, month, from_source),
+                                                    month_samples)
+            if verify_revenue_rollups(connection):
+                print(f"Rollups do not match the source tables at {total_rows:,} rows.")
+            connection.close()
+        for label, value in measurements.items():
+            results.setdefault(label, []).append(value)
+    return order_counts, results
+
+# Main function to rebuild, verify or benchmark the rollups
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the Aurora revenue rollup tables.")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help="database file")
+    parser.add_argument("--rebuild", action="store_true", help="recompute every rollup")
+    parser.add_argument("--verify", action="store_true", help="compare the rollups with a fresh computation")
+    parser.add_argument("--benchmark", action="store_true", help="time the reports on generated databases")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="total rows per database")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="timed runs per measurement")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="generator seed")
+    parser.add_argument("--ddl", default=DEFAULT_DDL, help="CREATE TABLE script for the generator")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        order_counts, results = run_benchmark(args.scales, args.seed, args.ddl, max(1, args.samples))
+        print("=== Median ms by number of orders ===")
+        print(f"{'Measurement':<34}" + "".join(f"{count:>12,}" for count in order_counts))
+        for label, values in results.items():
+            print(f"{label:<34}" + "".join(f"{value:>12.3f}" for value in values))
+        return
+
+    if not os.path.exists(args.db):
+        print(f"Database file not found: {args.db}")
+        sys.exit(1)
+
+    connection = sqlite3.connect(args.db)
+    if args.rebuild:
+        rebuild_revenue_rollups(connection)
+        print("Revenue rollups rebuilt.")
+    else:
+        create_revenue_rollups(connection)
+    if args.verify or not args.rebuild:
+        mismatches = verify_revenue_rollups(connection)
+        if mismatches:
+            print(f"{len(mismatches)} row(s) differ (rollup, key, stored count/cents, actual count/cents):")
+            for mismatch in mismatches[:20]:
+                print(f"  {mismatch}")
+            print("Run with --rebuild to fix them.")
+        else:
+            print("Revenue rollups match Orders and Payment.")
+    connection.close()
+
+# Run the main function
+if __name__ == '__main__':
+    main()
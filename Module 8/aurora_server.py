@@ -0,0 +1,361 @@
+"""
+Program name: aurora_server.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Multi-terminal server mode for the Aurora Voyagers Company application.
+Showroom terminals connect over a local TCP socket and send one JSON request per line, for example
+    {"id": 1, "op": "order", "customer_id": 3, "spaceship_id": 7, "destination": "Mars"}
+and get one JSON response per line back: {"id": 1, "ok": true, "result": {...}} or {"id": 1, "ok": false, "error": "..."}.
+Operations: register_customer, list_spaceships, get_spaceship, order, get_customer, update_customer and stats.
+The asyncio event loop only reads and writes sockets. Database work runs on a bounded thread pool with one WAL-mode
+connection per worker thread (see aurora_db_pool.py), so readers never wait for the single writer.
+Overload is handled with backpressure: each terminal may have only a few requests in flight (the server stops
+reading its socket until one finishes), and once the worker queue is full new requests are answered with
+"busy" right away instead of queueing without limit.
+
+    python "Module 8/aurora_server.py" --port 8765 --workers 4 --max-pending 64
+"""
+
+# Import necessary libraries
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aurora_db_pool import create_pool
+from Final_Project_AuroraVoyagersCompanyApp import SPACESHIP_COLUMNS, get_customer_details, get_spaceship_details
+from order_engine import OrderError, place_order
+from schema_catalog import SchemaCatalog
+
+# Note: Ensure the database file path is correct, as I had to change the path to run it on my machine.
+DEFAULT_DB_NAME = 'Module 8/AuroraVoyagersCompany.db'
+
+# Server settings
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_PENDING = 64
+DEFAULT_CLIENT_IN_FLIGHT = 4
+
+# Largest request line accepted from a terminal, and the largest spaceship page returned
+MAX_REQUEST_BYTES = 64 * 1024
+MAX_PAGE_SIZE = 200
+DEFAULT_PAGE_SIZE = 50
+
+# Error message sent when the server is overloaded; clients should back off and retry
+BUSY_ERROR = "busy"
+
+# Range of an SQLite INTEGER; larger whole numbers cannot be bound as parameters
+SQLITE_MIN_INTEGER = -2 ** 63
+SQLITE_MAX_INTEGER = 2 ** 63 - 1
+
+
+# Error raised for a request the server cannot run (unknown operation, missing or bad parameter)
+class RequestError(Exception):
+    pass
+
+
+# Parameter Helper Function
+# Reads a whole number parameter from a request, raising RequestError when it is missing, not a number or too
+# big for SQLite (json.loads accepts Infinity, which int() turns into an OverflowError)
+def int_param(request, name, default=None):
+    value = request.get(name, default)
+    if value is None:
+        raise RequestError(f"Missing parameter: {name}")
+    try:
+        number = int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise RequestError(f"{name} must be a whole number.")
+    if not SQLITE_MIN_INTEGER <= number <= SQLITE_MAX_INTEGER:
+        raise RequestError(f"{name} is out of range.")
+    return number
+
+# Row To Dictionary Helper Function
+def row_to_dict(row):
+    return None if row is None else {key: row[key] for key in row.keys()}
+
+
+# Register Customer Operation
+# "customer" maps column names to values. CustomerID may be left out, and SQLite then assigns the next ID.
+def op_register_customer(connection, catalog, request):
+    customer = request.get("customer")
+    if not isinstance(customer, dict):
+        raise RequestError("customer must be an object of column names and values.")
+    catalog.refresh(connection)
+    given = {}
+    for name, value in customer.items():
+        column = catalog.validate_column("Customer", name)
+        if column in given:
+            raise RequestError(f"customer lists {column} more than once.")
+        given[column] = value
+    values = [given.get(column) for column in catalog.columns("Customer")]
+    cursor = connection.cursor()
+    cursor.execute(catalog.insert_statement("Customer"), values)
+    connection.commit()
+    customer_id = cursor.lastrowid
+    cursor.close()
+    return {"CustomerID": customer_id}
+
+# List Spaceships Operation
+# Returns one keyset page of spaceships after SpaceshipID "after", plus the key to ask for the next page
+def op_list_spaceships(connection, catalog, request):
+    after = int_param(request, "after", 0)
+    limit = min(MAX_PAGE_SIZE, max(1, int_param(request, "limit", DEFAULT_PAGE_SIZE)))
+    query = "SELECT " + ", ".join(SPACESHIP_COLUMNS) + " FROM Spaceship WHERE SpaceshipID > ?"
+    if request.get("available_only", True):
+        query += " AND Available != 0"
+    query += " ORDER BY SpaceshipID LIMIT ?"
+    cursor = connection.cursor()
+    cursor.row_factory = sqlite3.Row
+    ships = [row_to_dict(row) for row in cursor.execute(query, (after, limit))]
+    cursor.close()
+    next_after = ships[-1]["SpaceshipID"] if len(ships) == limit else None
+    return {"spaceships": ships, "next_after": next_after}
+
+# Get Spaceship Operation
+def op_get_spaceship(connection, catalog, request):
+    ship = get_spaceship_details(connection.cursor(), int_param(request, "spaceship_id"))
+    if ship is None:
+        raise RequestError(f"Spaceship ID {request['spaceship_id']} does not exist.")
+    return row_to_dict(ship)
+
+# Order Operation
+# Runs the order engine's single purchase transaction; sold-out ships come back as an error response
+def op_order(connection, catalog, request):
+    destination = request.get("destination")
+    if not destination:
+        raise RequestError("Missing parameter: destination")
+    try:
+        return place_order(connection, int_param(request, "customer_id"), int_param(request, "spaceship_id"),
+                           str(destination))
+    except OrderError as e:
+        raise RequestError(str(e))
+
+# Get Customer Operation
+def op_get_customer(connection, catalog, request):
+    customer_id = int_param(request, "customer_id")
+    details = get_customer_details(connection.cursor(), customer_id)
+    if details is None:
+        raise RequestError(f"Customer ID {customer_id} does not exist.")
+    return dict(zip(catalog.columns("Customer"), details))
+
+# Update Customer Operation
+# Only columns listed in the schema catalog can be updated
+def op_update_customer(connection, catalog, request):
+    customer_id = int_param(request, "customer_id")
+    if "value" not in request:
+        raise RequestError("Missing parameter: value")
+    catalog.refresh(connection)
+    try:
+        update_statement = catalog.update_statement("Customer", request.get("column", ""))
+    except ValueError as e:
+        raise RequestError(str(e))
+    cursor = connection.cursor()
+    cursor.execute(update_statement, (request["value"], customer_id))
+    connection.commit()
+    updated = cursor.rowcount
+    cursor.close()
+    if not updated:
+        raise RequestError(f"Customer ID {customer_id} does not exist.")
+    return {"CustomerID": customer_id, "updated": updated}
+
+# Operations that run on the database thread pool
+OPERATIONS = {
+    "register_customer": op_register_customer,
+    "list_spaceships": op_list_spaceships,
+    "get_spaceship": op_get_spaceship,
+    "order": op_order,
+    "get_customer": op_get_customer,
+    "update_customer": op_update_customer,
+}
+
+
+# Aurora Server Class
+# Owns the connection pool, the worker threads and the counters reported by the "stats" operation
+class AuroraServer:
+    def __init__(self, pool, workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING,
+                 client_in_flight=DEFAULT_CLIENT_IN_FLIGHT):
+        self.pool = pool
+        self.workers = workers
+        self.max_pending = max_pending
+        self.client_in_flight = client_in_flight
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="aurora-db")
+        with pool.connection() as connection:
+            self.catalog = SchemaCatalog(connection)
+        self.pending = 0
+        self._lock = threading.Lock()
+        self.stats = {"clients": 0, "requests": 0, "completed": 0, "errors": 0, "busy": 0, "max_pending": 0}
+
+    # Count a finished request
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    # Run one operation on a worker thread with a pooled connection
+    def _run(self, operation, request):
+        with self.pool.connection() as connection:
+            return operation(connection, self.catalog, request)
+
+    # Handle one decoded request and return the response dictionary
+    async def handle_request(self, request):
+        response = {"id": request.get("id")} if isinstance(request, dict) else {"id": None}
+        if not isinstance(request, dict):
+            self._count("errors")
+            return dict(response, ok=False, error="Request must be a JSON object.")
+        op = request.get("op")
+        if op == "stats":
+            return dict(response, ok=True, result=self.report())
+        operation = OPERATIONS.get(op)
+        if operation is None:
+            self._count("errors")
+            return dict(response, ok=False, error=f"Unknown operation: {op}")
+
+        # Shed load instead of queueing without limit once every worker is busy and the queue is full
+        if self.pending >= self.max_pending:
+            self._count("busy")
+            return dict(response, ok=False, error=BUSY_ERROR)
+        self.pending += 1
+        self.stats["max_pending"] = max(self.stats["max_pending"], self.pending)
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, self._run, operation, request)
+        except (RequestError, ValueError, KeyError) as e:
+            self._count("errors")
+            return dict(response, ok=False, error=str(e))
+        except (sqlite3.Error, TimeoutError) as e:
+            self._count("errors")
+            return dict(response, ok=False, error=f"Database error: {e}")
+        except Exception as e:
+            # Anything else (an OverflowError from a value in "customer", say) still gets exactly one response
+            self._count("errors")
+            return dict(response, ok=False, error=f"Request failed: {type(e).__name__}: {e}")
+        finally:
+            self.pending -= 1
+        self._count("completed")
+        return dict(response, ok=True, result=result)
+
+    # Serve one terminal connection
+    # At most client_in_flight requests per terminal run at once; while they are all running the next line is not
+    # read, so a fast client is slowed down by TCP flow control instead of growing the server's queue.
+    async def handle_client(self, reader, writer):
+        self._count("clients")
+        slots = asyncio.Semaphore(self.client_in_flight)
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(line):
+            try:
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    self._count("errors")
+                    response = {"id": None, "ok": False, "error": "Request is not valid JSON."}
+                else:
+                    response = await self.handle_request(request)
+                async with write_lock:
+                    writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                    await writer.drain()
+            except ConnectionError:
+                pass
+            finally:
+                slots.release()
+
+        try:
+            while True:
+                await slots.acquire()
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    slots.release()
+                    break
+                if not line:
+                    slots.release()
+                    break
+                if not line.strip():
+                    slots.release()
+                    continue
+                self._count("requests")
+                task = asyncio.create_task(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    # Start listening; returns the asyncio server object
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        return await asyncio.start_server(self.handle_client, host, port, limit=MAX_REQUEST_BYTES)
+
+    # Stop the worker threads and close the pool
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.pool.close()
+
+    # Report the server and pool counters
+    def report(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats["pending"] = self.pending
+        stats["workers"] = self.workers
+        stats["pool"] = self.pool.report()
+        return stats
+
+
+# Serve Function
+# Runs the server until it is interrupted. The address is printed once the socket is listening so
+# scripts (see aurora_load_generator.py) can wait for it.
+async def serve(server, host, port):
+    listener = await server.start(host, port)
+    address = listener.sockets[0].getsockname()
+    print(f"Aurora server listening on {address[0]}:{address[1]} "
+          f"({server.workers} workers, at most {server.max_pending} pending requests)", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+# Main function to run the server
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Aurora Voyagers operations to showroom terminals.")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help="Aurora Voyagers database file")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on (0 picks a free port)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="database worker threads")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING,
+                        help="requests queued or running before new ones are answered with busy")
+    parser.add_argument("--client-in-flight", type=int, default=DEFAULT_CLIENT_IN_FLIGHT,
+                        help="requests one terminal may have running at once")
+    args = parser.parse_args()
+
+    if args.workers < 1 or args.max_pending < 1 or args.client_in_flight < 1:
+        print("Workers, max pending and client in flight must be at least 1.")
+        sys.exit(1)
+    if not os.path.exists(args.db):
+        print(f"Database file not found: {args.db}")
+        sys.exit(1)
+
+    # One pooled connection per worker thread, so a worker never waits for a connection
+    pool = create_pool(args.db, size=args.workers)
+    if not pool:
+        sys.exit(1)
+    server = AuroraServer(pool, args.workers, args.max_pending, args.client_in_flight)
+    start_time = time.perf_counter()
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    print(f"\nServer stopped after {time.perf_counter() - start_time:.1f} seconds.")
+    print("Server usage:", server.report())
+
+# Run the main function
+if __name__ == '__main__':
+    main()
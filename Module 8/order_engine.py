@@ -0,0 +1,102 @@
+"""
+Program name: order_engine.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Order placement engine for the Aurora Voyagers Company application.
+A purchase is one short write transaction (BEGIN IMMEDIATE): the spaceship's stock is checked and decremented
+in a single UPDATE, the order ID comes from the Orders INTEGER PRIMARY KEY (no MAX(OrderID) scan), and the
+Orders row is inserted before the commit. If another terminal holds the write lock the transaction is retried
+with exponential backoff.
+"""
+
+# Import necessary libraries
+import datetime
+import random
+import sqlite3
+import time
+
+# Order settings
+TAX_RATE = 1.1  # Assuming a fixed tax rate of 10%
+DEFAULT_ORDER_STATUS = "Processing"
+
+# Retry settings for SQLITE_BUSY
+MAX_RETRIES = 8
+BACKOFF_SECONDS = 0.01
+MAX_BACKOFF_SECONDS = 0.5
+
+
+# Error raised when an order cannot be placed (unknown customer, unknown or sold-out spaceship)
+class OrderError(Exception):
+    pass
+
+
+# Busy Error Helper Function
+# True when SQLite reported that another connection holds the lock
+def is_busy_error(error):
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    error_code = getattr(error, "sqlite_errorcode", None)
+    if error_code is not None:
+        return error_code & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    return "locked" in str(error) or "busy" in str(error)
+
+# Single Purchase Transaction
+# Returns a dictionary describing the new order
+def _place_order_once(connection, customer_id, spaceship_id, destination, discount, order_status):
+    cursor = connection.cursor()
+    cursor.execute("BEGIN IMMEDIATE;")
+    try:
+        # Check the customer inside the transaction so the order cannot reference a deleted row
+        if cursor.execute("SELECT 1 FROM Customer WHERE CustomerID = ?", (customer_id,)).fetchone() is None:
+            raise OrderError(f"Customer ID {customer_id} does not exist.")
+
+        # Check-and-decrement stock in one statement; no row comes back if the ship is sold out
+        sale_price = cursor.execute("""UPDATE Spaceship SET Available = Available - 1
+                                       WHERE SpaceshipID = ? AND Available > 0
+                                       RETURNING SalePrice""", (spaceship_id,)).fetchone()
+        if sale_price is None:
+            if cursor.execute("SELECT 1 FROM Spaceship WHERE SpaceshipID = ?", (spaceship_id,)).fetchone() is None:
+                raise OrderError(f"Spaceship ID {spaceship_id} does not exist.")
+            raise OrderError(f"Spaceship ID {spaceship_id} is not available.")
+
+        # OrderID is left out so SQLite assigns the next rowid
+        order_total = (sale_price[0] - discount) * TAX_RATE
+        order_datetime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        cursor.execute("""INSERT INTO Orders (InvoiceID, CustomerID, SpaceshipID, OrderDateTime, Destination,
+                                              OrderStatus, DiscountApplied, OrderTotal)
+                          VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                       (None, customer_id, spaceship_id, order_datetime, destination,
+                        order_status, discount, order_total))
+        order_id = cursor.lastrowid
+        connection.commit()
+    except BaseException:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    return {"OrderID": order_id, "CustomerID": customer_id, "SpaceshipID": spaceship_id,
+            "OrderDateTime": order_datetime, "Destination": destination, "OrderStatus": order_status,
+            "DiscountApplied": discount, "OrderTotal": order_total}
+
+# Place Order Function
+# Runs the purchase transaction, retrying with jittered exponential backoff while the database is busy.
+# The returned dictionary includes "Attempts" so callers can see how much contention there was.
+def place_order(connection, customer_id, spaceship_id, destination, discount=0,
+                order_status=DEFAULT_ORDER_STATUS, max_retries=MAX_RETRIES, backoff=BACKOFF_SECONDS):
+    # Finish anything the caller left open so BEGIN IMMEDIATE starts a fresh transaction
+    if connection.in_transaction:
+        connection.commit()
+
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            order = _place_order_once(connection, customer_id, spaceship_id, destination, discount, order_status)
+            order["Attempts"] = attempt
+            return order
+        except sqlite3.OperationalError as e:
+            if not is_busy_error(e) or attempt > max_retries:
+                raise
+            delay = min(MAX_BACKOFF_SECONDS, backoff * (2 ** (attempt - 1)))
+            time.sleep(delay * random.uniform(0.5, 1.5))
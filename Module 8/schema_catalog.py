@@ -0,0 +1,128 @@
+"""
+Program name: schema_catalog.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: In-process schema catalog for the Aurora Voyagers Company database.
+Column names, types, primary keys, foreign keys and indexes for every table are read once and kept in memory.
+The catalog is only reloaded when PRAGMA schema_version changes, and it builds and caches the prepared
+INSERT/UPDATE statements used by the application. Its column lists double as the whitelist for UPDATE statements.
+"""
+
+# Import necessary libraries
+import threading
+
+
+# Quote Identifier Helper Function
+# Wraps a table or column name in double quotes so it is always treated as an identifier
+def quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+# Schema Catalog Class
+class SchemaCatalog:
+    def __init__(self, connection):
+        self._lock = threading.Lock()
+        self.schema_version = None
+        self.tables = {}
+        self._statements = {}
+        self.loads = 0
+        self.load(connection)
+
+    # Read the schema version cookie, which SQLite bumps on every schema change
+    @staticmethod
+    def _read_schema_version(connection):
+        return connection.execute("PRAGMA schema_version;").fetchone()[0]
+
+    # Load the metadata for every table in the database
+    def load(self, connection):
+        tables = {}
+        table_names = [row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+        for table_name in table_names:
+            quoted = quote_identifier(table_name)
+
+            # Columns: (cid, name, type, notnull, default, pk)
+            columns = []
+            primary_key = []
+            for cid, name, col_type, notnull, default, pk in connection.execute(f"PRAGMA table_info({quoted});"):
+                columns.append({"name": name, "type": col_type, "notnull": bool(notnull), "default": default, "pk": pk})
+                if pk:
+                    primary_key.append((pk, name))
+
+            # Foreign keys: (id, seq, table, from, to, on_update, on_delete, match)
+            foreign_keys = []
+            for row in connection.execute(f"PRAGMA foreign_key_list({quoted});"):
+                foreign_keys.append({"column": row[3], "references_table": row[2], "references_column": row[4],
+                                     "on_update": row[5], "on_delete": row[6]})
+
+            # Indexes: (seq, name, unique, origin, partial)
+            indexes = []
+            for row in connection.execute(f"PRAGMA index_list({quoted});"):
+                index_columns = [info[2] for info in connection.execute(f"PRAGMA index_info({quote_identifier(row[1])});")]
+                indexes.append({"name": row[1], "unique": bool(row[2]), "origin": row[3], "columns": index_columns})
+
+            tables[table_name] = {
+                "columns": columns,
+                "column_names": [column["name"] for column in columns],
+                "primary_key": [name for _, name in sorted(primary_key)],
+                "foreign_keys": foreign_keys,
+                "indexes": indexes,
+            }
+
+        with self._lock:
+            self.tables = tables
+            self.schema_version = self._read_schema_version(connection)
+            self._statements = {}
+            self.loads += 1
+
+    # Reload the catalog only if the schema has changed since it was loaded
+    # Returns True when a reload happened
+    def refresh(self, connection):
+        if self._read_schema_version(connection) != self.schema_version:
+            self.load(connection)
+            return True
+        return False
+
+    # Look up a table, matching the name without regard to case like SQLite does
+    def table(self, table_name):
+        if table_name in self.tables:
+            return self.tables[table_name]
+        for name, info in self.tables.items():
+            if name.lower() == str(table_name).lower():
+                return info
+        raise KeyError(f"Unknown table: {table_name}")
+
+    # List the column names of a table
+    def columns(self, table_name):
+        return list(self.table(table_name)["column_names"])
+
+    # Check a column name against the catalog and return it with the catalog's spelling
+    def validate_column(self, table_name, column_name):
+        for name in self.table(table_name)["column_names"]:
+            if name.lower() == str(column_name).strip().lower():
+                return name
+        raise ValueError(f"{column_name} is not a column of {table_name}.")
+
+    # Build (once) the INSERT statement that fills every column of a table
+    def insert_statement(self, table_name):
+        key = ("insert", table_name)
+        with self._lock:
+            if key not in self._statements:
+                columns = self.table(table_name)["column_names"]
+                self._statements[key] = (
+                    f"INSERT INTO {quote_identifier(table_name)} ("
+                    + ", ".join(quote_identifier(column) for column in columns)
+                    + ") VALUES (" + ", ".join(["?"] * len(columns)) + ")")
+            return self._statements[key]
+
+    # Build (once) the UPDATE statement for a single whitelisted column, keyed on the primary key
+    def update_statement(self, table_name, column_name):
+        column = self.validate_column(table_name, column_name)
+        key = ("update", table_name, column)
+        with self._lock:
+            if key not in self._statements:
+                primary_key = self.table(table_name)["primary_key"]
+                where = " AND ".join(f"{quote_identifier(name)} = ?" for name in primary_key)
+                self._statements[key] = (f"UPDATE {quote_identifier(table_name)} SET {quote_identifier(column)} = ? "
+                                         f"WHERE {where}")
+            return self._statements[key]
@@ -0,0 +1,177 @@
+"""
+Program name: benchmark_columnar.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Compares the NumPy analytics (columnar_analytics.py) with the same questions answered in SQL.
+For every dataset it times the export from SQLite to arrays, writing the .npy cache and reloading it memory mapped.
+Each analysis is then timed as a SQL GROUP BY (or window function) on the database, and in NumPy on the arrays
+held in memory and on the memory-mapped arrays. The NumPy answer is checked against the SQL one (totals to the
+cent, counts exactly).
+The Aurora sample database only has a few dozen orders; for a bigger test generate one first:
+
+    python "Module 8/aurora_data_generator.py" aurora_1m.db --rows 1000000
+    python "Shared/benchmark_columnar.py" --aurora aurora_1m.db --runs 10
+"""
+
+# Import necessary libraries
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from columnar_analytics import (count_by_month, revenue_by_column, revenue_by_month, revenue_by_text,
+                                rolling_daily_revenue)
+from columnar_export import DATASETS, DEFAULT_DATABASES, NULL_INT, load_dataset, save_cache, source_signature
+from sqlite_readonly import readonly_uri
+
+DEFAULT_RUNS = 10
+ROLLING_WINDOW = 7
+
+# Analyses: (label, dataset, NumPy function, equivalent SQL, dense)
+# A dense result also has rows for keys SQL does not return (the days without sales); those must be all zero
+ANALYSES = [
+    ("revenue per customer", "sakila_payments",
+     lambda table: revenue_by_column(table, "customer_id", "amount"),
+     """SELECT customer_id, SUM(amount), COUNT(amount) FROM payment WHERE amount IS NOT NULL
+        GROUP BY customer_id ORDER BY customer_id""", False),
+    ("revenue per staff", "sakila_payments",
+     lambda table: revenue_by_column(table, "staff_id", "amount"),
+     """SELECT staff_id, SUM(amount), COUNT(amount) FROM payment WHERE amount IS NOT NULL
+        GROUP BY staff_id ORDER BY staff_id""", False),
+    ("revenue per month", "sakila_payments",
+     lambda table: revenue_by_month(table, "payment_date", "amount"),
+     """SELECT strftime('%Y-%m', payment_date) AS month, SUM(amount), COUNT(amount) FROM payment
+        WHERE payment_date IS NOT NULL AND amount IS NOT NULL GROUP BY month ORDER BY month""", False),
+    (f"{ROLLING_WINDOW}-day rolling revenue", "sakila_payments",
+     lambda table: rolling_daily_revenue(table, "payment_date", "amount", ROLLING_WINDOW),
+     f"""WITH daily AS (
+            SELECT date(payment_date) AS day, SUM(amount) AS total FROM payment
+            WHERE payment_date IS NOT NULL AND amount IS NOT NULL GROUP BY day)
+        SELECT day, total, SUM(total) OVER (ORDER BY julianday(day)
+                                            RANGE BETWEEN {ROLLING_WINDOW - 1} PRECEDING AND CURRENT ROW)
+        FROM daily ORDER BY day""", True),
+    ("rentals per month", "sakila_rentals",
+     lambda table: count_by_month(table, "rental_date"),
+     """SELECT strftime('%Y-%m', rental_date) AS month, COUNT(*) FROM rental WHERE rental_date IS NOT NULL
+        GROUP BY month ORDER BY month""", False),
+    ("order revenue per customer", "aurora_orders",
+     lambda table: revenue_by_column(table, "CustomerID", "OrderTotal"),
+     """SELECT CustomerID, SUM(OrderTotal), COUNT(OrderTotal) FROM Orders WHERE OrderTotal IS NOT NULL
+        GROUP BY CustomerID ORDER BY CustomerID""", False),
+    ("order revenue per month", "aurora_orders",
+     lambda table: revenue_by_month(table, "OrderDateTime", "OrderTotal"),
+     """SELECT strftime('%Y-%m', OrderDateTime) AS month, SUM(OrderTotal), COUNT(OrderTotal) FROM Orders
+        WHERE OrderDateTime IS NOT NULL AND OrderTotal IS NOT NULL GROUP BY month ORDER BY month""", False),
+    ("payments per status", "aurora_payments",
+     lambda table: revenue_by_text(table, "PaymentStatus", "PaymentAmount"),
+     """SELECT PaymentStatus, SUM(PaymentAmount), COUNT(PaymentAmount) FROM Payment WHERE PaymentAmount IS NOT NULL
+        GROUP BY PaymentStatus ORDER BY PaymentStatus""", False),
+]
+
+
+# Timer Helper Function
+# Median ms of `runs` calls after one untimed call; returns (median ms, result of the last call)
+def median_ms(work, runs):
+    result = work()
+    timings = []
+    for _ in range(runs):
+        start_time = time.perf_counter_ns()
+        result = work()
+        timings.append((time.perf_counter_ns() - start_time) / 1_000_000)
+    return statistics.median(timings), result
+
+# Result Rows Helper Function
+# Turns the arrays of a NumPy result into rows like the SQL ones; the NULL key becomes None
+def result_rows(arrays):
+    columns = [array.tolist() for array in arrays]
+    columns[0] = [None if key == NULL_INT else key for key in columns[0]]
+    return list(zip(*columns))
+
+# Compare Function
+# True if the NumPy rows give the same answer as the SQL rows
+def results_match(sql_rows, numpy_rows, dense):
+    by_key = {row[0]: row[1:] for row in numpy_rows}
+    for row in sql_rows:
+        values = by_key.pop(row[0], None)
+        if values is None or len(values) != len(row) - 1:
+            return False
+        if any(abs((value or 0) - (expected or 0)) > 0.005 for value, expected in zip(values, row[1:])):
+            return False
+    # Keys only NumPy has are the empty days of a dense result
+    return not by_key or (dense and all(values[0] == 0 for values in by_key.values()))
+
+# Export Benchmark
+# Times the export, the cache write and the memory-mapped reload; returns (in-memory tables, memory-mapped tables)
+def benchmark_exports(databases, cache_dir):
+    memory = {}
+    mapped = {}
+    print(f"{'Dataset':<16} {'Rows':>10} {'Export ms':>10} {'rows/sec':>12} {'Save ms':>8} {'Reload ms':>10}")
+    for name, (database, _, _) in DATASETS.items():
+        db_name = databases[database]
+        start_time = time.perf_counter()
+        table = load_dataset(db_name, name, cache_dir=None)
+        export_ms = (time.perf_counter() - start_time) * 1000
+        start_time = time.perf_counter()
+        save_cache(table, cache_dir, source_signature(db_name, name))
+        save_ms = (time.perf_counter() - start_time) * 1000
+        start_time = time.perf_counter()
+        mapped[name] = load_dataset(db_name, name, cache_dir)
+        reload_ms = (time.perf_counter() - start_time) * 1000
+        memory[name] = table
+        rate = len(table) / export_ms * 1000 if export_ms else 0
+        print(f"{name:<16} {len(table):>10} {export_ms:>10.1f} {rate:>12,.0f} {save_ms:>8.1f} {reload_ms:>10.2f}")
+    return memory, mapped
+
+# Analysis Benchmark
+# Times every analysis in SQL and in NumPy (in memory and memory mapped) and checks the answers agree
+def benchmark_analyses(databases, memory, mapped, runs):
+    connections = {database: sqlite3.connect(readonly_uri(path, immutable=False), uri=True)
+                   for database, path in databases.items()}
+    print(f"\n{'Analysis':<27} {'Groups':>7} {'SQL ms':>9} {'NumPy ms':>9} {'mmap ms':>9} {'Speedup':>8} {'Matches':>8}")
+    mismatches = 0
+    for label, name, analysis, sql, dense in ANALYSES:
+        connection = connections[DATASETS[name][0]]
+        sql_ms, sql_rows = median_ms(lambda: connection.execute(sql).fetchall(), runs)
+        numpy_ms, result = median_ms(lambda: analysis(memory[name]), runs)
+        mapped_ms, mapped_result = median_ms(lambda: analysis(mapped[name]), runs)
+        numpy_rows = result_rows(result)
+        matches = results_match(sql_rows, numpy_rows, dense) and numpy_rows == result_rows(mapped_result)
+        mismatches += not matches
+        speedup = sql_ms / numpy_ms if numpy_ms else float("inf")
+        print(f"{label:<27} {len(sql_rows):>7} {sql_ms:>9.3f} {numpy_ms:>9.3f} {mapped_ms:>9.3f} {speedup:>7.1f}x "
+              f"{'yes' if matches else 'NO':>8}")
+    for connection in connections.values():
+        connection.close()
+    if mismatches:
+        print(f"\n{mismatches} NumPy result(s) do not match the SQL answer.")
+
+# Main function to run the benchmark
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the NumPy revenue analytics against SQL.")
+    parser.add_argument("--sakila", default=DEFAULT_DATABASES["sakila"], help="sakila database file")
+    parser.add_argument("--aurora", default=DEFAULT_DATABASES["aurora"], help="Aurora Voyagers database file")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="timed runs per measurement")
+    args = parser.parse_args()
+
+    databases = {"sakila": args.sakila, "aurora": args.aurora}
+    for path in databases.values():
+        if not os.path.exists(path):
+            print(f"Database file not found: {path}")
+            sys.exit(1)
+
+    print(f"NumPy {np.__version__}, SQLite {sqlite3.sqlite_version}\n")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        memory, mapped = benchmark_exports(databases, cache_dir)
+        benchmark_analyses(databases, memory, mapped, max(1, args.runs))
+        # Drop the memory maps before the folder is removed
+        memory.clear()
+        mapped.clear()
+
+# Run the main function
+if __name__ == "__main__":
+    main()
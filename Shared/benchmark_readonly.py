@@ -0,0 +1,207 @@
+"""
+Program name: benchmark_readonly.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Compares full-table scan throughput in the read-only reporting mode (sqlite_readonly.py) with the default
+I/O path. The workloads are the albums scan from John_Dostal_AssignProgram1.py and the sakila report joins behind
+the assistant's rental, payment and film options, run over every row.
+Each workload runs in four ways:
+    default          sqlite3.connect(path), pages copied in with read()
+    ro+immutable     mode=ro&immutable=1, mmap off: no locking or change checks, still read()
+    ro+immutable+mmap  the reporting mode: the whole file memory mapped
+    shared cache     the reporting mode plus cache=shared (threaded runs only)
+"new connection" opens a connection for every run (the clerk programs' pattern; SQLite's page cache starts
+empty, so every page comes from the file), "reused" keeps one connection open and "threads" runs the scan on
+several threads at once, each with its own connection. These read every row into Python, which costs more than
+SQLite's page access on files this small, so "engine" also times SELECT COUNT(*) over the same query on the
+reused connection: the same scan and joins with no rows handed to Python. The files are read once first so the
+operating system has them cached, which means this measures the cost of getting pages into SQLite, not disk speed.
+Instrumentation is turned off so it does not add to the timings.
+
+    python "Shared/benchmark_readonly.py" --runs 30 --threads 4
+"""
+
+# Import necessary libraries
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+
+from sql_instrumentation import configure
+from sqlite_readonly import ReadOnlyDatabase, connect_readonly
+
+# Note: Ensure the database file paths are correct, as I had to change the paths to run it on my machine.
+DEFAULT_CHINOOK = "Module 5/Assignment_1/chinook.db"
+DEFAULT_SAKILA = "Module 5/M05 Programming Assignment 2/sakila.db"
+DEFAULT_RUNS = 30
+DEFAULT_THREADS = 4
+
+# Workloads: (database, label, query)
+WORKLOADS = [
+    ("chinook", "albums scan", "SELECT AlbumId, Title, ArtistId FROM albums"),
+    ("chinook", "tracks + albums + artists", """
+        SELECT t.Name, a.Title, ar.Name, t.Milliseconds, t.UnitPrice
+        FROM tracks AS t
+        JOIN albums AS a ON a.AlbumId = t.AlbumId
+        JOIN artists AS ar ON ar.ArtistId = a.ArtistId"""),
+    ("sakila", "rental history join", """
+        SELECT r.rental_id, r.rental_date, f.title, r.return_date, s.first_name || ' ' || s.last_name
+        FROM rental AS r
+        JOIN inventory AS i ON r.inventory_id = i.inventory_id
+        JOIN film AS f ON i.film_id = f.film_id
+        JOIN staff AS s ON r.staff_id = s.staff_id"""),
+    ("sakila", "payment details join", """
+        SELECT c.first_name, c.last_name, f.title, p.amount, p.payment_date, s.first_name || ' ' || s.last_name
+        FROM payment AS p
+        JOIN customer AS c ON c.customer_id = p.customer_id
+        JOIN rental AS r ON p.rental_id = r.rental_id
+        JOIN inventory AS i ON r.inventory_id = i.inventory_id
+        JOIN film AS f ON i.film_id = f.film_id
+        JOIN staff AS s ON p.staff_id = s.staff_id"""),
+    ("sakila", "films by store join", """
+        SELECT i.store_id, f.title, l.name, c.name, f.rating
+        FROM inventory AS i
+        JOIN film AS f ON f.film_id = i.film_id
+        JOIN language AS l ON f.language_id = l.language_id
+        JOIN film_category AS fc ON f.film_id = fc.film_id
+        JOIN category AS c ON fc.category_id = c.category_id"""),
+]
+
+# Ways of opening the database: label -> function(path) returning a connection
+MODES = {
+    "default": lambda path: sqlite3.connect(path),
+    "ro+immutable": lambda path: connect_readonly(path, mmap_size=0),
+    "ro+immutable+mmap": lambda path: connect_readonly(path),
+}
+
+
+# Scan Helper Function
+# Runs the query and reads every row; returns the row count
+def scan(connection, query):
+    return sum(1 for _ in connection.execute(query))
+
+# New Connection Benchmark
+# Median ms of opening a connection, scanning and closing it
+def time_new_connections(open_connection, path, query, runs):
+    timings = []
+    rows = 0
+    for _ in range(runs):
+        start_time = time.perf_counter_ns()
+        connection = open_connection(path)
+        rows = scan(connection, query)
+        connection.close()
+        timings.append((time.perf_counter_ns() - start_time) / 1_000_000)
+    return statistics.median(timings), rows
+
+# Engine-Only Scan Helper Function
+# Counts the query's rows inside SQLite, so no row objects are built in Python
+def count_in_engine(connection, query):
+    return connection.execute(f"SELECT COUNT(*) FROM ({query})").fetchone()[0]
+
+# Reused Connection Benchmark
+# Median ms of a scan on one connection that stays open (SQLite's own page cache is warm after the first run)
+def time_reused_connection(open_connection, path, query, runs, run_scan=scan):
+    connection = open_connection(path)
+    rows = run_scan(connection, query)
+    timings = []
+    for _ in range(runs):
+        start_time = time.perf_counter_ns()
+        run_scan(connection, query)
+        timings.append((time.perf_counter_ns() - start_time) / 1_000_000)
+    connection.close()
+    return statistics.median(timings), rows
+
+# Threaded Benchmark
+# Each thread runs `runs` scans on its own connection; returns the total rows per second across all threads
+def time_threads(database_factory, query, runs, thread_count):
+    database = database_factory()
+    barrier = threading.Barrier(thread_count + 1)
+    counts = [0] * thread_count
+
+    def worker(index):
+        connection = database()
+        scan(connection, query)
+        barrier.wait()
+        for _ in range(runs):
+            counts[index] += scan(connection, query)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start_time = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start_time
+    return sum(counts) / elapsed
+
+# Thread Connection Factories
+# Each returns a function that gives the calling thread a connection
+def default_threads(path):
+    local = threading.local()
+
+    def connection():
+        if not hasattr(local, "connection"):
+            local.connection = sqlite3.connect(path)
+        return local.connection
+    return connection
+
+def readonly_threads(path, shared_cache=False):
+    return ReadOnlyDatabase(path, shared_cache=shared_cache).connection
+
+# Benchmark Function
+def run_benchmark(paths, runs, thread_count):
+    results = []
+    for database, label, query in WORKLOADS:
+        path = paths[database]
+        for mode, open_connection in MODES.items():
+            new_ms, rows = time_new_connections(open_connection, path, query, runs)
+            reused_ms, _ = time_reused_connection(open_connection, path, query, runs)
+            engine_ms, _ = time_reused_connection(open_connection, path, query, runs, count_in_engine)
+            results.append((label, mode, rows, new_ms, reused_ms, engine_ms))
+        threaded = {
+            "default": time_threads(lambda: default_threads(path), query, runs, thread_count),
+            "ro+immutable+mmap": time_threads(lambda: readonly_threads(path), query, runs, thread_count),
+            "shared cache": time_threads(lambda: readonly_threads(path, shared_cache=True), query, runs, thread_count),
+        }
+        results.append((label, "threads", threaded))
+    return results
+
+# Main function to run the benchmark
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the read-only reporting mode against default I/O.")
+    parser.add_argument("--chinook", default=DEFAULT_CHINOOK, help="chinook database file")
+    parser.add_argument("--sakila", default=DEFAULT_SAKILA, help="sakila database file")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="timed runs per measurement")
+    parser.add_argument("--threads", type=int, default=DEFAULT_THREADS, help="threads for the threaded runs")
+    args = parser.parse_args()
+
+    paths = {"chinook": args.chinook, "sakila": args.sakila}
+    for path in paths.values():
+        if not os.path.exists(path):
+            print(f"Database file not found: {path}")
+            sys.exit(1)
+        # Read the file once so it is in the operating system's cache for every mode
+        with open(path, "rb") as file:
+            while file.read(1_048_576):
+                pass
+    configure(enabled=False)
+
+    print(f"{'Workload':<27} {'Mode':<18} {'Rows':>7} {'New conn ms':>12} {'Reused ms':>10} {'rows/sec':>10} "
+          f"{'Engine ms':>10} {'rows/sec':>11}")
+    for result in run_benchmark(paths, max(1, args.runs), max(1, args.threads)):
+        if result[1] == "threads":
+            label, _, threaded = result
+            print(f"{label:<27} {args.threads} threads, rows/sec: "
+                  + ", ".join(f"{mode} {rate:,.0f}" for mode, rate in threaded.items()))
+            continue
+        label, mode, rows, new_ms, reused_ms, engine_ms = result
+        print(f"{label:<27} {mode:<18} {rows:>7} {new_ms:>12.3f} {reused_ms:>10.3f} {rows / reused_ms * 1000:>10,.0f} "
+              f"{engine_ms:>10.3f} {rows / engine_ms * 1000:>11,.0f}")
+
+# Run the main function
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Program name: columnar_analytics.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Vectorized revenue analytics on the arrays exported by columnar_export.py.
+group_by() totals and counts a value column per key with np.unique and np.bincount, so the work is done over
+whole arrays in NumPy instead of row by row. Dates are int64 seconds, so a month or day key is one integer
+division or type conversion away. daily_totals() fills in the days without sales and rolling_sum() adds up a
+window over them with a running sum.
+The revenue functions at the bottom answer the questions the reports ask: totals per customer, per staff member,
+per month and per status, and rolling daily revenue.
+"""
+
+# Import necessary libraries
+import numpy as np
+
+from columnar_export import NULL_INT
+
+SECONDS_PER_DAY = 86_400
+
+
+# Group By Function
+# Returns (keys, sums, counts) for every distinct key, keys in ascending order.
+# Rows are left out where `mask` is False or the value is NaN (NULL), like SUM() and COUNT(column) in SQL.
+def group_by(keys, values=None, mask=None):
+    keys = np.asarray(keys)
+    keep = np.ones(len(keys), dtype=bool) if mask is None else np.asarray(mask, dtype=bool).copy()
+    if values is not None:
+        values = np.asarray(values)
+        keep &= ~np.isnan(values)
+    keys = keys[keep]
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(unique_keys))
+    if values is None:
+        return unique_keys, None, counts
+    sums = np.bincount(inverse, weights=values[keep], minlength=len(unique_keys))
+    return unique_keys, sums, counts
+
+# Date Helper Functions
+# Take int64 seconds; NULL dates must be masked out first (see has_date)
+def has_date(seconds):
+    return np.asarray(seconds) != NULL_INT
+
+def month_keys(seconds):
+    return np.asarray(seconds).view("datetime64[s]").astype("datetime64[M]").view(np.int64)
+
+def month_labels(keys):
+    return np.datetime_as_string(np.asarray(keys).view("datetime64[M]"), unit="M")
+
+def day_keys(seconds):
+    return np.asarray(seconds) // SECONDS_PER_DAY
+
+def day_labels(keys):
+    return np.datetime_as_string(np.asarray(keys).view("datetime64[D]"), unit="D")
+
+# Daily Totals Function
+# Returns (day keys, totals) for every day from the first sale to the last, with 0 for days without sales
+def daily_totals(seconds, values):
+    keep = has_date(seconds) & ~np.isnan(values)
+    days = day_keys(seconds[keep])
+    if len(days) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    first_day = days.min()
+    totals = np.bincount(days - first_day, weights=values[keep])
+    return first_day + np.arange(len(totals), dtype=np.int64), totals
+
+# Rolling Sum Function
+# Sum of each value and the `window - 1` values before it (fewer at the start), from one running sum
+def rolling_sum(values, window):
+    running = np.cumsum(values, dtype=np.float64)
+    result = running.copy()
+    result[window:] = running[window:] - running[:-window]
+    return result
+
+
+# Revenue Functions
+# Each returns (labels, totals, counts) arrays; labels are IDs, "YYYY-MM" months or decoded strings
+def revenue_by_column(table, key_column, amount_column, mask=None):
+    return group_by(table[key_column], table[amount_column], mask)
+
+def revenue_by_month(table, date_column, amount_column):
+    dates = table[date_column]
+    keep = has_date(dates)
+    keys, totals, counts = group_by(month_keys(np.where(keep, dates, 0)), table[amount_column], keep)
+    return month_labels(keys), totals, counts
+
+def revenue_by_text(table, text_column, amount_column):
+    codes, totals, counts = group_by(table[text_column], table[amount_column])
+    return table.decode(text_column, codes), totals, counts
+
+def count_by_month(table, date_column):
+    dates = table[date_column]
+    keep = has_date(dates)
+    keys, _, counts = group_by(month_keys(np.where(keep, dates, 0)), mask=keep)
+    return month_labels(keys), counts
+
+# Rolling Revenue Function
+# Returns (day labels, daily totals, rolling totals over `window` days)
+def rolling_daily_revenue(table, date_column, amount_column, window=7):
+    days, totals = daily_totals(table[date_column], table[amount_column])
+    return day_labels(days), totals, rolling_sum(totals, window)
@@ -0,0 +1,257 @@
+"""
+Program name: columnar_export.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Columnar export of the payment, rental and order tables into NumPy arrays.
+load_dataset() reads the selected columns of a table into one contiguous NumPy array per column:
+    int       int64; NULL becomes NULL_INT
+    float     float64; NULL becomes NaN
+    text      dictionary encoded: int32 codes into a sorted array of the distinct strings; NULL is code -1
+    datetime  int64 seconds since 1970-01-01; NULL becomes NULL_INT (the same value as NumPy's NaT)
+The arrays are cached as .npy files with a meta.json that records the size and modification time of the database
+file. While the database file is unchanged, a later load memory maps the .npy files instead of querying the
+database again, so only the pages an analysis touches are read from disk. Any write to the database changes its
+size or modification time, and the next load exports the table again.
+columnar_analytics.py has the group-by and rolling-window analytics that run on these arrays.
+
+    python "Shared/columnar_export.py"
+    python "Shared/columnar_export.py" --aurora "Module 8/generated.db" --cache-dir columnar_cache
+"""
+
+# Import necessary libraries
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+# NumPy is the one library here that is not part of Python (pip install numpy)
+import numpy as np
+
+from sqlite_readonly import readonly_uri
+
+# Note: Ensure the database file paths are correct, as I had to change the paths to run it on my machine.
+DEFAULT_DATABASES = {
+    "sakila": "Module 5/M05 Programming Assignment 2/sakila.db",
+    "aurora": "Module 8/AuroraVoyagersCompany.db",
+}
+DEFAULT_CACHE_DIR = "columnar_cache"
+
+# Rows fetched from SQLite at a time while exporting
+FETCH_SIZE = 10_000
+
+# Stand-in for NULL in int and datetime columns; equal to NumPy's NaT when viewed as datetime64
+NULL_INT = np.iinfo(np.int64).min
+NULL_CODE = -1
+
+# Datasets: name -> (database, table, [(column, kind), ...])
+DATASETS = {
+    "sakila_payments": ("sakila", "payment", [
+        ("payment_id", "int"), ("customer_id", "int"), ("staff_id", "int"), ("rental_id", "int"),
+        ("amount", "float"), ("payment_date", "datetime"),
+    ]),
+    "sakila_rentals": ("sakila", "rental", [
+        ("rental_id", "int"), ("rental_date", "datetime"), ("inventory_id", "int"), ("customer_id", "int"),
+        ("return_date", "datetime"), ("staff_id", "int"),
+    ]),
+    "aurora_orders": ("aurora", "Orders", [
+        ("OrderID", "int"), ("CustomerID", "int"), ("SpaceshipID", "int"), ("OrderDateTime", "datetime"),
+        ("OrderStatus", "text"), ("DiscountApplied", "float"), ("OrderTotal", "float"),
+    ]),
+    "aurora_payments": ("aurora", "Payment", [
+        ("PaymentID", "int"), ("OrderID", "int"), ("CustomerID", "int"), ("PaymentMethod", "text"),
+        ("PaymentAmount", "float"), ("PaymentDateTime", "datetime"), ("PaymentStatus", "text"),
+        ("Currency", "text"),
+    ]),
+}
+
+
+# Column Table Class
+# The exported columns of one dataset. table["amount"] is the array of a column; text columns hold codes, and
+# decode() turns codes back into strings.
+class ColumnTable:
+    def __init__(self, name, kinds, columns, categories, from_cache=False):
+        self.name = name
+        self.kinds = kinds
+        self.columns = columns
+        self.categories = categories
+        self.from_cache = from_cache
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    # Strings for the given codes of a text column (every row if no codes are given); NULL codes become None
+    def decode(self, column, codes=None):
+        codes = self.columns[column] if codes is None else np.asarray(codes)
+        values = self.categories[column].astype(object)[np.maximum(codes, 0)]
+        values[codes == NULL_CODE] = None
+        return values
+
+    # Code of one string in a text column, or None if the column never holds it
+    def code_of(self, column, value):
+        categories = self.categories[column]
+        position = int(np.searchsorted(categories, value))
+        if position < len(categories) and categories[position] == value:
+            return position
+        return None
+
+
+# Conversion Functions
+# Each turns the list of values read from one column into its NumPy array
+def int_array(values):
+    return np.fromiter((NULL_INT if value is None else value for value in values), dtype=np.int64, count=len(values))
+
+def float_array(values):
+    return np.fromiter((np.nan if value is None else value for value in values), dtype=np.float64, count=len(values))
+
+def datetime_array(values):
+    # NumPy parses both "2005-05-25" and "2005-05-25 11:30:37"; int64 seconds are what the analytics work on
+    texts = ["NaT" if value is None else str(value) for value in values]
+    return np.array(texts, dtype="datetime64[s]").view(np.int64)
+
+# Returns (codes, categories); the categories are sorted so codes compare in the same order as the strings
+def text_array(values):
+    categories = sorted({str(value) for value in values if value is not None})
+    lookup = {value: code for code, value in enumerate(categories)}
+    codes = np.fromiter((NULL_CODE if value is None else lookup[str(value)] for value in values),
+                        dtype=np.int32, count=len(values))
+    return codes, np.array(categories, dtype=str)
+
+
+# Export Function
+# Reads the dataset's columns from the database in chunks and converts them to arrays
+def export_dataset(connection, name):
+    _, table, columns = DATASETS[name]
+    names = [column for column, _ in columns]
+    values = [[] for _ in names]
+    cursor = connection.execute(f"SELECT {', '.join(names)} FROM {table}")
+    while True:
+        rows = cursor.fetchmany(FETCH_SIZE)
+        if not rows:
+            break
+        for column_values, chunk in zip(values, zip(*rows)):
+            column_values.extend(chunk)
+
+    kinds = dict(columns)
+    arrays = {}
+    categories = {}
+    for column, column_values in zip(names, values):
+        kind = kinds[column]
+        if kind == "int":
+            arrays[column] = int_array(column_values)
+        elif kind == "float":
+            arrays[column] = float_array(column_values)
+        elif kind == "datetime":
+            arrays[column] = datetime_array(column_values)
+        else:
+            arrays[column], categories[column] = text_array(column_values)
+    return ColumnTable(name, kinds, arrays, categories)
+
+
+# Source Signature Function
+# Describes the database file (and its WAL file, which takes the writes until a checkpoint) so a stale cache is
+# noticed
+def source_signature(db_name, name):
+    columns = [[column, kind] for column, kind in DATASETS[name][2]]
+    signature = {"dataset": name, "columns": columns, "database": os.path.abspath(db_name)}
+    for suffix in ["", "-wal"]:
+        if os.path.exists(db_name + suffix):
+            status = os.stat(db_name + suffix)
+            signature["file" + suffix] = [status.st_size, status.st_mtime_ns]
+    return signature
+
+# Cache Folder Helper Function
+def cache_path(cache_dir, name):
+    return os.path.join(cache_dir, name)
+
+# Save Cache Function
+# One .npy file per column (and per text column's categories); meta.json is written last, so a cache that was
+# only partly written is never used
+def save_cache(table, cache_dir, signature):
+    folder = cache_path(cache_dir, table.name)
+    os.makedirs(folder, exist_ok=True)
+    meta_path = os.path.join(folder, "meta.json")
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    for column, array in table.columns.items():
+        np.save(os.path.join(folder, f"{column}.npy"), array)
+    for column, categories in table.categories.items():
+        np.save(os.path.join(folder, f"{column}.categories.npy"), categories)
+    with open(meta_path, "w") as file:
+        json.dump({"signature": signature, "rows": len(table)}, file, indent=2)
+
+# Load Cache Function
+# Returns the cached table with its columns memory mapped, or None if there is no cache for this source
+def load_cache(cache_dir, name, signature):
+    folder = cache_path(cache_dir, name)
+    try:
+        with open(os.path.join(folder, "meta.json"), "r") as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if meta.get("signature") != signature:
+        return None
+
+    kinds = dict(DATASETS[name][2])
+    columns = {}
+    categories = {}
+    for column, kind in kinds.items():
+        columns[column] = np.load(os.path.join(folder, f"{column}.npy"), mmap_mode="r")
+        if kind == "text":
+            categories[column] = np.load(os.path.join(folder, f"{column}.categories.npy"))
+    return ColumnTable(name, kinds, columns, categories, from_cache=True)
+
+# Load Dataset Function
+# Returns the dataset as a ColumnTable, from the cache when it is current, otherwise exported from the database
+# (and cached, unless cache_dir is None)
+def load_dataset(db_name, name, cache_dir=DEFAULT_CACHE_DIR):
+    if not os.path.exists(db_name):
+        raise sqlite3.OperationalError(f"Database file not found: {db_name}")
+    signature = source_signature(db_name, name)
+    if cache_dir is not None:
+        table = load_cache(cache_dir, name, signature)
+        if table is not None:
+            return table
+
+    # immutable=False: the database may still be written to by the apps while it is exported
+    connection = sqlite3.connect(readonly_uri(db_name, immutable=False), uri=True)
+    try:
+        table = export_dataset(connection, name)
+    finally:
+        connection.close()
+    if cache_dir is not None:
+        save_cache(table, cache_dir, signature)
+    return table
+
+
+# Main function to export every dataset
+def main():
+    parser = argparse.ArgumentParser(description="Export payment, rental and order columns to NumPy .npy files.")
+    parser.add_argument("--sakila", default=DEFAULT_DATABASES["sakila"], help="sakila database file")
+    parser.add_argument("--aurora", default=DEFAULT_DATABASES["aurora"], help="Aurora Voyagers database file")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="folder for the .npy files")
+    args = parser.parse_args()
+
+    databases = {"sakila": args.sakila, "aurora": args.aurora}
+    for path in databases.values():
+        if not os.path.exists(path):
+            print(f"Database file not found: {path}")
+            sys.exit(1)
+
+    print(f"{'Dataset':<16} {'Rows':>10} {'Source':<7} {'ms':>9} {'MB':>8}")
+    for name, (database, _, _) in DATASETS.items():
+        start_time = time.perf_counter()
+        table = load_dataset(databases[database], name, args.cache_dir)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        size = sum(array.nbytes for array in table.columns.values()) / 1_048_576
+        print(f"{name:<16} {len(table):>10} {'cache' if table.from_cache else 'export':<7} {elapsed_ms:>9.1f} "
+              f"{size:>8.2f}")
+    print(f"\nArrays are in {os.path.abspath(args.cache_dir)}")
+
+# Run the main function
+if __name__ == "__main__":
+    main()
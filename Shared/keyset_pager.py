@@ -0,0 +1,114 @@
+"""
+Program name: keyset_pager.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Keyset pagination shared by the sakila assistant and the Aurora Voyagers Company application.
+Both apps page through their customer table with the KeysetPager class below.
+"""
+
+
+# Keyset Pagination Class
+# Pages through a table one page at a time with WHERE key > ? ORDER BY key LIMIT ?, so only the
+# rows being shown (plus an optional, bounded read-ahead of whole pages) are ever held in memory.
+# Moving forward past the last page wraps to the first page and moving back from the first page
+# wraps to the last page, the same way the old list-based pages did.
+class KeysetPager:
+    def __init__(self, cursor, table, key, columns, page_size, prefetch_pages=1):
+        if page_size < 1:
+            raise ValueError("Page size must be at least 1.")
+        self.cursor = cursor
+        self.table = table
+        self.key = key
+        self.select = f"SELECT {', '.join(columns)} FROM {table}"
+        self.key_index = columns.index(key)
+        self.page_size = page_size
+        self.prefetch_pages = max(0, prefetch_pages)
+        self.page_number = 0
+        self.current = []
+        self._ahead = []
+        self._behind = None
+        self._at_end = False
+
+    # Fetch up to `limit` rows after `last_key` (or from the start when last_key is None)
+    def _fetch_after(self, last_key, limit):
+        if last_key is None:
+            query = f"{self.select} ORDER BY {self.key} ASC LIMIT ?"
+            params = (limit,)
+        else:
+            query = f"{self.select} WHERE {self.key} > ? ORDER BY {self.key} ASC LIMIT ?"
+            params = (last_key, limit)
+        return self.cursor.execute(query, params).fetchall()
+
+    # Fetch up to `limit` rows before `first_key` (or the last rows when first_key is None), in ascending order
+    def _fetch_before(self, first_key, limit):
+        if first_key is None:
+            query = f"{self.select} ORDER BY {self.key} DESC LIMIT ?"
+            params = (limit,)
+        else:
+            query = f"{self.select} WHERE {self.key} < ? ORDER BY {self.key} DESC LIMIT ?"
+            params = (first_key, limit)
+        rows = self.cursor.execute(query, params).fetchall()
+        rows.reverse()
+        return rows
+
+    # Load the page after `last_key` plus the read-ahead pages in a single query
+    def _load_forward(self, last_key):
+        limit = self.page_size * (1 + self.prefetch_pages)
+        rows = self._fetch_after(last_key, limit)
+        self._at_end = len(rows) < limit
+        self.current = rows[:self.page_size]
+        self._ahead = rows[self.page_size:]
+
+    # Show the first page
+    def first(self):
+        self._behind = None
+        self.page_number = 1
+        self._load_forward(None)
+        return self.current
+
+    # Move to the next page, wrapping around to the first page after the last one
+    def next(self):
+        if self._ahead:
+            self._behind = self.current
+            self.current = self._ahead[:self.page_size]
+            self._ahead = self._ahead[self.page_size:]
+            self.page_number += 1
+        elif self._at_end or not self.current:
+            return self.first()
+        else:
+            previous = self.current
+            self._load_forward(self.current[-1][self.key_index])
+            if not self.current:
+                return self.first()
+            self._behind = previous
+            self.page_number += 1
+        return self.current
+
+    # Move to the previous page, wrapping around to the last page before the first one
+    def previous(self):
+        if self.page_number <= 1:
+            # Wrapping to the last page needs the row count once so the last page lines up
+            # with the pages counted from the start (it may be a short page)
+            total_rows = self.cursor.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            last_page_size = total_rows % self.page_size or self.page_size
+            self.current = self._fetch_before(None, last_page_size)
+            self._ahead = []
+            self._behind = None
+            self._at_end = True
+            self.page_number = max(1, (total_rows + self.page_size - 1) // self.page_size)
+            return self.current
+
+        if self._behind is not None:
+            rows = self._behind
+        else:
+            rows = self._fetch_before(self.current[0][self.key_index], self.page_size)
+        # Keep the page we are leaving as read-ahead, bounded to prefetch_pages pages
+        buffered = self.current + self._ahead
+        limit = self.page_size * self.prefetch_pages
+        if len(buffered) > limit:
+            self._at_end = False
+        self._ahead = buffered[:limit]
+        self._behind = None
+        self.current = rows
+        self.page_number -= 1
+        return self.current
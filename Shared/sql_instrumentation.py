@@ -0,0 +1,444 @@
+"""
+Program name: sql_instrumentation.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Shared query instrumentation for the SQLite programs in this repository.
+connect() opens a connection whose cursors time every statement, from execute() until the last row is
+fetched (or the cursor is closed or reused). Each statement's row count and approximate number of SQLite
+VM steps are recorded too. The steps come from set_progress_handler, and set_trace_callback supplies the
+statement text with its parameters filled in. Statements slower than the threshold go to the slow-query log
+with their EXPLAIN QUERY PLAN. Every statement is counted in a latency histogram. A report of the slowest
+statements and the histogram is printed (or written as JSON) when the program exits.
+
+Settings come from environment variables, or from configure():
+    SQL_INSTRUMENT=0           turn instrumentation off (connect() then returns a plain connection)
+    SQL_SLOW_MS=50             slow-query threshold in milliseconds
+    SQL_SLOW_LOG=slow.jsonl    also append slow queries to this file, one JSON object per line
+    SQL_STATS_FILE=stats.json  write the exit report as JSON to this file instead of printing it
+    SQL_PROGRESS_STEPS=1000    VM instructions between progress handler calls (smaller is finer but slower)
+
+Programs in other folders import it after adding this folder to sys.path:
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Shared"))
+    from sql_instrumentation import connect
+"""
+
+# Import necessary libraries
+import atexit
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+
+# Default settings
+DEFAULT_SLOW_MS = 50.0
+DEFAULT_PROGRESS_STEPS = 1000
+SLOW_LOG_MEMORY = 100
+REPORT_TOP_STATEMENTS = 10
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket holds everything slower
+HISTOGRAM_BOUNDS_MS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000]
+
+# Statements that EXPLAIN QUERY PLAN can describe
+EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+
+# Current settings
+settings = {
+    "enabled": os.environ.get("SQL_INSTRUMENT", "1") != "0",
+    "slow_ms": float(os.environ.get("SQL_SLOW_MS", DEFAULT_SLOW_MS)),
+    "slow_log": os.environ.get("SQL_SLOW_LOG") or None,
+    "stats_file": os.environ.get("SQL_STATS_FILE") or None,
+    "progress_steps": max(1, int(os.environ.get("SQL_PROGRESS_STEPS", DEFAULT_PROGRESS_STEPS))),
+}
+
+
+# Change the settings from code; only the arguments given are changed
+def configure(enabled=None, slow_ms=None, slow_log=None, stats_file=None, progress_steps=None):
+    for name, value in [("enabled", enabled), ("slow_ms", slow_ms), ("slow_log", slow_log),
+                        ("stats_file", stats_file), ("progress_steps", progress_steps)]:
+        if value is not None:
+            settings[name] = value
+
+# Collapse whitespace so the same statement is always counted under the same text
+def normalize_sql(sql):
+    return " ".join(str(sql).split())
+
+# Histogram Bucket Helper Function
+def bucket_index(elapsed_ms):
+    for index, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+        if elapsed_ms <= bound:
+            return index
+    return len(HISTOGRAM_BOUNDS_MS)
+
+
+# Statement Statistics Class
+# Process-wide totals shared by every instrumented connection (the Aurora pool uses several threads)
+class StatementStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    # Clear every counter
+    def reset(self):
+        with self._lock:
+            self.statements = {}
+            self.histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+            self.slow_queries = deque(maxlen=SLOW_LOG_MEMORY)
+            self.slow_count = 0
+            self.traced = 0
+
+    # Add one finished statement
+    def record(self, sql, elapsed_ns, rows, steps, error):
+        elapsed_ms = elapsed_ns / 1_000_000
+        key = normalize_sql(sql)
+        with self._lock:
+            stats = self.statements.get(key)
+            if stats is None:
+                stats = self.statements[key] = {"calls": 0, "total_ns": 0, "max_ns": 0, "rows": 0, "steps": 0,
+                                                "errors": 0}
+            stats["calls"] += 1
+            stats["total_ns"] += elapsed_ns
+            stats["max_ns"] = max(stats["max_ns"], elapsed_ns)
+            stats["rows"] += rows
+            stats["steps"] += steps
+            stats["errors"] += int(error)
+            self.histogram[bucket_index(elapsed_ms)] += 1
+
+    # Add one slow query entry
+    def record_slow(self, entry):
+        with self._lock:
+            self.slow_queries.append(entry)
+            self.slow_count += 1
+
+    # Totals for one statement (zeros if it has not run yet)
+    def totals(self, sql):
+        with self._lock:
+            stats = self.statements.get(normalize_sql(sql))
+            return dict(stats) if stats else {"calls": 0, "total_ns": 0, "max_ns": 0, "rows": 0, "steps": 0,
+                                              "errors": 0}
+
+    # Count a statement reported by the trace callback
+    def count_traced(self):
+        with self._lock:
+            self.traced += 1
+
+    # Report the totals as a dictionary, slowest statements (by total time) first
+    def report(self, top=REPORT_TOP_STATEMENTS):
+        with self._lock:
+            statements = sorted(self.statements.items(), key=lambda item: item[1]["total_ns"], reverse=True)
+            histogram = list(self.histogram)
+            slow_queries = list(self.slow_queries)
+            slow_count = self.slow_count
+            traced = self.traced
+        labels = [f"<= {bound} ms" for bound in HISTOGRAM_BOUNDS_MS] + [f"> {HISTOGRAM_BOUNDS_MS[-1]} ms"]
+        return {
+            "statements": sum(stats["calls"] for _, stats in statements),
+            "traced_statements": traced,
+            "distinct_statements": len(statements),
+            "total_ms": round(sum(stats["total_ns"] for _, stats in statements) / 1_000_000, 3),
+            "slow_threshold_ms": settings["slow_ms"],
+            "slow_queries": slow_count,
+            "top": [{"sql": sql, "calls": stats["calls"], "rows": stats["rows"], "steps": stats["steps"],
+                     "errors": stats["errors"], "total_ms": round(stats["total_ns"] / 1_000_000, 3),
+                     "avg_ms": round(stats["total_ns"] / stats["calls"] / 1_000_000, 3),
+                     "max_ms": round(stats["max_ns"] / 1_000_000, 3)} for sql, stats in statements[:top]],
+            "histogram": dict(zip(labels, histogram)),
+            "recent_slow_queries": slow_queries,
+        }
+
+
+# Shared statistics for the whole process
+statement_stats = StatementStats()
+
+
+# Statement Record Class
+# One statement run by an instrumented cursor, from execute() until it is finished
+class StatementRecord:
+    __slots__ = ("sql", "parameters", "expanded_sql", "elapsed_ns", "rows", "ticks", "error")
+
+    def __init__(self, sql, parameters):
+        self.sql = sql
+        self.parameters = parameters
+        self.expanded_sql = None
+        self.elapsed_ns = 0
+        self.rows = 0
+        self.ticks = 0
+        self.error = False
+
+
+# Instrumented Cursor Class
+# Times execute() and every fetch. The time only counts while this cursor is running SQLite, so interleaved
+# cursors (an outer loop with lookups inside it) are each charged for their own work.
+class InstrumentedCursor(sqlite3.Cursor):
+    _record = None
+
+    # Run `call` as part of the current statement, adding its time (and VM steps) to the record
+    def _timed(self, call, *args):
+        record = self._record
+        connection = self.connection
+        previous = connection._active
+        connection._active = record
+        start_time = time.perf_counter_ns()
+        try:
+            return call(*args)
+        except sqlite3.Error:
+            if record is not None:
+                record.error = True
+            raise
+        finally:
+            if record is not None:
+                record.elapsed_ns += time.perf_counter_ns() - start_time
+            connection._active = previous
+
+    # Finish the current statement and hand it to the statistics
+    def _finish(self):
+        record = self._record
+        if record is None:
+            return
+        self._record = None
+        self.connection._finish_record(record)
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        self._record = StatementRecord(sql, parameters)
+        try:
+            self._timed(super().execute, sql, parameters)
+        except sqlite3.Error:
+            self._finish()
+            raise
+        if self.description is None:
+            # Not a query: the statement is already complete
+            self._record.rows = max(0, self.rowcount)
+            self._finish()
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        self._record = StatementRecord(sql, None)
+        try:
+            self._timed(super().executemany, sql, seq_of_parameters)
+            self._record.rows = max(0, self.rowcount)
+        finally:
+            self._finish()
+        return self
+
+    def executescript(self, sql_script):
+        self._finish()
+        self._record = StatementRecord(sql_script, None)
+        try:
+            self._timed(super().executescript, sql_script)
+        finally:
+            self._finish()
+        return self
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._finish()
+        elif self._record is not None:
+            self._record.rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        rows = self._timed(super().fetchmany, size)
+        if self._record is not None:
+            self._record.rows += len(rows)
+        if len(rows) < size:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        if self._record is not None:
+            self._record.rows += len(rows)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        try:
+            row = self._timed(super().__next__)
+        except StopIteration:
+            self._finish()
+            raise
+        if self._record is not None:
+            self._record.rows += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+# Instrumented Connection Class
+# Pass as the factory to sqlite3.connect (connect() below does this). Connection.execute() and friends are
+# routed through an instrumented cursor so the shortcut methods are measured as well.
+class InstrumentedConnection(sqlite3.Connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._active = None
+        self._explaining = False
+        self._ticks = 0
+        self.set_trace_callback(self._trace)
+        self.set_progress_handler(self._progress, settings["progress_steps"])
+        register_exit_report()
+
+    # Trace callback: SQLite reports each statement (with parameters filled in) as it starts
+    def _trace(self, statement):
+        statement_stats.count_traced()
+        record = self._active
+        if record is not None and record.expanded_sql is None:
+            record.expanded_sql = statement
+
+    # Progress handler: called every progress_steps VM instructions; returning 0 lets the statement continue
+    def _progress(self):
+        record = self._active
+        if record is not None:
+            record.ticks += 1
+        return 0
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    # Time commits too, since they are where WAL and journal writes happen
+    def commit(self):
+        record = StatementRecord("COMMIT", None)
+        start_time = time.perf_counter_ns()
+        try:
+            super().commit()
+        except sqlite3.Error:
+            record.error = True
+            raise
+        finally:
+            record.elapsed_ns = time.perf_counter_ns() - start_time
+            self._finish_record(record)
+
+    # Hand a finished statement to the statistics and the slow-query log
+    def _finish_record(self, record):
+        steps = record.ticks * settings["progress_steps"]
+        statement_stats.record(record.sql, record.elapsed_ns, record.rows, steps, record.error)
+        elapsed_ms = record.elapsed_ns / 1_000_000
+        if elapsed_ms >= settings["slow_ms"] and not self._explaining:
+            log_slow_query(self, record, elapsed_ms, steps)
+
+    # Read the query plan of a slow statement without recording the EXPLAIN itself
+    def explain(self, sql, parameters):
+        if not EXPLAINABLE.match(sql) or ";" in sql.strip().rstrip(";"):
+            return None
+        self._explaining = True
+        try:
+            rows = sqlite3.Cursor(self).execute("EXPLAIN QUERY PLAN " + sql, parameters or ()).fetchall()
+        except (sqlite3.Error, ValueError):
+            return None
+        finally:
+            self._explaining = False
+        depth = {0: -1}
+        plan = []
+        for node_id, parent_id, _, detail in rows:
+            depth[node_id] = depth.get(parent_id, -1) + 1
+            plan.append("  " * depth[node_id] + detail)
+        return plan
+
+
+# Slow Query Log Function
+# Records the statement with its plan, and appends it to the slow log file when one is configured
+def log_slow_query(connection, record, elapsed_ms, steps):
+    parameters = record.parameters
+    entry = {
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "ms": round(elapsed_ms, 3),
+        "rows": record.rows,
+        "steps": steps,
+        "sql": normalize_sql(record.sql),
+        "expanded_sql": normalize_sql(record.expanded_sql) if record.expanded_sql else None,
+        "plan": connection.explain(record.sql, parameters) if parameters is not None else None,
+    }
+    statement_stats.record_slow(entry)
+    if settings["slow_log"]:
+        try:
+            with open(settings["slow_log"], "a", encoding="utf-8") as file:
+                file.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print("Could not write the slow query log:", e, file=sys.stderr)
+
+
+# Connect Function
+# sqlite3.connect() with instrumentation, unless it is turned off
+def connect(database, **kwargs):
+    if settings["enabled"]:
+        kwargs.setdefault("factory", InstrumentedConnection)
+    return sqlite3.connect(database, **kwargs)
+
+# Connection Factory Function
+# The class to pass as sqlite3.connect(factory=...) for code that opens its own connections (the Aurora pool)
+def connection_factory():
+    return InstrumentedConnection if settings["enabled"] else sqlite3.Connection
+
+
+# Print Report Function
+def print_report(report=None, file=None):
+    report = report or statement_stats.report()
+    file = file or sys.stdout
+    print(f"\n=== SQL statements: {report['statements']} run ({report['distinct_statements']} distinct), "
+          f"{report['total_ms']:.3f} ms in total, {report['slow_queries']} slower than "
+          f"{report['slow_threshold_ms']} ms ===", file=file)
+    if not report["statements"]:
+        return
+    print(f"{'Calls':>7} {'Total ms':>10} {'Avg ms':>9} {'Max ms':>9} {'Rows':>9} {'VM steps':>10}  Statement", file=file)
+    for stats in report["top"]:
+        sql = stats["sql"] if len(stats["sql"]) <= 70 else stats["sql"][:67] + "..."
+        print(f"{stats['calls']:>7} {stats['total_ms']:>10.3f} {stats['avg_ms']:>9.3f} {stats['max_ms']:>9.3f} "
+              f"{stats['rows']:>9} {stats['steps']:>10}  {sql}", file=file)
+    print("\nLatency histogram:", file=file)
+    largest = max(report["histogram"].values())
+    for label, count in report["histogram"].items():
+        if count:
+            bar = "#" * max(1, round(40 * count / largest))
+            print(f"{label:>12} {count:>8} {bar}", file=file)
+    for entry in report["recent_slow_queries"][-3:]:
+        print(f"\nSlow query ({entry['ms']} ms, {entry['rows']} rows): {entry['expanded_sql'] or entry['sql']}",
+              file=file)
+        for line in entry["plan"] or []:
+            print(f"    {line}", file=file)
+
+# Exit Report Function
+# Prints the report (or writes it to SQL_STATS_FILE) if any statement was recorded
+def exit_report():
+    report = statement_stats.report()
+    if not report["statements"]:
+        return
+    if settings["stats_file"]:
+        try:
+            with open(settings["stats_file"], "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
+        except OSError as e:
+            print("Could not write the SQL statistics:", e, file=sys.stderr)
+        return
+    print_report(report, sys.stderr)
+
+_exit_report_registered = False
+
+# Register the exit report the first time a connection is instrumented
+def register_exit_report():
+    global _exit_report_registered
+    if not _exit_report_registered:
+        _exit_report_registered = True
+        atexit.register(exit_report)
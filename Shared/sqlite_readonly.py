@@ -0,0 +1,83 @@
+"""
+Program name: sqlite_readonly.py
+Author: John Dostal
+Date last updated: 10/18/2026
+Purpose: Read-only reporting mode for the SQLite programs in this repository.
+connect_readonly() opens the database file through a file: URI with mode=ro&immutable=1 and sets mmap_size
+to cover the whole file. mode=ro means nothing can be written. immutable=1 tells SQLite the file will not
+change while it is open, so it skips file locking and change detection. With mmap, pages are read straight
+from the operating system's page cache instead of being copied in by a read() call per page.
+ReadOnlyDatabase gives each thread its own connection. The threads all map the same file, so they share one
+copy of every page in the operating system's page cache. SQLite's shared-cache mode (cache=shared) is not
+used by default, because SQLite discourages it and it makes readers on different threads take turns.
+Only use the reporting mode on a file nothing is writing to (a nightly copy, or while the clerk program is
+closed). An immutable connection will not see changes made by other connections.
+"""
+
+# Import necessary libraries
+import os
+import pathlib
+import sqlite3
+import threading
+
+from sql_instrumentation import connect
+
+# Largest mmap_size requested; SQLite also caps it at its compile-time limit (2 GB by default)
+MAX_MMAP_BYTES = 2_147_418_112
+MMAP_ROUNDING = 1_048_576
+
+
+# Read-Only URI Function
+# Builds a file: URI for `path`; the path is percent-encoded so spaces and # in folder names are safe
+def readonly_uri(path, immutable=True, shared_cache=False):
+    options = ["mode=ro"]
+    if immutable:
+        options.append("immutable=1")
+    if shared_cache:
+        options.append("cache=shared")
+    return pathlib.Path(path).resolve().as_uri() + "?" + "&".join(options)
+
+# Mmap Size Function
+# The file size rounded up to a whole MiB, so the entire database is mapped
+def mmap_size_for(path):
+    size = os.path.getsize(path)
+    return min(MAX_MMAP_BYTES, -(-size // MMAP_ROUNDING) * MMAP_ROUNDING)
+
+# Read-Only Connection Function
+# mmap_size=None maps the whole file and 0 turns memory mapping off; other keyword arguments go to sqlite3.connect
+def connect_readonly(path, mmap_size=None, immutable=True, shared_cache=False, **kwargs):
+    if not os.path.exists(path):
+        raise sqlite3.OperationalError(f"Database file not found: {path}")
+    connection = connect(readonly_uri(path, immutable, shared_cache), uri=True, **kwargs)
+    size = mmap_size_for(path) if mmap_size is None else int(mmap_size)
+    connection.execute(f"PRAGMA mmap_size = {size};")
+    return connection
+
+
+# Read-Only Database Class
+# Hands every thread its own read-only connection to the same file, opening it on first use
+class ReadOnlyDatabase:
+    def __init__(self, path, mmap_size=None, immutable=True, shared_cache=False, **kwargs):
+        self.path = path
+        self.options = dict(kwargs, mmap_size=mmap_size, immutable=immutable, shared_cache=shared_cache)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    # The calling thread's connection
+    def connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = connect_readonly(self.path, **self.options)
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    # Close every connection opened by any thread
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()